@@ -1,21 +1,27 @@
+import inspect
 import os
 from datetime import timedelta
-from typing import Any
+from typing import Any, Coroutine, Dict, List, Optional
 from robot.api import logger
 from robot.api.deco import keyword
 from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
 from robot.utils import ConnectionCache
 from robotlibcore import DynamicCore
+from Mainframe3270.asyncemulator import AsyncEmulator
+from Mainframe3270.instrumentation import Instrumentation
 from Mainframe3270.keywords import (
     AssertionKeywords,
     CommandKeywords,
+    ConcurrentConnectionKeywords,
     ConnectionKeywords,
+    FieldKeywords,
     ReadWriteKeywords,
     ScreenshotKeywords,
+    SessionPoolKeywords,
     WaitAndTimeoutKeywords,
 )
-from Mainframe3270.py3270 import Emulator
-from Mainframe3270.utils import convert_timeout
+from Mainframe3270.py3270 import AppPool, Emulator
+from Mainframe3270.utils import Engine, WaitStrategy, convert_timeout
 from Mainframe3270.version import VERSION
 
 
@@ -72,6 +78,40 @@ class Mainframe3270(DynamicCore):
     |     Page Should Contain String    Second String
     |     [Teardown]    Close All Connections
 
+    = Load Generation =
+
+    Every connection opened by `Open Connection` blocks while waiting for its emulator, so a test can only drive
+    a few dozen of them. `Open Concurrent Connections` opens many connections that are driven by a single asyncio
+    event loop instead, and the keywords with ``Concurrent Connections`` in their name send commands to all of them
+    at the same time. This is useful to put load on a host.
+
+    | *** Test Cases ***
+    | Load Test
+    |     Open Concurrent Connections    pub400.com    200
+    |     ${screens}    Read All Screens Of Concurrent Connections
+    |     Execute Command On Concurrent Connections    Enter
+    |     [Teardown]    Close Concurrent Connections
+
+    These keywords require Robot Framework 7.1 or newer, which runs asynchronous keywords.
+
+    = Session Pools =
+
+    Since the library scope is ``TEST SUITE``, every suite usually opens its own connections and logs in again.
+    A session pool keeps logged-in sessions alive across suites instead. Tests check a session out of the pool
+    and check it in again when they are done. Checked-in sessions are brought back to a known screen by a reset
+    keyword and are only reused if they are still connected.
+
+    | *** Settings ***
+    | Suite Setup       Create Session Pool    main    Open Connection And Log In    Go To Main Menu
+    |
+    | *** Test Cases ***
+    | Pooled Session
+    |     Check Out Session    main
+    |     Page Should Contain String    MAIN MENU
+    |     [Teardown]    Check In Session    main
+
+    See `Create Session Pool`, `Check Out Session` and `Check In Session` for details.
+
     = Changing the emulator model (experimental) =
 
     By default, the library uses the emulator model 2, which is 24 rows by 80 columns.
@@ -125,6 +165,14 @@ class Mainframe3270(DynamicCore):
         img_folder: str = ".",
         run_on_failure_keyword: str = "Take Screenshot",
         model: str = "2",
+        wait_strategy: WaitStrategy = WaitStrategy.Fixed,
+        write_behind: bool = False,
+        process_pool_size: int = 0,
+        unicode_replacements: Optional[Dict[str, str]] = None,
+        engine: Engine = Engine.Executable,
+        instrumentation_file: Optional[str] = None,
+        command_timeout: Optional[timedelta] = timedelta(seconds=60),
+        snapshot_max_age: timedelta = timedelta(seconds=1),
     ) -> None:
         """
         By default, the emulator visibility is set to visible=True.
@@ -139,6 +187,54 @@ class Mainframe3270(DynamicCore):
         and to modify the ``timeout``, see the `Change Timeout` keyword. Timeouts support all available
         Robot Framework [https://robotframework.org/robotframework/latest/RobotFrameworkUserGuide.html#time-format|time formats].
 
+        By default, the library sleeps for the ``wait_time`` after sending an AID key like Enter or a PF key.
+        With ``wait_strategy=Output`` or ``wait_strategy=Unlock`` it instead waits until the host has answered,
+        see `Change Wait Strategy`.
+
+        With ``write_behind=True``, cursor moves, string inserts and field edits (e.g. by `Write Bare`,
+        `Move Cursor To` or `Delete Field`) are not sent to the emulator immediately. They are queued and sent
+        in one round trip together with the next command that needs an answer, e.g. reading the screen or
+        sending an AID key. This reduces the number of round trips considerably, but errors of queued commands,
+        like writing into a protected field, are only reported by the keyword that sends them.
+
+        With ``process_pool_size`` set to a number greater than 0, the library keeps that many emulator processes
+        started in advance for each combination of emulator model and ``extra_args``. `Open Connection` then
+        takes an already running emulator from the pool instead of starting a new one, and the pool is refilled
+        in the background. The pool is shared by all suites that are run in the same process. It has no effect
+        for wc3270, which is only started when connecting, and for `Open Connection From Session File`, as the
+        emulator connects to the host of the session file as soon as it is started.
+
+        Keywords with a ``replace_unicode`` argument, like `Read All Screen`, replace box drawing characters
+        and all other characters that are not printable ASCII with ``-``. With ``unicode_replacements``,
+        you can pass a dictionary with additional replacements of characters or character sequences,
+        e.g. ``unicode_replacements={"Ü": "U", "é": "e"}``. A character can be mapped to itself to keep it.
+
+        With ``engine=Native``, connections do not start an x3270 family emulator. A TN3270 client written in
+        Python is run in the Robot Framework process instead, and screen reads and searches work on its screen
+        buffer in memory. It supports the emulator arguments ``-port``, ``-codepage`` and ``-model`` and
+        the actions the library uses, so `Execute Command` may fail for other actions, and ``visible``
+        and ``process_pool_size`` have no effect. The default, ``engine=Executable``, uses the emulator
+        selected by ``visible``.
+
+        With ``instrumentation_file`` set to a path, the library records for every keyword how many emulator
+        commands it executed and how its time divides into emulator I/O, which includes waiting for the host,
+        sleeping for the wait times and Python processing. A summary is logged at the end of every test, and
+        each test is written as one JSON object per line to the file, e.g.
+        ``instrumentation_file=mainframe3270.jsonl``. Relative paths are relative to the output directory.
+        Keywords run outside of tests, e.g. in a suite setup, are written without a test name.
+        The file is overwritten by each run and shared by all suites that are run in the same process.
+
+        The ``command_timeout`` is the time the emulator has to answer a command, in addition to the timeout
+        of a ``Wait()`` action, e.g. ``Execute Command    Wait(120, Output)`` may take up to 180 seconds
+        by default. If the emulator does not answer in time, it is killed and the connection is lost.
+        Set ``command_timeout=None`` to give the emulator unlimited time, e.g. for very slow hosts.
+
+        Keywords that read the screen, like `Read` or `Page Should Contain String`, share a single read of the
+        screen until a command changes it, e.g. `Send Enter` or `Write`. Since the host may also change the screen
+        on its own, e.g. with a second write after unlocking the keyboard, a read is only reused for the
+        ``snapshot_max_age``, one second by default. A longer age saves round trips to the emulator, a shorter one
+        sees such changes earlier, and ``snapshot_max_age=0`` reads the screen again for every keyword.
+
         By default, Mainframe3270 will take a screenshot on failure.
         You can overwrite this to run any other keyword by setting the ``run_on_failure_keyword`` option.
         If you pass ``None`` to this argument, no keyword will be run.
@@ -146,24 +242,39 @@ class Mainframe3270(DynamicCore):
         """
         self.visible = visible
         self.timeout = convert_timeout(timeout)
+        self.command_timeout = None if command_timeout is None else convert_timeout(command_timeout)
+        self.snapshot_max_age = convert_timeout(snapshot_max_age)
         self.wait_time = convert_timeout(wait_time)
         self.wait_time_after_write = convert_timeout(wait_time_after_write)
+        self.wait_strategy = wait_strategy
+        self.write_behind = write_behind
+        self.engine = engine
+        self.unicode_replacements = unicode_replacements
+        self.app_pool = AppPool.shared(process_pool_size) if process_pool_size > 0 else None
         # When generating the library documentation with libdoc, BuiltIn.get_variable_value throws
         # a RobotNotRunningError. Therefore, we catch it here to be able to generate the documentation.
         try:
             self.img_folder = BuiltIn().get_variable_value("${OUTPUT_DIR}")
         except RobotNotRunningError:
             self.img_folder = os.getcwd()
+        self.instrumentation = None
+        if instrumentation_file:
+            self.instrumentation = Instrumentation.shared(os.path.join(self.img_folder, instrumentation_file))
+            self.ROBOT_LIBRARY_LISTENER = self.instrumentation
         self._running_on_failure_keyword = False
         self.register_run_on_failure_keyword(run_on_failure_keyword)
         self.model = model
         self.cache = ConnectionCache()
+        self.concurrent_connections: List[AsyncEmulator] = []
         libraries = [
             AssertionKeywords(self),
             CommandKeywords(self),
+            ConcurrentConnectionKeywords(self),
             ConnectionKeywords(self),
+            FieldKeywords(self),
             ReadWriteKeywords(self),
             ScreenshotKeywords(self),
+            SessionPoolKeywords(self),
             WaitAndTimeoutKeywords(self),
         ]
         DynamicCore.__init__(self, libraries)
@@ -190,12 +301,37 @@ class Mainframe3270(DynamicCore):
             self.run_on_failure_keyword = keyword
 
     def run_keyword(self, name: str, args: list, kwargs: dict) -> Any:
+        if self.instrumentation is not None:
+            return self.instrumentation.run_keyword(name, lambda: self._run_keyword(name, args, kwargs))
+        return self._run_keyword(name, args, kwargs)
+
+    def _run_keyword(self, name: str, args: list, kwargs: dict) -> Any:
+        try:
+            result = DynamicCore.run_keyword(self, name, args, kwargs)
+        except Exception:
+            self.log_emulator_error_output()
+            self.run_on_failure()
+            raise
+        if inspect.iscoroutine(result):
+            # asynchronous keywords only fail once Robot Framework awaits them
+            return self._run_async_keyword(result)
+        return result
+
+    async def _run_async_keyword(self, coroutine: Coroutine) -> Any:
         try:
-            return DynamicCore.run_keyword(self, name, args, kwargs)
+            return await coroutine
         except Exception:
+            self.log_emulator_error_output()
             self.run_on_failure()
             raise
 
+    def log_emulator_error_output(self) -> None:
+        if self.cache.current_index is None:
+            return
+        error_output = self.mf.get_stderr()
+        if error_output:
+            logger.info(f"Emulator error output:\n{error_output}")
+
     def run_on_failure(self) -> None:
         if self._running_on_failure_keyword or not self.run_on_failure_keyword:
             return
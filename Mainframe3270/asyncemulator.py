@@ -0,0 +1,267 @@
+import asyncio
+import logging
+from collections import deque
+from os import name as os_name
+from Mainframe3270.py3270 import (
+    Command,
+    CommandTimeoutError,
+    Emulator,
+    ExecutableApp,
+    KeyboardStateError,
+    Status,
+    TerminatedError,
+    UnicodeNormalizer,
+    get_command_timeout,
+    s3270App,
+    ws3270App,
+    x3270App,
+)
+
+log = logging.getLogger(__name__)
+
+
+class AsyncEmulator(object):
+    """
+    An asyncio based variant of Emulator
+
+    The emulator subprocess is read through asyncio streams instead of blocking a thread,
+    so that a single event loop can drive hundreds of emulators concurrently. All methods
+    that talk to the emulator are coroutines:
+
+        async with AsyncEmulator() as emulator:
+            await emulator.connect("pub400.com")
+            await emulator.wait_for_field()
+            screen = await emulator.read_all_screen()
+
+    wc3270 is driven through a socket and is not supported, so `visible` can not be used on Windows.
+    """
+
+    def __init__(
+        self,
+        visible=False,
+        timeout=30,
+        extra_args=None,
+        model="2",
+        command_timeout=60,
+        unicode_replacements=None,
+    ):
+        """
+        Create an emulator instance, see Emulator for the arguments.
+
+        The emulator subprocess is started by `start` or, at the latest, by the first command.
+        """
+        if os_name == "nt":
+            if visible:
+                raise ValueError("wc3270 can not be driven asynchronously, use visible=False")
+            app_class = ws3270App
+        else:
+            app_class = x3270App if visible else s3270App
+        self.model = model
+        self.model_dimensions = Emulator._set_model_dimensions(model)
+        self.executable = app_class.executable
+        self.args = app_class._get_executable_app_args(extra_args, model)
+        self.timeout = timeout
+        self.command_timeout = command_timeout
+        self.unicode_normalizer = UnicodeNormalizer(unicode_replacements)
+        self.status = Status(None)
+        self.is_terminated = False
+        self.last_host = None
+        self.stderr_lines = deque(maxlen=ExecutableApp.STDERR_MAX_LINES)
+        self.process = None
+        self._start_task = None
+        self._stderr_task = None
+        self._lock = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.terminate()
+
+    async def start(self):
+        """
+        Start the emulator subprocess, if it is not running yet.
+        """
+        # concurrent callers all wait for the same subprocess to be started
+        if self._start_task is None:
+            self._start_task = asyncio.ensure_future(self._spawn())
+        await self._start_task
+        return self
+
+    async def _spawn(self):
+        self._lock = asyncio.Lock()
+        self.process = await asyncio.create_subprocess_exec(
+            self.executable,
+            *self.args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        self._stderr_task = asyncio.ensure_future(self._drain_stderr())
+
+    async def _drain_stderr(self):
+        # see ExecutableApp.start_stderr_drain
+        while True:
+            try:
+                line = await self.process.stderr.readline()
+            except ValueError:
+                # the line exceeded the limit of the stream, the rest of it was discarded
+                continue
+            if not line:
+                return
+            self.stderr_lines.append(line.rstrip(b"\r\n").decode("utf-8", errors="replace"))
+
+    async def exec_command(self, cmdstr, timeout=None):
+        """
+        Execute a x3270 command, see Emulator.exec_command
+
+        Commands of concurrent callers are sent one after another.
+        """
+        if self.is_terminated:
+            raise TerminatedError("This Emulator instance has been terminated")
+        await self.start()
+        c = Command(None, cmdstr)
+        c.timeout = get_command_timeout(c.cmdstr, timeout, self.command_timeout)
+        async with self._lock:
+            self.process.stdin.write(c.cmdstr + b"\n")
+            try:
+                await asyncio.wait_for(self._read_result(c), c.timeout)
+            except asyncio.TimeoutError:
+                self._kill()
+                raise CommandTimeoutError("The emulator did not answer within {0} seconds".format(c.timeout))
+        self.status = Status(c.status_line)
+        return c
+
+    async def _read_result(self, c):
+        # see Command.read_result
+        readline = self.process.stdout.readline
+        while True:
+            line = await readline()
+            if not line.startswith(b"data:"):
+                c.status_line = line.rstrip()
+                result = (await readline()).rstrip()
+                return c.handle_result(result.decode("utf-8"))
+            c.data.append(line[6:].rstrip(b"\n\r"))
+
+    def _kill(self):
+        """
+        Kill the emulator subprocess, which can not be used anymore, e.g. after it stopped responding.
+        """
+        if self.process is not None and self.process.returncode is None:
+            self.process.kill()
+        self.is_terminated = True
+
+    async def terminate(self):
+        """
+        Terminate the emulator subprocess. Once called, this instance must no longer be used.
+        """
+        if not self.is_terminated and self.process is not None:
+            log.debug("terminal client terminated")
+            try:
+                await self.exec_command(b"Quit")
+            except (BrokenPipeError, ConnectionResetError):
+                # the emulator was terminated, since we are just quitting anyway, ignore it.
+                pass
+        self.is_terminated = True
+        if self.process is not None:
+            await self.process.wait()
+        if self._stderr_task is not None:
+            await self._stderr_task
+
+    def get_stderr(self):
+        """
+        Return the buffered error output of the emulator subprocess.
+        """
+        return "\n".join(self.stderr_lines)
+
+    async def is_connected(self):
+        """
+        Return bool indicating connection state
+        """
+        await self.exec_command(b"ignore")
+        # connected status is like 'C(192.168.1.1)', disconnected is 'N'
+        return bool(self.status.connection_state and self.status.connection_state.startswith(b"C("))
+
+    async def connect(self, host):
+        """
+        Connect to a host
+        """
+        await self.exec_command("Connect({0})".format(host).encode("utf-8"))
+        self.last_host = host
+
+    async def wait_for_field(self):
+        """
+        Wait until the screen is ready, see Emulator.wait_for_field
+        """
+        await self.exec_command("Wait({0}, InputField)".format(self.timeout).encode("utf-8"))
+        if self.status.keyboard != b"U":
+            raise KeyboardStateError(
+                "keyboard not unlocked, state was: {0}".format(self.status.keyboard.decode("utf-8"))
+            )
+
+    async def move_to(self, ypos, xpos):
+        """
+        Move the cursor to the given coordinates. Coordinates are 1 based.
+        """
+        self.check_limits(ypos, xpos)
+        # the screen's coordinates are 1 based, but the command is 0 based
+        await self.exec_command("MoveCursor({0}, {1})".format(ypos - 1, xpos - 1).encode("utf-8"))
+
+    async def send_string(self, tosend, ypos=None, xpos=None):
+        """
+        Send a string to the screen at the current cursor location or at
+        screen coordinates `ypos`/`xpos` if they are both given.
+        """
+        if xpos and ypos:
+            await self.move_to(ypos, xpos)
+        await self.exec_command(Emulator._string_command(tosend))
+
+    async def send_enter(self):
+        await self.exec_command(b"Enter")
+
+    async def string_get(self, ypos, xpos, length):
+        """
+        Get a string of `length` at screen coordinates `ypos`/`xpos`. Coordinates are 1 based.
+        """
+        self.check_limits(ypos, xpos)
+        if (xpos + length) > (self.model_dimensions["columns"] + 1):
+            raise Exception("You have exceeded the x-axis limit of the mainframe screen")
+        cmd = await self.exec_command("ascii({0},{1},{2})".format(ypos - 1, xpos - 1, length).encode("utf-8"))
+        return cmd.data[0].decode("utf-8", errors="replace")
+
+    async def read_screen_rows(self):
+        """
+        Read all the mainframe screen and return it as a list of rows.
+        """
+        rows = self.model_dimensions["rows"]
+        columns = self.model_dimensions["columns"]
+        cmd = await self.exec_command("ascii(0,0,{0},{1})".format(rows, columns).encode("utf-8"))
+        return [line.decode("utf-8", errors="replace") for line in cmd.data]
+
+    async def read_all_screen(self, replace_unicode=True):
+        """
+        Read all the mainframe screen and return it in a single string.
+        """
+        full_text = "".join(await self.read_screen_rows())
+        if replace_unicode:
+            full_text = self.unicode_normalizer.normalize(full_text)
+        return full_text
+
+    async def search_string(self, string, ignore_case=False):
+        """
+        Check if a string exists on the mainframe screen and return True or False.
+        """
+        if ignore_case:
+            string = string.lower()
+        for line in await self.read_screen_rows():
+            if ignore_case:
+                line = line.lower()
+            if string in line:
+                return True
+        return False
+
+    def check_limits(self, ypos, xpos):
+        if ypos > self.model_dimensions["rows"]:
+            raise Exception("You have exceeded the y-axis limit of the mainframe screen")
+        if xpos > self.model_dimensions["columns"]:
+            raise Exception("You have exceeded the x-axis limit of the mainframe screen")
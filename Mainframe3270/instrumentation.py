@@ -0,0 +1,200 @@
+import inspect
+import json
+import os
+import time
+from typing import Any, Callable, Coroutine, Dict, List, Optional
+from robot.api import logger
+
+
+class KeywordRecord:
+    """The emulator commands and the times of one keyword invocation."""
+
+    __slots__ = ("name", "commands", "seconds", "emulator_seconds", "sleep_seconds")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.commands = 0
+        self.seconds = 0.0
+        self.emulator_seconds = 0.0
+        self.sleep_seconds = 0.0
+
+    @property
+    def python_seconds(self) -> float:
+        """The time that was neither spent waiting for the emulator nor sleeping."""
+        return max(self.seconds - self.emulator_seconds - self.sleep_seconds, 0.0)
+
+    def to_dict(self) -> dict:
+        return {
+            "keyword": self.name,
+            "commands": self.commands,
+            "seconds": round(self.seconds, 6),
+            "emulator_seconds": round(self.emulator_seconds, 6),
+            "sleep_seconds": round(self.sleep_seconds, 6),
+            "python_seconds": round(self.python_seconds, 6),
+        }
+
+
+class Instrumentation:
+    """
+    Records for every keyword of the library how many emulator commands it executed and how its time divides into
+    emulator I/O, which includes waiting for the host, sleeping for the wait times, and Python processing.
+
+    It is the listener of the library instances that use it. At the end of every test, it logs a summary of the
+    keywords of the test and appends them as one JSON object to a JSON Lines file. Keywords run outside of tests,
+    e.g. in a suite setup, are written without a test name.
+
+    Instrumentations are shared per file by all library instances in the same process, so that connections
+    used by several suites, e.g. from a session pool, are recorded by the suite that is running.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 3
+
+    _shared: Dict[str, "Instrumentation"] = {}
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records: List[KeywordRecord] = []
+        self._running: List[KeywordRecord] = []
+        self._in_emulator = False
+        self._last_test = None
+        # the file only contains the results of the current run
+        with open(path, "w", encoding="utf-8"):
+            pass
+
+    @classmethod
+    def shared(cls, path: str) -> "Instrumentation":
+        """
+        Return the instrumentation writing to ``path`` that is shared by all library instances in this process,
+        creating it if necessary.
+        """
+        path = os.path.abspath(path)
+        if path not in cls._shared:
+            cls._shared[path] = cls(path)
+        return cls._shared[path]
+
+    def run_keyword(self, name: str, run: Callable[[], Any]) -> Any:
+        """
+        Run the keyword ``name`` by calling ``run`` and record it. Keywords run by another keyword, e.g. by
+        `Check Out Session`, are part of the record of the calling keyword.
+        """
+        record = KeywordRecord(name)
+        self._running.append(record)
+        start = time.perf_counter()
+        try:
+            result = run()
+        except BaseException:
+            self._finish(record, start)
+            raise
+        if inspect.iscoroutine(result):
+            return self._run_async_keyword(record, start, result)
+        self._finish(record, start)
+        return result
+
+    async def _run_async_keyword(self, record: KeywordRecord, start: float, coroutine: Coroutine) -> Any:
+        try:
+            return await coroutine
+        finally:
+            self._finish(record, start)
+
+    def _finish(self, record: KeywordRecord, start: float) -> None:
+        record.seconds = time.perf_counter() - start
+        self._running.remove(record)
+        if not self._running:
+            self.records.append(record)
+
+    def emulator_call(self, call: Callable[..., Any], commands: int, *args: Any) -> Any:
+        """
+        Call ``call`` with ``args`` and record it as emulator I/O of ``commands`` commands for the running
+        keywords. Calls made by ``call`` itself, e.g. when ``exec_command`` sends queued commands with
+        ``exec_batch``, are not recorded again.
+        """
+        if self._in_emulator:
+            return call(*args)
+        self._in_emulator = True
+        start = time.perf_counter()
+        try:
+            return call(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._in_emulator = False
+            for record in self._running:
+                record.commands += commands
+                record.emulator_seconds += elapsed
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep for ``seconds`` and record it for the running keywords."""
+        start = time.perf_counter()
+        time.sleep(seconds)
+        elapsed = time.perf_counter() - start
+        for record in self._running:
+            record.sleep_seconds += elapsed
+
+    def start_test(self, data, result) -> None:
+        self._write(self._suite_name(result.parent), None, None, self._take_records())
+
+    def end_test(self, data, result) -> None:
+        # every library instance of the suite that uses this instrumentation is called for the same test
+        if result is self._last_test:
+            return
+        self._last_test = result
+        records = self._take_records()
+        logger.info(self.summarize(records))
+        self._write(self._suite_name(result.parent), result.name, result.status, records)
+
+    def end_suite(self, data, result) -> None:
+        self._write(self._suite_name(result), None, None, self._take_records())
+
+    def _take_records(self) -> List[KeywordRecord]:
+        records, self.records = self.records, []
+        return records
+
+    @staticmethod
+    def _suite_name(suite) -> str:
+        # Robot Framework 7 renamed longname to full_name
+        return getattr(suite, "full_name", None) or suite.longname
+
+    def _write(self, suite: str, test: Optional[str], status: Optional[str], records: List[KeywordRecord]) -> None:
+        if test is None and not records:
+            return
+        line: Dict[str, Any] = {"suite": suite, "test": test, "status": status}
+        line.update(self._totals(records))
+        line["details"] = [record.to_dict() for record in records]
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(line) + "\n")
+
+    @staticmethod
+    def _totals(records: List[KeywordRecord]) -> dict:
+        return {
+            "keywords": len(records),
+            "commands": sum(record.commands for record in records),
+            "seconds": round(sum(record.seconds for record in records), 6),
+            "emulator_seconds": round(sum(record.emulator_seconds for record in records), 6),
+            "sleep_seconds": round(sum(record.sleep_seconds for record in records), 6),
+            "python_seconds": round(sum(record.python_seconds for record in records), 6),
+        }
+
+    @classmethod
+    def summarize(cls, records: List[KeywordRecord]) -> str:
+        """Return a table of the records, with the invocations of the same keyword added up."""
+        totals = cls._totals(records)
+        lines = [
+            f"Mainframe3270 keywords: {totals['keywords']} calls, {totals['commands']} emulator commands, "
+            f"{totals['seconds']:.3f} s, of which {totals['emulator_seconds']:.3f} s emulator I/O, "
+            f"{totals['sleep_seconds']:.3f} s sleeping and {totals['python_seconds']:.3f} s Python",
+        ]
+        by_keyword: Dict[str, List[KeywordRecord]] = {}
+        for record in records:
+            by_keyword.setdefault(record.name, []).append(record)
+        if by_keyword:
+            lines.append(
+                f"{'Keyword':<40} {'Calls':>5} {'Commands':>8} {'Total s':>9} "
+                f"{'Emulator s':>10} {'Sleep s':>9} {'Python s':>9}"
+            )
+        for name, keyword_records in by_keyword.items():
+            keyword_totals = cls._totals(keyword_records)
+            lines.append(
+                f"{name:<40} {keyword_totals['keywords']:>5} {keyword_totals['commands']:>8} "
+                f"{keyword_totals['seconds']:>9.3f} {keyword_totals['emulator_seconds']:>10.3f} "
+                f"{keyword_totals['sleep_seconds']:>9.3f} {keyword_totals['python_seconds']:>9.3f}"
+            )
+        return "\n".join(lines)
@@ -1,6 +1,9 @@
 from Mainframe3270.keywords.assertions import AssertionKeywords  # noqa: F401
 from Mainframe3270.keywords.commands import CommandKeywords  # noqa: F401
+from Mainframe3270.keywords.concurrent import ConcurrentConnectionKeywords  # noqa: F401
 from Mainframe3270.keywords.connection import ConnectionKeywords  # noqa: F401
+from Mainframe3270.keywords.fields import FieldKeywords  # noqa: F401
 from Mainframe3270.keywords.read_write import ReadWriteKeywords  # noqa: F401
 from Mainframe3270.keywords.screenshot import ScreenshotKeywords  # noqa: F401
+from Mainframe3270.keywords.session_pool import SessionPoolKeywords  # noqa: F401
 from Mainframe3270.keywords.wait_and_timeout import WaitAndTimeoutKeywords  # noqa: F401
@@ -1,15 +1,19 @@
 import re
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from robot.api import logger
 from robot.api.deco import keyword
-from robot.utils import Matcher
 from Mainframe3270.librarycomponent import LibraryComponent
+from Mainframe3270.utils import compile_regex, get_matcher
 
 
 class AssertionKeywords(LibraryComponent):
     @keyword("Page Should Contain String")
     def page_should_contain_string(
-        self, txt: str, ignore_case: bool = False, error_message: Optional[str] = None
+        self,
+        txt: str,
+        ignore_case: bool = False,
+        error_message: Optional[str] = None,
+        region: Optional[Tuple[int, int, int, int]] = None,
     ) -> None:
         """Assert that a given string exists on the mainframe screen.
 
@@ -18,17 +22,21 @@ class AssertionKeywords(LibraryComponent):
 
         You can change the exception message by setting a custom string to error_message.
 
+        To only search a rectangular region of the screen, pass it as ``region=(ypos, xpos, rows, columns)``,
+        see `Read Region`.
+
         Example:
             | Page Should Contain String | something |
             | Page Should Contain String | someTHING | ignore_case=True |
             | Page Should Contain String | something | error_message=New error message |
+            | Page Should Contain String | something | region=(22, 1, 3, 80) |
         """
         message = f'The string "{txt}" was not found'
         if error_message:
             message = error_message
         if ignore_case:
             txt = txt.lower()
-        result = self.mf.search_string(txt, ignore_case)
+        result = self.mf.search_string(txt, ignore_case, region)
         if not result:
             raise Exception(message)
         logger.info(f'The string "{txt}" was found')
@@ -70,6 +78,9 @@ class AssertionKeywords(LibraryComponent):
         The assertion is case-sensitive. If you want it to be case-insensitive, you can pass the argument
         ignore_case=True.
 
+        All strings are searched in a single scan of the screen. The positions where the strings were
+        found are logged.
+
         You can change the exception message by setting a custom string to error_message.
 
         Example:
@@ -82,12 +93,10 @@ class AssertionKeywords(LibraryComponent):
             message = error_message
         if ignore_case:
             list_string = [item.lower() for item in list_string]
-        for string in list_string:
-            result = self.mf.search_string(string, ignore_case)
-            if result:
-                break
-        if not result:
+        found = {string: positions for string, positions in self._search_strings(list_string, ignore_case) if positions}
+        if not found:
             raise Exception(message)
+        self._log_found_strings(found)
 
     @keyword("Page Should Not Contain Any String")
     def page_should_not_contain_any_string(
@@ -123,6 +132,9 @@ class AssertionKeywords(LibraryComponent):
         The assertion is case-sensitive. If you want it to be case-insensitive, you can pass the argument
         ignore_case=True.
 
+        All strings are searched in a single scan of the screen. The positions where the strings were
+        found are logged.
+
         You can change the exception message by setting a custom string to error_message.
 
         Example:
@@ -152,15 +164,7 @@ class AssertionKeywords(LibraryComponent):
             | Page Should Not Contain All Strings | ${list_of_string} | ignore_case=True |
             | Page Should Not Contain All Strings | ${list_of_string} | error_message=New error message |
         """
-        message = error_message
-        if ignore_case:
-            list_string = [item.lower() for item in list_string]
-        for string in list_string:
-            result = self.mf.search_string(string, ignore_case)
-            if result:
-                if message is None:
-                    message = f'The string "{string}" was found'
-                raise Exception(message)
+        self._compare_all_list_with_screen_text(list_string, ignore_case, error_message, should_match=False)
 
     @keyword("Page Should Contain String X Times")
     def page_should_contain_string_x_times(
@@ -206,7 +210,7 @@ class AssertionKeywords(LibraryComponent):
         thus be escaped with another backslash (e.g. \\d\\w+).
         """
         page_text = self.mf.read_all_screen()
-        if not re.findall(regex_pattern, page_text, re.MULTILINE):
+        if not compile_regex(regex_pattern, re.MULTILINE).search(page_text):
             raise Exception(f'No matches found for "{regex_pattern}" pattern')
 
     @keyword("Page Should Not Match Regex")
@@ -220,7 +224,7 @@ class AssertionKeywords(LibraryComponent):
         thus be escaped with another backslash (e.g. \\d\\w+).
         """
         page_text = self.mf.read_all_screen()
-        if re.findall(regex_pattern, page_text, re.MULTILINE):
+        if compile_regex(regex_pattern, re.MULTILINE).search(page_text):
             raise Exception(f'There are matches found for "{regex_pattern}" pattern')
 
     @keyword("Page Should Contain Match")
@@ -252,7 +256,7 @@ class AssertionKeywords(LibraryComponent):
         if ignore_case:
             txt = txt.lower()
             all_screen = all_screen.lower()
-        matcher = Matcher(txt, caseless=False, spaceless=False)
+        matcher = get_matcher(txt)
         result = matcher.match(all_screen)
         if not result:
             if message is None:
@@ -288,7 +292,7 @@ class AssertionKeywords(LibraryComponent):
         if ignore_case:
             txt = txt.lower()
             all_screen = all_screen.lower()
-        matcher = Matcher(txt, caseless=False, spaceless=False)
+        matcher = get_matcher(txt)
         result = matcher.match(all_screen)
         if result:
             if message is None:
@@ -304,13 +308,25 @@ class AssertionKeywords(LibraryComponent):
     ) -> None:
         if ignore_case:
             list_string = [item.lower() for item in list_string]
-        for string in list_string:
-            result = self.mf.search_string(string, ignore_case)
-            if not should_match and result:
+        results = self._search_strings(list_string, ignore_case)
+        for string, positions in results:
+            if not should_match and positions:
                 if message is None:
                     message = f'The string "{string}" was found'
                 raise Exception(message)
-            elif should_match and not result:
+            elif should_match and not positions:
                 if message is None:
                     message = f'The string "{string}" was not found'
                 raise Exception(message)
+        if should_match:
+            self._log_found_strings(dict(results))
+
+    def _search_strings(self, list_string: List[str], ignore_case: bool) -> List[Tuple[str, List[Tuple[int, int]]]]:
+        # all strings are searched in a single scan of the screen, see Emulator.search_strings
+        positions = self.mf.search_strings(list_string, ignore_case)
+        return [(string, positions[string]) for string in list_string]
+
+    @staticmethod
+    def _log_found_strings(found: Dict[str, List[Tuple[int, int]]]) -> None:
+        for string, positions in found.items():
+            logger.info(f'The string "{string}" was found at positions {positions}')
@@ -1,15 +1,17 @@
-import time
-from typing import Optional, Union
+from typing import List, Optional, Union
 from robot.api.deco import keyword
 from Mainframe3270.librarycomponent import LibraryComponent
-from Mainframe3270.utils import ResultMode, prepare_position_as
+from Mainframe3270.utils import ResultMode, WaitStrategy, prepare_position_as
 
 
 class CommandKeywords(LibraryComponent):
     @keyword("Execute Command")
-    def execute_command(self, cmd: str) -> None:
+    def execute_command(self, cmd: str, wait_strategy: Optional[WaitStrategy] = None) -> None:
         """Execute a [https://x3270.miraheze.org/wiki/Category:Wc3270_actions|x3270 command].
 
+        The ``wait_strategy`` argument overrides the library wide wait strategy for this call,
+        see `Change Wait Strategy`.
+
         Example:
             | Execute Command | Enter |
             | Execute Command | Home |
@@ -17,9 +19,33 @@ class CommandKeywords(LibraryComponent):
             | Execute Command | PF(1) |
             | Execute Command | Scroll(backward) | # To send Page Up |
             | Execute Command | Scroll(forward) | # To send Page Down |
+            | Execute Command | Enter | wait_strategy=Unlock |
         """
         self.mf.exec_command(cmd.encode("utf-8"))
-        time.sleep(self.wait_time)
+        self.wait_for_host(wait_strategy)
+
+    @keyword("Execute Commands")
+    def execute_commands(self, *cmds: str, wait_strategy: Optional[WaitStrategy] = None) -> List[str]:
+        """Execute several [https://x3270.miraheze.org/wiki/Category:Wc3270_actions|x3270 commands]
+        in one round trip to the emulator.
+
+        All commands are sent at once, which is considerably faster than calling `Execute Command`
+        once per command. If one of the commands fails, the keyword fails with the index
+        (starting at 0) of the first failed command.
+
+        The wait strategy (see `Change Wait Strategy`) is applied once after all commands have been
+        executed. The ``wait_strategy`` argument overrides the library wide wait strategy for this call.
+
+        Returns a list with the output of each command, e.g. the text returned by ``Ascii()``,
+        or an empty string for commands without output.
+
+        Example:
+            | Execute Commands | MoveCursor(4,10) | String("user") | Tab | String("password") | Enter |
+            | @{output} | Execute Commands | Ascii(0,0,10) | Ascii(1,0,10) |
+        """
+        commands = self.mf.exec_batch([cmd.encode("utf-8") for cmd in cmds])
+        self.wait_for_host(wait_strategy)
+        return [b"\n".join(command.data).decode("utf-8", errors="replace") for command in commands]
 
     @keyword("Delete Char")
     def delete_char(self, ypos: Optional[int] = None, xpos: Optional[int] = None) -> None:
@@ -53,12 +79,18 @@ class CommandKeywords(LibraryComponent):
         self.mf.delete_field()
 
     @keyword("Send Enter")
-    def send_enter(self) -> None:
-        """
-        Send an Enter to the screen.
+    def send_enter(self, wait_strategy: Optional[WaitStrategy] = None) -> None:
+        """Send an Enter to the screen.
+
+        The ``wait_strategy`` argument overrides the library wide wait strategy for this call,
+        see `Change Wait Strategy`.
+
+        Example:
+            | Send Enter |
+            | Send Enter | wait_strategy=Output |
         """
         self.mf.send_enter()
-        time.sleep(self.wait_time)
+        self.wait_for_host(wait_strategy)
 
     @keyword("Move Next Field")
     def move_next_field(self) -> None:
@@ -75,14 +107,18 @@ class CommandKeywords(LibraryComponent):
         self.mf.exec_command(b"BackTab")
 
     @keyword("Send PF")
-    def send_pf(self, pf: str) -> None:
+    def send_pf(self, pf: str, wait_strategy: Optional[WaitStrategy] = None) -> None:
         """Send a Program Function to the screen.
 
+        The ``wait_strategy`` argument overrides the library wide wait strategy for this call,
+        see `Change Wait Strategy`.
+
         Example:
             | Send PF | 3 |
+            | Send PF | 3 | wait_strategy=Unlock |
         """
         self.mf.exec_command("PF({0})".format(pf).encode("utf-8"))
-        time.sleep(self.wait_time)
+        self.wait_for_host(wait_strategy)
 
     @keyword("Get Current Position")
     def get_current_position(self, mode: ResultMode = ResultMode.As_Tuple) -> Union[tuple, dict]:
@@ -0,0 +1,96 @@
+import asyncio
+import shlex
+from typing import List, Optional
+from robot.api import logger
+from robot.api.deco import keyword
+from Mainframe3270.asyncemulator import AsyncEmulator
+from Mainframe3270.librarycomponent import LibraryComponent
+
+
+class ConcurrentConnectionKeywords(LibraryComponent):
+    @keyword("Open Concurrent Connections")
+    async def open_concurrent_connections(
+        self, host: str, count: int, port: int = 23, extra_args: Optional[List[str]] = None
+    ) -> int:
+        """Open ``count`` connections to ``host`` at the same time and wait until all of them show an input field.
+
+        The connections are driven by a single asyncio event loop instead of one blocking emulator each,
+        which allows to open hundreds of them, e.g. to generate load on a host. They are separate from
+        the connections opened with `Open Connection` and are only used by the keywords with
+        ``Concurrent Connections`` in their name. Opening more connections adds them to the already opened ones.
+
+        ``extra_args`` are passed to every emulator, like in `Open Connection`.
+
+        Returns the number of open concurrent connections.
+
+        Example:
+            | Open Concurrent Connections | pub400.com | 200 |
+            | ${results} | Execute Command On Concurrent Connections | Enter |
+            | [Teardown] | Close Concurrent Connections |
+        """
+        if isinstance(extra_args, str):
+            extra_args = shlex.split(extra_args)
+        emulators = [
+            AsyncEmulator(
+                self.visible,
+                self.timeout,
+                extra_args,
+                self.model,
+                self.command_timeout,
+                unicode_replacements=self.unicode_replacements,
+            )
+            for _ in range(count)
+        ]
+        self.concurrent_connections.extend(emulators)
+        await asyncio.gather(*(self._connect(emulator, f"{host}:{port}") for emulator in emulators))
+        return len(self.concurrent_connections)
+
+    @staticmethod
+    async def _connect(emulator: AsyncEmulator, host: str) -> None:
+        await emulator.connect(host)
+        await emulator.wait_for_field()
+
+    @keyword("Execute Command On Concurrent Connections")
+    async def execute_command_on_concurrent_connections(self, command: str) -> List[List[str]]:
+        """Execute an [http://x3270.bgp.nu/wc3270-man.html#Actions|x3270 command] on all concurrent connections
+        at the same time, see `Open Concurrent Connections`.
+
+        Returns the data returned by the command for every connection, in the order the connections were opened.
+
+        Example:
+            | ${results} | Execute Command On Concurrent Connections | Enter |
+            | ${results} | Execute Command On Concurrent Connections | Ascii(0,0,1,80) |
+        """
+        cmdstr = command.encode("utf-8")
+        commands = await asyncio.gather(*(emulator.exec_command(cmdstr) for emulator in self.concurrent_connections))
+        return [[line.decode("utf-8", errors="replace") for line in c.data] for c in commands]
+
+    @keyword("Read All Screens Of Concurrent Connections")
+    async def read_all_screens_of_concurrent_connections(self, replace_unicode: bool = True) -> List[str]:
+        """Read the whole screen of all concurrent connections at the same time, see `Read All Screen`.
+
+        Returns the screens in the order the connections were opened.
+
+        Example:
+            | ${screens} | Read All Screens Of Concurrent Connections |
+        """
+        return list(
+            await asyncio.gather(
+                *(emulator.read_all_screen(replace_unicode) for emulator in self.concurrent_connections)
+            )
+        )
+
+    @keyword("Close Concurrent Connections")
+    async def close_concurrent_connections(self) -> None:
+        """Close all concurrent connections, see `Open Concurrent Connections`.
+
+        Connections that fail to close are logged as a warning.
+
+        Example:
+            | Close Concurrent Connections |
+        """
+        emulators, self.concurrent_connections[:] = list(self.concurrent_connections), []
+        results = await asyncio.gather(*(emulator.terminate() for emulator in emulators), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warn(f"Closing a concurrent connection failed: {result}")
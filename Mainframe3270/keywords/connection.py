@@ -7,6 +7,7 @@ from robot.api import logger
 from robot.api.deco import keyword
 from Mainframe3270.librarycomponent import LibraryComponent
 from Mainframe3270.py3270 import Emulator
+from Mainframe3270.utils import Engine
 
 
 class ConnectionKeywords(LibraryComponent):
@@ -73,7 +74,19 @@ class ConnectionKeywords(LibraryComponent):
                 extra_args.append("-utf8")
         extra_args = self._process_args(extra_args)
         model = self._get_model_from_list_or_file(extra_args)
-        connection = Emulator(self.visible, self.timeout, extra_args, model or self.model)
+        connection = Emulator(
+            self.visible,
+            self.timeout,
+            extra_args,
+            model or self.model,
+            self.write_behind,
+            self.command_timeout,
+            app_pool=self.app_pool,
+            unicode_replacements=self.unicode_replacements,
+            snapshot_max_age=self.snapshot_max_age,
+            engine=self.engine.name.lower(),
+            instrumentation=self.instrumentation,
+        )
         host_string = f"{lu}@{host}" if lu else host
         if self._port_in_extra_args(extra_args):
             if port != 23:
@@ -137,6 +150,7 @@ class ConnectionKeywords(LibraryComponent):
 
         This keyword is an alternative to `Open Connection`. Please note that the Robot-Framework-Mainframe-3270-Library
         currently only supports model "2". Specifying any other model will result in a failure.
+        Session files are not supported with the native engine, see `Importing`.
 
         For more information on session file syntax and detailed examples, please
         consult the [https://x3270.miraheze.org/wiki/Session_file|x3270 wiki].
@@ -152,14 +166,35 @@ class ConnectionKeywords(LibraryComponent):
         | wc3270.hostname: myhost.com:23
         | wc3270.model: 2
         """
+        if self.engine == Engine.Native:
+            raise ValueError("Session files are not supported by the native engine")
         self._check_session_file_extension(session_file)
         self._check_contains_hostname(session_file)
         model = self._get_model_from_list_or_file(session_file)
         if os_name == "nt" and self.visible:
-            connection = Emulator(self.visible, self.timeout, model=model or self.model)
+            connection = Emulator(
+                self.visible,
+                self.timeout,
+                model=model or self.model,
+                write_behind=self.write_behind,
+                command_timeout=self.command_timeout,
+                unicode_replacements=self.unicode_replacements,
+                snapshot_max_age=self.snapshot_max_age,
+                instrumentation=self.instrumentation,
+            )
             connection.connect(str(session_file))
         else:
-            connection = Emulator(self.visible, self.timeout, [str(session_file)], model or self.model)
+            connection = Emulator(
+                self.visible,
+                self.timeout,
+                [str(session_file)],
+                model or self.model,
+                self.write_behind,
+                self.command_timeout,
+                unicode_replacements=self.unicode_replacements,
+                snapshot_max_age=self.snapshot_max_age,
+                instrumentation=self.instrumentation,
+            )
         return self.cache.register(connection, alias)
 
     def _check_session_file_extension(self, session_file):
@@ -205,6 +240,19 @@ class ConnectionKeywords(LibraryComponent):
         """
         self.cache.switch(alias_or_index)
 
+    @keyword("Get Emulator Error Output")
+    def get_emulator_error_output(self) -> str:
+        """Returns the last lines that the emulator of the current connection has written to its error output,
+        e.g. trace or TLS warnings.
+
+        The error output is read continuously in the background and only the last 500 lines are kept.
+        It is also logged automatically when a keyword fails.
+
+        Example:
+            | ${error_output} | Get Emulator Error Output |
+        """
+        return self.mf.get_stderr()
+
     @keyword("Close Connection")
     def close_connection(self) -> None:
         """
@@ -216,5 +264,7 @@ class ConnectionKeywords(LibraryComponent):
     def close_all_connections(self) -> None:
         """
         Close all currently opened connections and reset the index counter to 1.
+
+        Sessions that were returned to a session pool with `Check In Session` are kept open.
         """
         self.cache.close_all("terminate")
@@ -0,0 +1,93 @@
+import re
+from typing import Dict, List, Optional, Tuple, Union
+from robot.api.deco import keyword
+from Mainframe3270.librarycomponent import LibraryComponent
+from Mainframe3270.utils import WaitStrategy
+
+POSITION_REGEX = re.compile(r"^\(?\s*(\d+)\s*,\s*(\d+)\s*\)?$")
+
+
+class FieldKeywords(LibraryComponent):
+    @keyword("Get Fields")
+    def get_fields(self) -> List[Dict[str, Union[int, bool]]]:
+        """Returns all fields of the current screen, in the order of their position.
+
+        Each field is returned as a dictionary in the form of
+        ``{"ypos": int, "xpos": int, "length": int, "protected": bool, "numeric": bool, "intensified": bool,
+        "modified": bool}``, where ``ypos`` and ``xpos`` are the 1 based coordinates of the first character of
+        the field. An unformatted screen has no fields.
+
+        The fields are read from the emulator with a single command and are cached until the screen changes.
+
+        Example:
+            | ${fields} | Get Fields |
+            | Should Be True | ${fields}[0][protected] |
+        """
+        return [field.as_dict() for field in self.mf.get_fields()]
+
+    @keyword("Get Input Fields")
+    def get_input_fields(self) -> List[Dict[str, Union[int, bool]]]:
+        """Returns the unprotected fields of the current screen, i.e. the fields that can be written to.
+
+        See `Get Fields` for the format of the fields.
+
+        Example:
+            | ${fields} | Get Input Fields |
+            | Write Bare In Position | username | ${fields}[0][ypos] | ${fields}[0][xpos] |
+        """
+        return [field.as_dict() for field in self.mf.get_input_fields()]
+
+    @keyword("Get Field At")
+    def get_field_at(self, ypos: int, xpos: int) -> Optional[Dict[str, Union[int, bool]]]:
+        """Returns the field that contains the screen coordinates ``ypos`` / ``xpos``,
+        or ``None`` if the screen is unformatted.
+
+        See `Get Fields` for the format of the field.
+
+        Example:
+            | ${field} | Get Field At | 5 | 20 |
+            | Should Not Be True | ${field}[protected] |
+        """
+        field = self.mf.get_field_at(ypos, xpos)
+        return field.as_dict() if field else None
+
+    @keyword("Fill Form")
+    def fill_form(
+        self, fields: Dict[str, str], aid: Optional[str] = None, wait_strategy: Optional[WaitStrategy] = None
+    ) -> None:
+        """Fills several fields with a single transmission to the emulator and optionally sends an AID key.
+
+        ``fields`` is a dictionary of the values to write. Its keys are either screen coordinates in the form
+        ``ypos,xpos``, or a label that is shown on the screen, in which case the value is written to the
+        first input field after the label. Each field is erased from the given position to its end before
+        the value is written.
+
+        Before anything is sent, all values are checked against the length of their fields,
+        see `Get Fields`. If a value does not fit, the keyword fails and no field is changed.
+
+        ``aid`` is the AID key that is sent after the fields were filled, e.g. ``Enter`` or ``PF(3)``.
+        In this case, the keyword waits for the host like `Send Enter`, and ``wait_strategy`` overrides
+        the library wide wait strategy for this call, see `Change Wait Strategy`.
+
+        Example:
+            | &{form} | Create Dictionary | User: | myuser | 10,20 | mypassword |
+            | Fill Form | ${form} | aid=Enter |
+        """
+        writes = [(*self._resolve_form_position(key), str(value)) for key, value in fields.items()]
+        self.mf.fill_fields(writes, aid.encode("utf-8") if aid else None)
+        self.sleep(self.wait_time_after_write)
+        if aid:
+            self.wait_for_host(wait_strategy)
+
+    def _resolve_form_position(self, key: str) -> Tuple[int, int]:
+        match = POSITION_REGEX.match(key)
+        if match:
+            return int(match.group(1)), int(match.group(2))
+        positions = self.mf.get_string_positions(key)
+        if not positions:
+            raise Exception(f'The label "{key}" was not found')
+        ypos, xpos = positions[0]
+        field = self.mf.get_input_field_after(ypos, xpos + len(key))
+        if field is None:
+            raise Exception(f'There is no input field after the label "{key}"')
+        return field.ypos, field.xpos
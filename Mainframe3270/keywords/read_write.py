@@ -1,8 +1,7 @@
-import time
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 from robot.api.deco import keyword
 from Mainframe3270.librarycomponent import LibraryComponent
-from Mainframe3270.utils import ResultMode, prepare_positions_as
+from Mainframe3270.utils import ResultMode, WaitStrategy, prepare_positions_as
 
 
 class ReadWriteKeywords(LibraryComponent):
@@ -24,6 +23,41 @@ class ReadWriteKeywords(LibraryComponent):
         ypos, xpos = self.mf.get_current_position()
         return self.mf.string_get(ypos, xpos, length)
 
+    @keyword("Read Fields")
+    def read_fields(
+        self, fields: Union[Dict[str, Tuple[int, int, int]], List[Tuple[int, int, int]]]
+    ) -> Union[Dict[str, str], List[str]]:
+        """Get the strings of several fields with a single read of the screen.
+
+        ``fields`` is either a list of ``(ypos, xpos, length)`` tuples, in which case a list with the string of
+        each field is returned, or a dictionary whose values are such tuples, in which case a dictionary with
+        the same keys is returned. See `Read` for the meaning of ``ypos``, ``xpos`` and ``length``.
+
+        All fields are checked against the limits of the screen before it is read.
+
+        Example:
+            | ${values} | Read Fields | ${{[(8, 10, 15), (9, 10, 15)]}} |
+            | &{values} | Read Fields | ${{{"name": (8, 10, 15), "city": (9, 10, 15)}}} |
+        """
+        if isinstance(fields, dict):
+            return dict(zip(fields, self.mf.string_get_many(fields.values())))
+        return self.mf.string_get_many(fields)
+
+    @keyword("Read Region")
+    def read_region(self, ypos: int, xpos: int, rows: int, columns: int) -> List[str]:
+        """Get the rectangular region of ``rows`` rows and ``columns`` columns whose top-left corner is at
+        screen coordinates ``ypos`` / ``xpos``. Returns a list with one string per row.
+
+        Only the region is transferred from the emulator, so reading a few rows is much cheaper than
+        reading the whole screen, especially for large models.
+
+        Coordinates are 1 based, as listed in the status area of the terminal.
+
+        Example for reading the 3 rows of 80 columns starting at y=21 / x=1:
+            | ${rows} | Read Region | 21 | 1 | 3 | 80 |
+        """
+        return self.mf.read_region(ypos, xpos, rows, columns)
+
     @keyword("Read All Screen")
     def read_all_screen(self, replace_unicode: bool = True) -> str:
         """Read the current screen and returns all content in one string.
@@ -49,7 +83,14 @@ class ReadWriteKeywords(LibraryComponent):
         return self.mf.read_all_screen(replace_unicode)
 
     @keyword("Get String Positions")
-    def get_string_positions(self, string: str, mode: ResultMode = ResultMode.As_Tuple, ignore_case: bool = False, replace_unicode: bool = True):
+    def get_string_positions(
+        self,
+        string: str,
+        mode: ResultMode = ResultMode.As_Tuple,
+        ignore_case: bool = False,
+        replace_unicode: bool = True,
+        region: Optional[Tuple[int, int, int, int]] = None,
+    ):
         """Returns a list of tuples of ypos and xpos for the position where the `string` was found,
         or an empty list if it was not found.
 
@@ -61,13 +102,16 @@ class ReadWriteKeywords(LibraryComponent):
         NEW in version 4.4: The `replace_unicode` argument was added to control whether Unicode values should be
         replaced with their corresponding characters. This is useful if you need to get the string positions for strings with unicode symbols like umlauts.
 
+        With `region`, only the rectangular region given as ``(ypos, xpos, rows, columns)`` is searched, see `Read Region`.
+        Within a region, a string is only found if it does not span rows. The positions are still relative to the screen.
 
         Example:
             | ${positions} | Get String Positions | Abc |         |                       | # Returns a list like [(1, 8)] |
             | ${positions} | Get String Positions | Abc | As Dict |                       | # Returns a list like [{"ypos": 1, "xpos": 8}] |
             | ${positions} | Get String Positions | Üab | As Dict | replace_unicode=False | # Returns a list like [{"ypos": 1, "xpos": 8}] |
+            | ${positions} | Get String Positions | Abc | region=(21, 1, 3, 80) | | # Returns a list like [(22, 5)] |
         """
-        positions = self.mf.get_string_positions(string, ignore_case, replace_unicode)
+        positions = self.mf.get_string_positions(string, ignore_case, replace_unicode, region)
         return prepare_positions_as(positions, mode)
 
     @keyword("Get String Positions Only After")
@@ -133,13 +177,17 @@ class ReadWriteKeywords(LibraryComponent):
         return prepare_positions_as(filtered_positions, mode)
 
     @keyword("Write")
-    def write(self, txt: str) -> None:
+    def write(self, txt: str, wait_strategy: Optional[WaitStrategy] = None) -> None:
         """Send a string *and Enter* to the screen at the current cursor location.
 
+        The ``wait_strategy`` argument overrides the library wide wait strategy for this call,
+        see `Change Wait Strategy`.
+
         Example:
             | Write | something |
+            | Write | something | wait_strategy=Unlock |
         """
-        self._write(txt, enter=True)
+        self._write(txt, enter=True, wait_strategy=wait_strategy)
 
     @keyword("Write Unicode")
     def write_unicode(self, txt: str) -> None:
@@ -150,7 +198,7 @@ class ReadWriteKeywords(LibraryComponent):
             | Write Unicode | ß |
         """
         self.mf.exec_command(f'String("{txt}")'.encode("utf-8"))
-        time.sleep(self.wait_time_after_write)
+        self.sleep(self.wait_time_after_write)
         self.mf.send_enter()
 
     @keyword("Write Bare")
@@ -170,19 +218,23 @@ class ReadWriteKeywords(LibraryComponent):
             | Write Unicode Bare | Æ |
         """
         self.mf.exec_command(f'String("{txt}")'.encode("utf-8"))
-        time.sleep(self.wait_time_after_write)
+        self.sleep(self.wait_time_after_write)
 
     @keyword("Write In Position")
-    def write_in_position(self, txt: str, ypos: int, xpos: int) -> None:
+    def write_in_position(self, txt: str, ypos: int, xpos: int, wait_strategy: Optional[WaitStrategy] = None) -> None:
         """Send a string *and Enter* to the screen at screen coordinates ``ypos`` / ``xpos``.
 
         Coordinates are 1 based, as listed in the status area of the
         terminal.
 
+        The ``wait_strategy`` argument overrides the library wide wait strategy for this call,
+        see `Change Wait Strategy`.
+
         Example:
             | Write in Position | something | 9 | 11 |
+            | Write in Position | something | 9 | 11 | wait_strategy=Unlock |
         """
-        self._write(txt, ypos, xpos, enter=True)
+        self._write(txt, ypos, xpos, enter=True, wait_strategy=wait_strategy)
 
     @keyword("Write Bare In Position")
     def write_bare_in_position(self, txt: str, ypos: int, xpos: int):
@@ -202,13 +254,14 @@ class ReadWriteKeywords(LibraryComponent):
         ypos: Optional[int] = None,
         xpos: Optional[int] = None,
         enter: bool = False,
+        wait_strategy: Optional[WaitStrategy] = None,
     ) -> None:
         txt = txt.encode("unicode_escape")
         if ypos and xpos:
             self.mf.send_string(txt, ypos, xpos)
         else:
             self.mf.send_string(txt)
-        time.sleep(self.wait_time_after_write)
+        self.sleep(self.wait_time_after_write)
         if enter:
             self.mf.send_enter()
-            time.sleep(self.wait_time)
+            self.wait_for_host(wait_strategy)
@@ -0,0 +1,92 @@
+from robot.api import logger
+from robot.api.deco import keyword
+from robot.libraries.BuiltIn import BuiltIn
+from Mainframe3270.librarycomponent import LibraryComponent
+from Mainframe3270.sessionpool import CheckedInSession, SessionPool
+
+
+class SessionPoolKeywords(LibraryComponent):
+    @keyword("Create Session Pool")
+    def create_session_pool(self, name: str, setup_keyword: str, reset_keyword: str = "None", size: int = 1) -> None:
+        """Create a pool of up to ``size`` logged-in sessions that are kept alive across test suites.
+
+        ``setup_keyword`` is run by `Check Out Session` whenever a new session is needed. It has to open
+        a connection, e.g. with `Open Connection`, and log in.
+
+        ``reset_keyword`` is run by `Check In Session` on the session that is returned to the pool.
+        It should bring the session back to a known screen, e.g. the main menu, so that the next test
+        can start from there. Pass ``None`` if no reset is needed.
+
+        If a pool with the same name already exists, e.g. because a previous suite created it,
+        its sessions are kept and only its settings are updated. So it is safe to call this keyword
+        in every suite setup.
+
+        Session pools live as long as the Robot Framework process. When running tests in parallel
+        with pabot, each process has its own pools.
+
+        Example:
+            | Create Session Pool | main | Open Connection And Log In | Go To Main Menu | size=2 |
+        """
+        SessionPool.create(name, size, setup_keyword, None if reset_keyword.lower() == "none" else reset_keyword)
+
+    @keyword("Check Out Session")
+    def check_out_session(self, name: str) -> int:
+        """Take a logged-in session from the session pool ``name`` and make it the current connection.
+
+        Idle sessions are checked to still be connected before they are reused. If there is no idle
+        session, a new one is created with the setup keyword of the pool, as long as the pool size
+        is not exceeded.
+
+        Returns the index of the connection, see `Switch Connection`.
+
+        Example:
+            | Check Out Session | main |
+            | Page Should Contain String | MAIN MENU |
+            | [Teardown] | Check In Session | main |
+        """
+        pool = SessionPool.get(name)
+        emulator = pool.take_idle()
+        if emulator is not None:
+            return self.cache.register(emulator, None)
+        if not pool.has_capacity():
+            raise Exception(f'All {pool.size} sessions of session pool "{name}" are checked out')
+        BuiltIn().run_keyword(pool.setup_keyword)
+        pool.check_out(self.mf)
+        return self.cache.current_index
+
+    @keyword("Check In Session")
+    def check_in_session(self, name: str) -> None:
+        """Return the current connection to the session pool ``name``.
+
+        The reset keyword of the pool is run on the session first. If it fails or the session is no longer
+        connected, the session is closed instead of being kept in the pool.
+
+        Afterwards there is no current connection anymore and the index of the session can no longer be used
+        with `Switch Connection`. Switch to another connection or use `Check Out Session` to continue working.
+
+        Example:
+            | Check In Session | main |
+        """
+        pool = SessionPool.get(name)
+        index = self.cache.current_index
+        emulator = self.mf
+        try:
+            if pool.reset_keyword:
+                BuiltIn().run_keyword(pool.reset_keyword)
+        except Exception as error:
+            logger.warn(f'Resetting the session failed, it is removed from session pool "{name}": {error}')
+            pool.discard(emulator)
+        else:
+            pool.check_in(emulator)
+        # ConnectionCache can not remove a connection, so it is replaced to keep the other indices
+        self.cache._connections[index - 1] = CheckedInSession(name)
+        self.cache.current_index = None
+
+    @keyword("Close Session Pool")
+    def close_session_pool(self, name: str) -> None:
+        """Close all idle sessions of the session pool ``name``.
+
+        Example:
+            | Close Session Pool | main |
+        """
+        SessionPool.get(name).close()
@@ -1,12 +1,16 @@
 import time
 from datetime import timedelta
+from typing import Optional, Tuple
 from robot.api.deco import keyword
 from robot.utils import secs_to_timestr
 from Mainframe3270.librarycomponent import LibraryComponent
-from Mainframe3270.utils import convert_timeout
+from Mainframe3270.utils import WaitStrategy, convert_timeout
 
 
 class WaitAndTimeoutKeywords(LibraryComponent):
+    # seconds after which Wait Until String reads the screen again, even if the host did not change it
+    RESCAN_INTERVAL = 5
+
     @keyword("Change Timeout")
     def change_timeout(self, seconds: timedelta) -> None:
         """
@@ -30,6 +34,8 @@ class WaitAndTimeoutKeywords(LibraryComponent):
 
         If you want to change this value, just use this keyword passing the time in seconds.
 
+        The wait time is only applied with the ``Fixed`` wait strategy, see `Change Wait Strategy`.
+
         Example:
             | Change Wait Time | 0.5 |
             | Change Wait Time | 200 milliseconds |
@@ -37,6 +43,29 @@ class WaitAndTimeoutKeywords(LibraryComponent):
         """
         self.wait_time = convert_timeout(wait_time)
 
+    @keyword("Change Wait Strategy")
+    def change_wait_strategy(self, wait_strategy: WaitStrategy) -> None:
+        """Change how the keywords listed in `Change Wait Time` wait for the host after sending an AID key.
+        The wait strategy can also be set on library import or for a single keyword call
+        with the ``wait_strategy`` argument of these keywords.
+
+        Available strategies (case-insensitive):
+
+        - ``Fixed``: sleep for the wait time set with `Change Wait Time`. This is the default.
+        - ``Output``: block in the emulator until the host has changed the screen.
+        - ``Unlock``: block in the emulator until the host has unlocked the keyboard.
+
+        ``Output`` and ``Unlock`` use the native x3270 ``Wait()`` action and return as soon as
+        the host has answered, with the timeout set with `Change Timeout` as an upper bound. If the host does
+        not answer in time, the keyword fails. Note that ``Output`` requires the host to actually
+        send something, so it should not be used with `Execute Command` for local actions like ``Home``.
+
+        Example:
+            | Change Wait Strategy | Unlock |
+            | Change Wait Strategy | Fixed |
+        """
+        self.wait_strategy = wait_strategy
+
     @keyword("Change Wait Time After Write")
     def change_wait_time_after_write(self, wait_time_after_write: timedelta) -> None:
         """To give the user time to see what is happening inside the mainframe, a "wait time after write" has
@@ -75,20 +104,50 @@ class WaitAndTimeoutKeywords(LibraryComponent):
         self.mf.wait_for_field()
 
     @keyword("Wait Until String")
-    def wait_until_string(self, txt: str, timeout: timedelta = timedelta(seconds=5)) -> str:
+    def wait_until_string(
+        self,
+        txt: str,
+        timeout: timedelta = timedelta(seconds=5),
+        region: Optional[Tuple[int, int, int, int]] = None,
+    ) -> str:
         """Wait until a string exists on the mainframe screen to perform the next step. If the string does not appear
         in 5 seconds, the keyword will raise an exception. You can define a different timeout.
 
+        Between two checks of the screen, the keyword blocks in the emulator until the host changes
+        the screen, so the screen is only read again after it was actually updated. An update that arrives
+        just before the keyword starts to block is not reported by the emulator, so the screen is also read
+        again every 5 seconds and once more if the timeout leaves less than a second to block.
+        The keyword fails immediately if the emulator can not wait, e.g. because the connection was lost.
+
+        To only check a rectangular region of the screen, pass it as ``region=(ypos, xpos, rows, columns)``,
+        see `Read Region`. Only the region is read from the emulator on every check.
+
         Example:
             | Wait Until String | something |
             | Wait Until String | something | 10 |
             | Wait Until String | something | 15 s |
             | Wait Until String | something | 0:00:15 |
+            | Wait Until String | something | region=(22, 1, 3, 80) |
         """
         timeout = convert_timeout(timeout)
         max_time = time.time() + timeout  # type: ignore
-        while time.time() < max_time:
-            result = self.mf.search_string(str(txt))
-            if result:
-                return txt
+        changed = True
+        last_scan = 0.0
+        while True:
+            if changed or time.time() - last_scan >= self.RESCAN_INTERVAL:
+                # the host updates the screen without any command being sent, so always read a fresh screen
+                self.mf.invalidate_screen()
+                last_scan = time.time()
+                if self.mf.search_string(str(txt), region=region):
+                    return txt
+            remaining = max_time - time.time()
+            if remaining <= 0:
+                break
+            if remaining < 1:
+                # x3270 only waits for whole seconds, which would overrun the timeout
+                self.sleep(remaining)
+                changed = True
+            else:
+                # wait in slices of one second, so that the timeout is not overrun by much
+                changed = self.mf.wait_for_output(1)
         raise Exception(f'String "{txt}" not found in {secs_to_timestr(timeout)}')
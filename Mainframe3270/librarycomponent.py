@@ -1,5 +1,10 @@
+import time
+from typing import Dict, List, Optional
 from robot.utils import ConnectionCache
-from Mainframe3270.py3270 import Emulator
+from Mainframe3270.asyncemulator import AsyncEmulator
+from Mainframe3270.instrumentation import Instrumentation
+from Mainframe3270.py3270 import AppPool, Emulator
+from Mainframe3270.utils import Engine, WaitStrategy
 
 
 class LibraryComponent:
@@ -31,6 +36,14 @@ class LibraryComponent:
     def timeout(self, value):
         self.library.timeout = value
 
+    @property
+    def command_timeout(self) -> Optional[float]:
+        return self.library.command_timeout
+
+    @property
+    def snapshot_max_age(self) -> float:
+        return self.library.snapshot_max_age
+
     @property
     def wait_time(self):
         return self.library.wait_time
@@ -47,6 +60,34 @@ class LibraryComponent:
     def wait_time_after_write(self, value):
         self.library.wait_time_after_write = value
 
+    @property
+    def wait_strategy(self) -> WaitStrategy:
+        return self.library.wait_strategy
+
+    @wait_strategy.setter
+    def wait_strategy(self, value: WaitStrategy):
+        self.library.wait_strategy = value
+
+    @property
+    def write_behind(self) -> bool:
+        return self.library.write_behind
+
+    @property
+    def engine(self) -> Engine:
+        return self.library.engine
+
+    @property
+    def unicode_replacements(self) -> Optional[Dict[str, str]]:
+        return self.library.unicode_replacements
+
+    @property
+    def app_pool(self) -> Optional[AppPool]:
+        return self.library.app_pool
+
+    @property
+    def instrumentation(self) -> Optional[Instrumentation]:
+        return self.library.instrumentation
+
     @property
     def img_folder(self):
         return self.library.img_folder
@@ -59,6 +100,10 @@ class LibraryComponent:
     def cache(self) -> ConnectionCache:
         return self.library.cache
 
+    @property
+    def concurrent_connections(self) -> List[AsyncEmulator]:
+        return self.library.concurrent_connections
+
     @property
     def mf(self) -> Emulator:
         return self.library.cache.current
@@ -70,3 +115,19 @@ class LibraryComponent:
     @property
     def model(self):
         return self.library.model
+
+    def wait_for_host(self, wait_strategy: Optional[WaitStrategy] = None):
+        """Waits after an AID key has been sent, according to ``wait_strategy`` or,
+        if it is not given, to the library wide wait strategy."""
+        wait_strategy = wait_strategy or self.wait_strategy
+        if wait_strategy == WaitStrategy.Fixed:
+            self.sleep(self.wait_time)
+        else:
+            self.mf.wait_for(wait_strategy.name, self.timeout)
+
+    def sleep(self, seconds: float):
+        """Sleeps for ``seconds``, which is recorded as sleeping if the instrumentation is enabled."""
+        if self.instrumentation is None:
+            time.sleep(seconds)
+        else:
+            self.instrumentation.sleep(seconds)
@@ -1,14 +1,21 @@
+import atexit
+import bisect
 import errno
 import logging
 import math
+import os
 import re
+import selectors
 import socket
 import subprocess
 import sys
+import threading
 import time
 import warnings
 from abc import ABC, abstractmethod
-from contextlib import closing
+from collections import deque
+from contextlib import closing, nullcontext
+from functools import lru_cache
 from os import name as os_name
 from robot.utils import seq2str
 
@@ -24,6 +31,21 @@ class CommandError(Exception):
     pass
 
 
+class BatchCommandError(CommandError):
+    """
+    Raised by Emulator.exec_batch when one of the commands of a batch failed
+    """
+
+    def __init__(self, message, index, commands):
+        super().__init__(message)
+        self.index = index
+        self.commands = commands
+
+
+class CommandTimeoutError(Exception):
+    pass
+
+
 class TerminatedError(Exception):
     pass
 
@@ -40,39 +62,67 @@ class FieldTruncateError(Exception):
     pass
 
 
+# constant parts of the emulator output, so that they are not encoded again for every line read
+_DATA_PREFIX = b"data:"
+_LINE_ENDINGS = b"\n\r"
+
+
 class Command(object):
     """
     Represents a x3270 script command
     """
 
-    def __init__(self, app, cmdstr):
+    __slots__ = ("app", "cmdstr", "timeout", "status_line", "data")
+
+    def __init__(self, app, cmdstr, timeout=None):
         if isinstance(cmdstr, str):
             warnings.warn("Commands should be byte strings", stacklevel=3)
             cmdstr = cmdstr.encode("utf-8")
         self.app = app
         self.cmdstr = cmdstr
+        self.timeout = timeout
         self.status_line = None
         self.data = []
 
     def execute(self):
         self.app.write(self.cmdstr + b"\n")
+        return self.read_result()
+
+    def read_result(self):
+        """
+        Read the data lines, status line and result of this command, after it has been written to the emulator.
 
+        raises: CommandTimeoutError if the reply was not complete within `timeout` seconds.
+        """
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        with self.app.watchdog(self.timeout):
+            return self._read_lines(deadline)
+
+    def _read_lines(self, deadline):
+        readline = self.app.readline
+        data = self.data
         # x3270 puts data lines (if any) on stdout prefixed with 'data: '
         # followed by two more lines without the prefix.
         # 1: status of the emulator
         # 2: 'ok' or 'error' indicating whether the command succeeded or failed
         while True:
-            line = self.app.readline()
+            line = readline(self._remaining(deadline))
             # log.debug('stdout line: %s', line.rstrip())       # commented line to reduce log size
-            if not line.startswith("data:".encode("ascii")):
+            if not line.startswith(_DATA_PREFIX):
                 # ok, we are at the status line
                 self.status_line = line.rstrip()
-                result = self.app.readline().rstrip()
+                result = readline(self._remaining(deadline)).rstrip()
                 # log.debug('result line: %s', result)          # commented line to reduce log size
                 return self.handle_result(result.decode("utf-8"))
 
             # remove the 'data: ' prefix and trailing newline char(s) and store
-            self.data.append(line[6:].rstrip("\n\r".encode("utf-8")))
+            data.append(line[6:].rstrip(_LINE_ENDINGS))
+
+    @staticmethod
+    def _remaining(deadline):
+        if deadline is None:
+            return None
+        return max(0, deadline - time.monotonic())
 
     def handle_result(self, result):
         # should receive 'ok' for almost everything, but Quit returns a '' for
@@ -86,37 +136,395 @@ class Command(object):
 
         msg = b"[no error message]"
         if self.data:
-            msg = "".encode("utf-8").join(self.data).rstrip()
+            msg = b"".join(self.data).rstrip()
         raise CommandError(msg.decode("utf-8"))
 
 
+def get_command_timeout(cmdstr, timeout, command_timeout):
+    """
+    Return the time in seconds the emulator has to answer `cmdstr`, or None if there is no limit.
+
+    This is `timeout` if it is given and `command_timeout` otherwise. As Wait() actions block in the
+    emulator, their own timeout is added to `command_timeout`. A Wait() without timeout blocks
+    until its condition is met, so it has no limit.
+    """
+    if timeout:
+        return timeout
+    if command_timeout is None or Emulator._action(cmdstr) != b"wait":
+        return command_timeout
+    first_arg = cmdstr.partition(b"(")[2].rstrip().rstrip(b")").split(b",")[0]
+    try:
+        return float(first_arg) + command_timeout
+    except ValueError:
+        return None
+
+
+def _status_field(index):
+    def get(self):
+        if self._parts is None:
+            self._parts = self.status_line.split(b" ")
+        try:
+            return self._parts[index] or None
+        except IndexError:
+            return None
+
+    return property(get)
+
+
 class Status(object):
     """
     Represents a status line as returned by x3270 following a command
+
+    Only the raw line is stored, it is split into its fields when one of them is first accessed.
     """
 
+    __slots__ = ("status_line", "_parts")
+
     def __init__(self, status_line):
-        if not status_line:
-            status_line = (" " * 12).encode("utf-8")
-        parts = status_line.split(" ".encode("utf-8"))
-        self.as_string = status_line.rstrip().decode("utf-8")
-        self.keyboard = parts[0] or None
-        self.screen_format = parts[1] or None
-        self.field_protection = parts[2] or None
-        self.connection_state = parts[3] or None
-        self.emulator_mode = parts[4] or None
-        self.model_number = parts[5] or None
-        self.row_number = parts[6] or None
-        self.col_number = parts[7] or None
-        self.cursor_row = parts[8] or None
-        self.cursor_col = parts[9] or None
-        self.window_id = parts[10] or None
-        self.exec_time = parts[11] or None
+        self.status_line = status_line or b""
+        self._parts = None
+
+    keyboard = _status_field(0)
+    screen_format = _status_field(1)
+    field_protection = _status_field(2)
+    connection_state = _status_field(3)
+    emulator_mode = _status_field(4)
+    model_number = _status_field(5)
+    row_number = _status_field(6)
+    col_number = _status_field(7)
+    cursor_row = _status_field(8)
+    cursor_col = _status_field(9)
+    window_id = _status_field(10)
+    exec_time = _status_field(11)
+
+    @property
+    def as_string(self):
+        return self.status_line.rstrip().decode("utf-8")
 
     def __str__(self):
         return "STATUS: {0}".format(self.as_string)
 
 
+class SessionState(object):
+    """
+    The state of the session as reported by the status line of the last command
+
+    Every reply of the emulator ends with a status line, so the state is kept current
+    without any additional round trip.
+    """
+
+    def __init__(self):
+        self.status = Status(None)
+        self.updated_at = None
+
+    def update(self, status):
+        self.status = status
+        self.updated_at = time.monotonic()
+
+    @property
+    def age(self):
+        """
+        Seconds since the last update, or infinity if there was none yet.
+        """
+        return math.inf if self.updated_at is None else time.monotonic() - self.updated_at
+
+    def is_fresh(self, max_age):
+        return self.age <= max_age
+
+    @property
+    def keyboard_unlocked(self):
+        return self.status.keyboard == b"U"
+
+    @property
+    def connected(self):
+        # connected status is like 'C(192.168.1.1)', disconnected is 'N'
+        return bool(self.status.connection_state and self.status.connection_state.startswith(b"C("))
+
+    @property
+    def cursor(self):
+        """
+        The cursor position as a tuple of 1 based integers, or None if it is unknown.
+        """
+        if self.status.cursor_row is None or self.status.cursor_col is None:
+            return None
+        return int(self.status.cursor_row) + 1, int(self.status.cursor_col) + 1
+
+    @property
+    def screen_size(self):
+        """
+        The number of rows and columns of the screen, or None if it is unknown.
+        """
+        if self.status.row_number is None or self.status.col_number is None:
+            return None
+        return int(self.status.row_number), int(self.status.col_number)
+
+
+class ScreenSnapshot(object):
+    """
+    Represents the content of the emulator screen as read at a given screen generation
+    """
+
+    def __init__(self, generation, rows, keyboard_unlocked=True):
+        self.generation = generation
+        self.rows = rows
+        self.keyboard_unlocked = keyboard_unlocked
+        self.taken_at = time.monotonic()
+
+    def is_valid_for(self, generation, max_age=math.inf):
+        """
+        A snapshot can only be reused if no command changed the screen since it was taken,
+        the host was not still processing an AID key (keyboard locked) at that time and it
+        is at most `max_age` seconds old, as the host may also change the screen on its own.
+        """
+        if not self.keyboard_unlocked or self.generation != generation:
+            return False
+        return time.monotonic() - self.taken_at <= max_age
+
+
+class Field(object):
+    """
+    A field of the screen, as defined by a start field attribute
+
+    `address` is the 0 based buffer address of the attribute, `ypos`/`xpos` are the
+    1 based screen coordinates of the first character of the field.
+    """
+
+    __slots__ = ("address", "ypos", "xpos", "length", "attribute")
+
+    PROTECTED = 0x20
+    NUMERIC = 0x10
+    INTENSITY = 0x0C
+    INTENSIFIED = 0x08
+    MODIFIED = 0x01
+
+    def __init__(self, address, ypos, xpos, length, attribute):
+        self.address = address
+        self.ypos = ypos
+        self.xpos = xpos
+        self.length = length
+        self.attribute = attribute
+
+    @property
+    def protected(self):
+        return bool(self.attribute & Field.PROTECTED)
+
+    @property
+    def numeric(self):
+        return bool(self.attribute & Field.NUMERIC)
+
+    @property
+    def intensified(self):
+        return self.attribute & Field.INTENSITY == Field.INTENSIFIED
+
+    @property
+    def modified(self):
+        return bool(self.attribute & Field.MODIFIED)
+
+    def as_dict(self):
+        return {
+            "ypos": self.ypos,
+            "xpos": self.xpos,
+            "length": self.length,
+            "protected": self.protected,
+            "numeric": self.numeric,
+            "intensified": self.intensified,
+            "modified": self.modified,
+        }
+
+    def __repr__(self):
+        return "Field({0})".format(", ".join(f"{key}={value}" for key, value in self.as_dict().items()))
+
+
+class FieldMap(object):
+    """
+    Represents the fields of the emulator screen as read at a given screen generation
+    """
+
+    def __init__(self, generation, fields, keyboard_unlocked=True):
+        self.generation = generation
+        self.fields = fields
+        self.keyboard_unlocked = keyboard_unlocked
+        self.taken_at = time.monotonic()
+        self._addresses = [field.address for field in fields]
+
+    def is_valid_for(self, generation, max_age=math.inf):
+        """
+        See ScreenSnapshot.is_valid_for
+        """
+        return ScreenSnapshot.is_valid_for(self, generation, max_age)
+
+    def field_at(self, address):
+        """
+        Return the field the buffer `address` belongs to, or None if the screen is unformatted.
+        """
+        if not self.fields:
+            return None
+        # fields wrap around the end of the screen, so an address before the first
+        # attribute belongs to the last field
+        return self.fields[bisect.bisect_right(self._addresses, address) - 1]
+
+    @staticmethod
+    def parse(lines, columns):
+        """
+        Build the list of fields from the data lines of a ReadBuffer(Ascii) command.
+
+        Every token of the data occupies one buffer position, except for SA(...) tokens, which
+        only set character attributes. Start field attributes are written as SF(c0=xx,...).
+        """
+        attributes = []
+        address = 0
+        for line in lines:
+            for token in line.split():
+                if token.startswith(b"SA("):
+                    continue
+                if token.startswith(b"SF("):
+                    for attribute in token[3:-1].split(b","):
+                        key, _, value = attribute.partition(b"=")
+                        if key == b"c0":
+                            attributes.append((address, int(value, 16)))
+                address += 1
+        size = address
+        fields = []
+        for i, (address, attribute) in enumerate(attributes):
+            next_address = attributes[(i + 1) % len(attributes)][0]
+            start = (address + 1) % size
+            length = (next_address - address - 1) % size
+            fields.append(Field(address, start // columns + 1, start % columns + 1, length, attribute))
+        return fields
+
+
+class _TranslationTable(dict):
+    """
+    A str.translate table that maps every character it has no entry for to "-",
+    unless it is printable ASCII. Looked up characters are stored, so that each character
+    is only classified once.
+    """
+
+    def __missing__(self, key):
+        value = key if 0x20 <= key <= 0x7E else "-"
+        self[key] = value
+        return value
+
+
+class UnicodeNormalizer(object):
+    """
+    Replaces the characters of the screen that are not printable ASCII, to prevent positioning
+    errors which are caused by the different client implementations (wc3270 vs. x3270).
+
+    Character sequences are replaced first, then all characters are replaced in a single
+    str.translate pass. Characters without a replacement that are not printable ASCII become "-".
+    """
+
+    DEFAULT_REPLACEMENTS = {
+        # box drawing characters as sent by some hosts, encoded as UTF-8 and read as latin-1
+        "â\x94\x80": "-",  # Horizontal line
+        "â\x94\x82": "|",  # Vertical line
+        "â\x94\x8c": "+",  # Top-left corner
+        "â\x94\x90": "+",  # Top-right corner
+        "â\x94\x94": "+",  # Bottom-left corner
+        "â\x94\x98": "+",  # Bottom-right corner
+    }
+
+    def __init__(self, replacements=None):
+        replacements = {**UnicodeNormalizer.DEFAULT_REPLACEMENTS, **(replacements or {})}
+        self._table = _TranslationTable({i: i for i in range(0x20, 0x7F)})
+        self._sequences = {}
+        for old, new in replacements.items():
+            if len(old) == 1:
+                self._table[ord(old)] = new
+            else:
+                self._sequences[old] = new
+        # longer sequences first, so that they take precedence over sequences they start with
+        pattern = "|".join(re.escape(s) for s in sorted(self._sequences, key=len, reverse=True))
+        self._sequences_regex = re.compile(pattern) if pattern else None
+
+    def normalize(self, text):
+        if self._sequences_regex is not None:
+            text = self._sequences_regex.sub(lambda match: self._sequences[match.group()], text)
+        return text.translate(self._table)
+
+
+class StringAutomaton(object):
+    """
+    An Aho-Corasick automaton that finds all occurrences of several strings in a single scan of a text.
+    """
+
+    def __init__(self, strings):
+        self.strings = strings
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for index, string in enumerate(strings):
+            node = 0
+            for char in string:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[node][char] = child
+                node = child
+            self._output[node].append(index)
+        # breadth-first, so that the failure node of a node's parent is known before the node itself
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text):
+        """
+        Yield a tuple of the start index in `text` and the index in `strings` for each occurrence.
+        """
+        goto, fail, output, strings = self._goto, self._fail, self._output, self.strings
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in output[node]:
+                yield position - len(strings[index]) + 1, index
+
+
+@lru_cache(maxsize=128)
+def _get_string_automaton(strings, ignore_case):
+    if ignore_case:
+        strings = tuple(string.lower() for string in strings)
+    return StringAutomaton(strings)
+
+
+class _Watchdog(object):
+    """
+    Kills an emulator subprocess if the block is not left within `timeout` seconds
+    """
+
+    def __init__(self, process, timeout):
+        self.process = process
+        self.timeout = timeout
+        self.expired = threading.Event()
+        self._timer = threading.Timer(timeout, self._expire)
+
+    def _expire(self):
+        self.expired.set()
+        self.process.kill()
+
+    def __enter__(self):
+        self._timer.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._timer.cancel()
+        # killing the emulator ends the blocking read, whatever was read after that is incomplete
+        if self.expired.is_set():
+            raise CommandTimeoutError("The emulator did not answer within {0} seconds".format(self.timeout))
+
+
 class ExecutableApp(ABC):
     @property
     @abstractmethod
@@ -128,36 +536,123 @@ class ExecutableApp(ABC):
     def args(self):
         pass
 
-    def __init__(self, extra_args=None, model="2"):
+    # number of lines of the emulator's error output that are kept
+    STDERR_MAX_LINES = 500
+
+    def __init__(self, extra_args=None, model="2", executable=None):
+        """
+        `executable` overrides the emulator executable of the class, either with a path or with a list
+        of a program and its arguments, e.g. to run a fake emulator for benchmarks.
+        """
+        if executable is not None:
+            self.executable = executable
         self.args = self._get_executable_app_args(extra_args, model)
         self.sp = None
+        self._read_buffer = b""
+        self._selector = None
+        self.stderr_lines = deque(maxlen=self.STDERR_MAX_LINES)
         self.spawn_app()
 
+    def _executable_command(self):
+        if isinstance(self.executable, (list, tuple)):
+            return list(self.executable)
+        return [self.executable]
+
     def spawn_app(self):
-        args = [self.executable] + self.args
+        args = self._executable_command() + self.args
         self.sp = subprocess.Popen(
             args,
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
         )
+        self.start_stderr_drain()
+
+    def start_stderr_drain(self):
+        """
+        Continuously read the error output of the emulator on a background thread, so that the emulator
+        never blocks on a full stderr pipe. Only the last `STDERR_MAX_LINES` lines are kept.
+        """
+        thread = threading.Thread(
+            target=self._drain_stderr,
+            args=(self.sp.stderr,),
+            name=f"{os.path.basename(self._executable_command()[0])}-stderr",
+            daemon=True,
+        )
+        thread.start()
+
+    def _drain_stderr(self, stderr):
+        # readline is limited, so that a long output without line breaks can not grow unbounded
+        for line in iter(lambda: stderr.readline(4096), b""):
+            self.stderr_lines.append(line.rstrip(b"\r\n").decode("utf-8", errors="replace"))
 
     def connect(self, host):
         """this is a no-op for all but wc3270"""
         return False
 
     def close(self):
-        pass
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+
+    def kill(self):
+        """
+        Kill the emulator subprocess and reap it, e.g. after it stopped responding.
+        """
+        if self.sp is not None:
+            self.sp.kill()
+            self.sp.wait()
+        self.close()
 
     def write(self, data):
         self.sp.stdin.write(data)
         self.sp.stdin.flush()
 
-    def readline(self):
-        return self.sp.stdout.readline()
+    def readline(self, timeout=None):
+        """
+        Read one line of the emulator output.
+
+        raises: CommandTimeoutError if no complete line was received within `timeout` seconds.
+        """
+        # select() does not support pipes on Windows, so the timeout is enforced by `watchdog` there instead
+        if os_name == "nt":
+            return self.sp.stdout.readline()
+        return self._readline_with_selector(timeout)
+
+    def watchdog(self, timeout):
+        """
+        Return a context manager that guards all the reads of one command reply.
+
+        On Windows, it kills the emulator subprocess with a single watchdog thread if the reply was not
+        read within `timeout` seconds and then raises a CommandTimeoutError. Elsewhere, readline
+        enforces the timeout itself.
+        """
+        if os_name == "nt" and timeout is not None:
+            return _Watchdog(self.sp, timeout)
+        return nullcontext()
+
+    def _readline_with_selector(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        fd = self.sp.stdout.fileno()
+        if self._selector is None:
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(fd, selectors.EVENT_READ)
+        # the pipe is read directly from its file descriptor, so the lines are buffered here
+        while b"\n" not in self._read_buffer:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            if not self._selector.select(remaining):
+                raise CommandTimeoutError("The emulator did not answer within {0} seconds".format(timeout))
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                # the emulator closed its output, return whatever is left like file.readline() does
+                break
+            self._read_buffer += chunk
+        line, separator, self._read_buffer = self._read_buffer.partition(b"\n")
+        return line + separator
 
-    def _get_executable_app_args(self, extra_args, model):
-        return self.__class__.args + ["-xrm", f"*model: {model}"] + (extra_args or [])
+    @classmethod
+    def _get_executable_app_args(cls, extra_args, model):
+        return cls.args + ["-xrm", f"*model: {model}"] + (extra_args or [])
 
 
 class x3270App(ExecutableApp):
@@ -185,9 +680,12 @@ class wc3270App(ExecutableApp):
     # see notes for args in x3270App
     args = ["-xrm", "wc3270.unlockDelay: False"]
 
-    def __init__(self, extra_args=None, model="2"):
+    def __init__(self, extra_args=None, model="2", executable=None):
+        if executable is not None:
+            self.executable = executable
         self.args = self._get_executable_app_args(extra_args, model)
         self.sp = None
+        self.stderr_lines = deque(maxlen=self.STDERR_MAX_LINES)
         self.socket_fh = None
         self.script_port = self._get_free_port()
 
@@ -206,13 +704,20 @@ class wc3270App(ExecutableApp):
         # failing to close the socket ourselves will result in a ResourceWarning
         self.socket.close()
 
+    def kill(self):
+        if self.sp is not None:
+            self.sp.kill()
+            self.sp.wait()
+        if self.socket_fh is not None:
+            self.close()
+
     def spawn_app(self, host):
         # check if we need to run a different start command when running in Windows 11
         is_win10 = sys.getwindowsversion().build < 22000
         if is_win10:
-            args = ["start", "/wait", self.executable] + self.args
+            args = ["start", "/wait"] + self._executable_command() + self.args
         else:
-            args = ["cmd.exe", "/c", "start", "/wait", "conhost", self.executable] + self.args
+            args = ["cmd.exe", "/c", "start", "/wait", "conhost"] + self._executable_command() + self.args
         args.extend(["-scriptport", str(self.script_port), host])
         self.sp = subprocess.Popen(
             args,
@@ -221,6 +726,7 @@ class wc3270App(ExecutableApp):
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
         )
+        self.start_stderr_drain()
 
     def make_socket(self):
         self.socket = sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -244,10 +750,18 @@ class wc3270App(ExecutableApp):
         self.socket_fh.write(data)
         self.socket_fh.flush()
 
-    def readline(self):
+    def readline(self, timeout=None):
         if self.socket_fh is None:
             raise NotConnectedException
-        return self.socket_fh.readline()
+        self.socket.settimeout(timeout)
+        try:
+            return self.socket_fh.readline()
+        except socket.timeout:
+            raise CommandTimeoutError("The emulator did not answer within {0} seconds".format(timeout))
+
+    def watchdog(self, timeout):
+        # the socket enforces the timeout of readline
+        return nullcontext()
 
 
 class ws3270App(ExecutableApp):
@@ -256,6 +770,89 @@ class ws3270App(ExecutableApp):
     args = ["-xrm", "ws3270.unlockDelay: False"]
 
 
+class AppPool(object):
+    """
+    Keeps pre-spawned, unconnected emulator subprocesses ready, so that creating an Emulator does not
+    have to wait for the emulator to start. The subprocesses are kept per executable, extra arguments and model.
+    """
+
+    _shared = None
+
+    def __init__(self, size=1):
+        self.size = size
+        self._apps = {}
+        self._refilling = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @classmethod
+    def shared(cls, size):
+        """
+        Return the pool that is shared by all library instances in this process, creating it if necessary.
+        """
+        if cls._shared is None:
+            cls._shared = cls(size)
+            atexit.register(cls._shared.close)
+        cls._shared.size = max(cls._shared.size, size)
+        return cls._shared
+
+    def checkout(self, app_class, extra_args, model):
+        """
+        Return a running, unconnected instance of `app_class` and refill the pool in the background.
+        If no pre-spawned subprocess is available, a new one is spawned right away.
+        """
+        key = (app_class, tuple(extra_args or []), model)
+        app = None
+        with self._lock:
+            apps = self._apps.setdefault(key, deque())
+            while apps and app is None:
+                candidate = apps.popleft()
+                # skip subprocesses that have exited while waiting in the pool
+                if candidate.sp.poll() is None:
+                    app = candidate
+                else:
+                    candidate.kill()
+        self._start_refill(key)
+        return app or app_class(list(key[1]), model)
+
+    def _start_refill(self, key):
+        with self._lock:
+            if self._closed or key in self._refilling:
+                return
+            self._refilling.add(key)
+        threading.Thread(target=self._refill, args=(key,), name="emulator-pool-refill", daemon=True).start()
+
+    def _refill(self, key):
+        app_class, extra_args, model = key
+        try:
+            while True:
+                with self._lock:
+                    if self._closed or len(self._apps[key]) >= self.size:
+                        return
+                app = app_class(list(extra_args), model)
+                with self._lock:
+                    if self._closed:
+                        app.kill()
+                        return
+                    self._apps[key].append(app)
+        except Exception as e:
+            log.warning("Could not pre-spawn emulator: %s", e)
+        finally:
+            with self._lock:
+                self._refilling.discard(key)
+
+    def close(self):
+        """
+        Kill all subprocesses that are waiting in the pool.
+        """
+        with self._lock:
+            self._closed = True
+            apps = [app for queue in self._apps.values() for app in queue]
+            self._apps.clear()
+        for app in apps:
+            app.kill()
+
+
 class Emulator(object):
     """
     Represents an x/s3270 emulator subprocess and provides an API for interacting
@@ -304,7 +901,39 @@ class Emulator(object):
         },
     }
 
-    def __init__(self, visible=False, timeout=30, extra_args=None, model="2"):
+    # x3270 actions that only read from the emulator and therefore never change the screen
+    _READ_ONLY_ACTIONS = (b"ascii", b"ebcdic", b"ignore", b"printtext", b"query", b"readbuffer")
+
+    # x3270 actions that only move the cursor or edit fields locally and can therefore be deferred in write-behind mode
+    _WRITE_BEHIND_ACTIONS = (
+        b"backtab",
+        b"delete",
+        b"deletefield",
+        b"eraseeof",
+        b"eraseinput",
+        b"home",
+        b"movecursor",
+        b"movecursor1",
+        b"string",
+        b"tab",
+    )
+
+    def __init__(
+        self,
+        visible=False,
+        timeout=30,
+        extra_args=None,
+        model="2",
+        write_behind=False,
+        command_timeout=60,
+        app_pool=None,
+        unicode_replacements=None,
+        state_max_age=1.0,
+        snapshot_max_age=1.0,
+        engine="executable",
+        executable=None,
+        instrumentation=None,
+    ):
         """
         Create an emulator instance
 
@@ -312,16 +941,50 @@ class Emulator(object):
         `timeout` controls the timeout parameter to any Wait() command sent
             to x3270.
         `extra_args` allows sending parameters to the emulator executable
+        `write_behind` queues cursor moves, string inserts and field edits and sends them
+            together with the next command that needs a result from the emulator.
+        `command_timeout` is the time in seconds the emulator has to answer a command
+            (in addition to the timeout of Wait() commands). If it does not answer in time,
+            the emulator subprocess is killed and a CommandTimeoutError is raised.
+            With None, the emulator has unlimited time.
+        `app_pool` is an AppPool to take a pre-spawned emulator subprocess from.
+        `unicode_replacements` maps characters or character sequences to the text they are
+            replaced with by read_all_screen, in addition to the default replacements.
+        `state_max_age` is the default age in seconds up to which the cursor position, connection
+            and keyboard state are taken from the status line of the last command instead of
+            being queried from the emulator.
+        `snapshot_max_age` is the age in seconds up to which the cached screen snapshot and field map
+            are reused. Changes the host makes without a command, e.g. a second write after unlocking
+            the keyboard, are only seen once they are older or a command invalidated them.
+        `engine` is either "executable", to run the x3270 family emulator selected by `visible`
+            as subprocess, or "native", to use the pure-Python TN3270 client of Mainframe3270.tn3270
+            in-process instead. `visible` and `app_pool` have no effect for the native engine.
+        `executable` overrides the emulator executable of the executable engine, either with a path
+            or with a list of a program and its arguments. Such an emulator is never taken from `app_pool`.
+        `instrumentation` is a Mainframe3270.instrumentation.Instrumentation that records the commands
+            and the time of exec_command and exec_batch for the running keyword.
         """
         self.model = model
         self.model_dimensions = self._set_model_dimensions(model)
-        self.app = self.create_app(visible, extra_args, model)
+        self.app = self.create_app(visible, extra_args, model, app_pool, engine, executable)
         self.is_terminated = False
         self.status = Status(None)
+        self.session_state = SessionState()
+        self.state_max_age = state_max_age
+        self.snapshot_max_age = snapshot_max_age
         self.timeout = timeout
         self.last_host = None
-
-    def _set_model_dimensions(self, model):
+        self.screen_generation = 0
+        self._screen_snapshot = None
+        self._field_map = None
+        self.write_behind = write_behind
+        self._pending_commands = []
+        self.command_timeout = command_timeout
+        self.unicode_normalizer = UnicodeNormalizer(unicode_replacements)
+        self.instrumentation = instrumentation
+
+    @staticmethod
+    def _set_model_dimensions(model):
         try:
             model_type = Emulator._MODEL_TYPES[model]
         except KeyError:
@@ -331,40 +994,160 @@ class Emulator(object):
             )
         return Emulator._MODEL_DIMENSIONS[model_type]
 
-    def create_app(self, visible, extra_args, model):
-        if os_name == "nt":
-            if visible:
-                return wc3270App(extra_args, model)
-            return ws3270App(extra_args, model)
-        if visible:
-            return x3270App(extra_args, model)
-        return s3270App(extra_args, model)
+    def create_app(self, visible, extra_args, model, app_pool=None, engine="executable", executable=None):
+        if engine == "native":
+            # imported here, because the native engine builds on this module
+            from Mainframe3270.tn3270 import NativeApp
 
-    def exec_command(self, cmdstr):
+            return NativeApp(extra_args, model)
+        if engine != "executable":
+            raise ValueError(f"Engine should be 'executable' or 'native', but was '{engine}'.")
+        if os_name == "nt":
+            app_class = wc3270App if visible else ws3270App
+        else:
+            app_class = x3270App if visible else s3270App
+        if executable is not None:
+            return app_class(extra_args, model, executable)
+        # wc3270 is only spawned when connecting, so there is nothing to gain from pre-spawning it
+        if app_pool is not None and app_class is not wc3270App:
+            return app_pool.checkout(app_class, extra_args, model)
+        return app_class(extra_args, model)
+
+    def exec_command(self, cmdstr, timeout=None):
         """
         Execute a x3270 command
 
         `cmdstr` gets sent directly to the x3270 subprocess on its stdin.
+        `timeout` is the time in seconds the emulator has to answer, by default `command_timeout`
+            plus the timeout of a Wait() command, see get_command_timeout.
         """
+        if self.instrumentation is not None:
+            return self.instrumentation.emulator_call(self._exec_command, 1, cmdstr, timeout)
+        return self._exec_command(cmdstr, timeout)
+
+    def _exec_command(self, cmdstr, timeout):
         if self.is_terminated:
             raise TerminatedError("This Emulator instance has been terminated")
 
         # log.debug('sending command: %s', cmdstr)             # commented line to reduce log size
-        c = Command(self.app, cmdstr)
+        c = self._command(cmdstr, timeout)
+        if self.write_behind and self._action(c.cmdstr) in Emulator._WRITE_BEHIND_ACTIONS:
+            self.invalidate_screen()
+            self._pending_commands.append(c)
+            return c
+        if self._pending_commands:
+            return self.exec_batch([c.cmdstr], timeout)[-1]
+        if not self._is_read_only(c.cmdstr):
+            self.invalidate_screen()
         # start = time.time()                                  # unnecessary variable if the log is commented out.
-        c.execute()
+        try:
+            c.execute()
+        except CommandTimeoutError:
+            self._kill()
+            raise
         # elapsed = time.time() - start                        # unnecessary variable if the log is commented out.
         # log.debug('elapsed execution: {0}'.format(elapsed))  # commented line to reduce log size
-        self.status = Status(c.status_line)
+        self._update_status(c.status_line)
 
         return c
 
+    def exec_batch(self, cmdstrs, timeout=None):
+        """
+        Execute several x3270 commands in one round trip.
+
+        All commands in `cmdstrs` are written to the x3270 subprocess with a single flush, then the
+        replies are read back in order. Returns the list of executed Command objects.
+
+        Commands queued in write-behind mode are sent in front of `cmdstrs`.
+
+        raises: BatchCommandError for the first command that failed. The remaining replies are
+            still read, so that the emulator output stays in sync. The index of the error refers
+            to `cmdstrs`, so it is negative if one of the queued commands failed.
+        raises: CommandTimeoutError if the emulator does not answer one of the commands within
+            `timeout` (by default `command_timeout`) seconds.
+        """
+        if self.instrumentation is not None:
+            return self.instrumentation.emulator_call(self._exec_batch, len(cmdstrs), cmdstrs, timeout)
+        return self._exec_batch(cmdstrs, timeout)
+
+    def _exec_batch(self, cmdstrs, timeout):
+        if self.is_terminated:
+            raise TerminatedError("This Emulator instance has been terminated")
+
+        pending = len(self._pending_commands)
+        commands = self._pending_commands + [self._command(cmdstr, timeout) for cmdstr in cmdstrs]
+        self._pending_commands = []
+        if not commands:
+            return commands
+        if not all(self._is_read_only(c.cmdstr) for c in commands):
+            self.invalidate_screen()
+        self.app.write(b"".join(c.cmdstr + b"\n" for c in commands))
+        error = None
+        for index, c in enumerate(commands):
+            try:
+                c.read_result()
+            except CommandTimeoutError:
+                self._kill()
+                raise
+            except CommandError as e:
+                if error is None:
+                    error = BatchCommandError(
+                        "Command {0} ({1}) failed: {2}".format(index - pending, c.cmdstr.decode("utf-8"), e),
+                        index - pending,
+                        commands[pending:],
+                    )
+            self._update_status(c.status_line)
+        if error is not None:
+            raise error
+        return commands[pending:]
+
+    def _command(self, cmdstr, timeout):
+        c = Command(self.app, cmdstr)
+        c.timeout = get_command_timeout(c.cmdstr, timeout, self.command_timeout)
+        return c
+
+    def flush(self):
+        """
+        Send all commands that were queued in write-behind mode to the emulator in one round trip.
+        """
+        if self._pending_commands:
+            self.exec_batch([])
+
+    def _kill(self):
+        log.warning("The emulator did not answer in time and is killed")
+        self._pending_commands = []
+        self.app.kill()
+        self.is_terminated = True
+
+    @staticmethod
+    def _action(cmdstr):
+        return cmdstr.split(b"(", 1)[0].strip().lower()
+
+    def _is_read_only(self, cmdstr):
+        return self._action(cmdstr) in Emulator._READ_ONLY_ACTIONS
+
+    def get_stderr(self):
+        """
+        Return the last lines the emulator subprocess has written to its error output.
+        """
+        return "\n".join(self.app.stderr_lines)
+
+    def invalidate_screen(self):
+        """
+        Mark the cached screen snapshot as outdated, so that the next read fetches the screen from the emulator.
+
+        This is done automatically for every command that may change the screen, e.g. AID keys or writes.
+        """
+        self.screen_generation += 1
+
     def terminate(self):
         """
         terminates the underlying x3270 subprocess. Once called, this Emulator instance must no longer be used.
         """
         if not self.is_terminated:
             log.debug("terminal client terminated")
+            # queued writes are pointless once the emulator quits
+            self._pending_commands = []
             try:
                 self.exec_command(b"Quit")
             except BrokenPipeError:
@@ -381,21 +1164,47 @@ class Emulator(object):
 
             self.is_terminated = True
 
-    def is_connected(self):
+    def _update_status(self, status_line):
+        self.status = Status(status_line)
+        self.session_state.update(self.status)
+
+    def _state_is_fresh(self, max_age):
+        """
+        Check if queries can be answered from the session state. Commands queued in
+        write-behind mode have not updated it yet, so it is never fresh while there are any.
+        """
+        max_age = self.state_max_age if max_age is None else max_age
+        return not self._pending_commands and self.session_state.is_fresh(max_age)
+
+    def is_connected(self, max_age=None):
         """
         Return bool indicating connection state
+
+        The state is taken from the last status line if it is at most `max_age`
+        (by default `state_max_age`) seconds old.
         """
+        if self._state_is_fresh(max_age):
+            return self.session_state.connected
         # need to wrap in try/except b/c of wc3270's socket connection dynamics
         try:
             # this is basically a no-op, but it results in the the current status
             # getting updated
             self.exec_command(b"ignore")
-
-            # connected status is like 'C(192.168.1.1)', disconnected is 'N'
-            return self.status.connection_state.startswith(b"C(")
+            return self.session_state.connected
         except NotConnectedException:
             return False
 
+    def is_keyboard_unlocked(self, max_age=None):
+        """
+        Return bool indicating whether the keyboard is unlocked
+
+        The state is taken from the last status line if it is at most `max_age`
+        (by default `state_max_age`) seconds old.
+        """
+        if not self._state_is_fresh(max_age):
+            self.exec_command(b"ignore")
+        return self.session_state.keyboard_unlocked
+
     def connect(self, host):
         """
         Connect to a host
@@ -431,6 +1240,36 @@ class Emulator(object):
                 "keyboard not unlocked, state was: {0}".format(self.status.keyboard.decode("utf-8"))
             )
 
+    def wait_for(self, condition, timeout=None):
+        """
+        Block in the emulator until `condition` is met, e.g. "Output" (the host has changed
+        the screen) or "Unlock" (the keyboard is unlocked), but at most `timeout` seconds.
+
+        x3270 only accepts whole seconds, so `timeout` is rounded up to the next whole second
+        and is at least one second.
+
+        raises: CommandError if the condition is not met in time.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        # x3270 expects the timeout as a whole number of seconds
+        timeout = max(1, math.ceil(timeout))
+        self.exec_command("Wait({0}, {1})".format(timeout, condition).encode("utf-8"))
+
+    def wait_for_output(self, timeout=None):
+        """
+        Block until the host has changed the screen, but at most `timeout` seconds.
+        Returns False if the screen did not change in time.
+
+        raises: CommandError if the emulator can not wait, e.g. because it is not connected.
+        """
+        try:
+            self.wait_for("Output", timeout)
+        except CommandError as e:
+            if "timed out" not in str(e):
+                raise
+            return False
+        return True
+
     def move_to(self, ypos, xpos):
         """
         move the cursor to the given coordinates.  Coordinates are 1
@@ -452,9 +1291,13 @@ class Emulator(object):
         """
         if xpos and ypos:
             self.move_to(ypos, xpos)
+        self.exec_command(self._string_command(tosend))
+
+    @staticmethod
+    def _string_command(tosend):
         # escape double quotes in the data to send
         tosend = tosend.decode("utf-8").replace('"', '"')
-        self.exec_command('String("{0}")'.format(tosend).encode("utf-8"))
+        return 'String("{0}")'.format(tosend).encode("utf-8")
 
     def send_enter(self):
         self.exec_command(b"Enter")
@@ -466,72 +1309,197 @@ class Emulator(object):
         Coordinates are 1 based, as listed in the status area of the
         terminal.
         """
-        self.check_limits(ypos, xpos)
-        if (xpos + length) > (self.model_dimensions["columns"] + 1):
+        self._check_string_limits(ypos, xpos, length)
+        rows = self.read_screen_rows()
+        # the host may use a smaller screen than the model, which is only known after reading it
+        self._check_string_limits(ypos, xpos, length, self.get_screen_size())
+        # the screen's coordinates are 1 based, but the list indices are 0 based
+        return rows[ypos - 1][xpos - 1 : xpos - 1 + length]
+
+    def string_get_many(self, fields):
+        """
+        Get the strings of several fields from a single read of the screen
+
+        `fields` is an iterable of (ypos, xpos, length) tuples, see string_get.
+        All fields are checked against the limits of the screen before the screen is read.
+        Returns a list with the string of each field.
+        """
+        fields = [(int(ypos), int(xpos), int(length)) for ypos, xpos, length in fields]
+        for ypos, xpos, length in fields:
+            self._check_string_limits(ypos, xpos, length)
+        rows = self.read_screen_rows()
+        size = self.get_screen_size()
+        for ypos, xpos, length in fields:
+            self._check_string_limits(ypos, xpos, length, size)
+        return [rows[ypos - 1][xpos - 1 : xpos - 1 + length] for ypos, xpos, length in fields]
+
+    def _check_string_limits(self, ypos, xpos, length, size=None):
+        self.check_limits(ypos, xpos, size)
+        columns = size[1] if size else self.model_dimensions["columns"]
+        if (xpos + length) > (columns + 1):
             raise Exception("You have exceeded the x-axis limit of the mainframe screen")
-        # the screen's coordinates are 1 based, but the command is 0 based
-        xpos -= 1
-        ypos -= 1
-        cmd = self.exec_command("ascii({0},{1},{2})".format(ypos, xpos, length).encode("utf-8"))
-        # this usage of utf-8 should only return a single line of data
-        assert len(cmd.data) == 1, cmd.data
-        return cmd.data[0].decode("utf-8", errors="replace")
 
-    def search_string(self, string, ignore_case=False):
+    def read_region(self, ypos, xpos, rows, columns):
+        """
+        Get the rectangular region of `rows` rows and `columns` columns whose top-left corner
+        is at screen coordinates `ypos`/`xpos`, as a list of rows.
+
+        Coordinates are 1 based, as listed in the status area of the
+        terminal. If the screen snapshot is still valid, the region is taken from it,
+        otherwise only the region is read from the emulator with a single Ascii() command.
+        """
+        if rows < 1 or columns < 1:
+            raise ValueError("A region must have at least one row and one column")
+        self.check_limits(ypos, xpos)
+        self.check_limits(ypos + rows - 1, xpos + columns - 1, self.get_screen_size())
+        snapshot = self._screen_snapshot
+        if snapshot is not None and snapshot.is_valid_for(self.screen_generation, self.snapshot_max_age):
+            # the screen's coordinates are 1 based, but the list indices are 0 based
+            return [row[xpos - 1 : xpos - 1 + columns] for row in snapshot.rows[ypos - 1 : ypos - 1 + rows]]
+        cmd = self.exec_command("ascii({0},{1},{2},{3})".format(ypos - 1, xpos - 1, rows, columns).encode("utf-8"))
+        return [line.decode("utf-8", errors="replace") for line in cmd.data]
+
+    def search_string(self, string, ignore_case=False, region=None):
         """
         Check if a string exists on the mainframe screen and return True or False.
+
+        `region` is an optional tuple of (ypos, xpos, rows, columns) to restrict the search to, see read_region.
         """
-        for ypos in range(self.model_dimensions["rows"]):
-            line = self.string_get(ypos + 1, 1, self.model_dimensions["columns"])
+        if ignore_case:
+            string = string.lower()
+        for line in self.read_region(*region) if region else self.read_screen_rows():
             if ignore_case:
-                string = string.lower()
                 line = line.lower()
             if string in line:
                 return True
         return False
 
-    def get_string_positions(self, string, ignore_case=False, replace_unicode=True):
+    def search_strings(self, strings, ignore_case=False):
+        """
+        Search several strings on the mainframe screen with a single scan of each row.
+
+        Returns a dict with a list of the 1-based (ypos, xpos) positions of each string,
+        which is empty if the string was not found. Like search_string, matches do not span rows.
+        """
+        # like the `in` operator, an empty string is found at the beginning of the screen
+        positions = {string: [] if string else [(1, 1)] for string in strings}
+        searched = tuple(string for string in positions if string)
+        automaton = _get_string_automaton(searched, ignore_case)
+        for ypos, line in enumerate(self.read_screen_rows(), start=1):
+            if ignore_case:
+                line = line.lower()
+            for start, index in automaton.find(line):
+                positions[searched[index]].append((ypos, start + 1))
+        return positions
+
+    def get_string_positions(self, string, ignore_case=False, replace_unicode=True, region=None):
         """Returns a list of tuples of ypos and xpos for the position where the `string` was found,
-        or an empty list if it was not found."""
+        or an empty list if it was not found.
+
+        `region` is an optional tuple of (ypos, xpos, rows, columns) to restrict the search to, see read_region.
+        Within a region, a string is only found if it does not span rows."""
+        if region:
+            return self._get_string_positions_in_region(string, ignore_case, replace_unicode, region)
         screen_content = self.read_all_screen(replace_unicode=replace_unicode)
         indices_object = re.finditer(re.escape(string), screen_content, flags=0 if not ignore_case else re.IGNORECASE)
         indices = [index.start() for index in indices_object]
         # ypos and xpos should be returned 1-based
         return [self._get_ypos_and_xpos_from_index(index + 1) for index in indices]
 
+    def _get_string_positions_in_region(self, string, ignore_case, replace_unicode, region):
+        pattern = re.compile(re.escape(string), flags=0 if not ignore_case else re.IGNORECASE)
+        ypos, xpos = region[0], region[1]
+        positions = []
+        for offset, line in enumerate(self.read_region(*region)):
+            if replace_unicode:
+                line = self.unicode_normalizer.normalize(line)
+            positions.extend((ypos + offset, xpos + match.start()) for match in pattern.finditer(line))
+        return positions
+
+    def get_screen_snapshot(self):
+        """
+        Return a snapshot of the mainframe screen.
+
+        The snapshot is cached and only read again from the emulator with a single Ascii() command
+        after a command has changed the screen (see `invalidate_screen`) or once it is older than
+        `snapshot_max_age` seconds.
+        """
+        snapshot = self._screen_snapshot
+        if snapshot is None or not snapshot.is_valid_for(self.screen_generation, self.snapshot_max_age):
+            generation = self.screen_generation
+            rows, columns = self.get_screen_size()
+            cmd = self.exec_command("ascii(0,0,{0},{1})".format(rows, columns).encode("utf-8"))
+            self._screen_snapshot = ScreenSnapshot(
+                generation,
+                [line.decode("utf-8", errors="replace") for line in cmd.data],
+                keyboard_unlocked=self.status.keyboard == b"U",
+            )
+        return self._screen_snapshot
+
+    def get_screen_size(self):
+        """
+        Return the number of rows and columns of the screen as a tuple.
+
+        The host may use the default 24x80 screen on models with a larger alternate screen, so the
+        size is taken from the status line of the last command, or from the model if it is unknown.
+        """
+        return self.session_state.screen_size or (self.model_dimensions["rows"], self.model_dimensions["columns"])
+
+    def read_screen_rows(self):
+        """
+        Read all the mainframe screen and return it as a list of rows.
+        """
+        return self.get_screen_snapshot().rows
+
+    def get_field_map(self):
+        """
+        Return the field map of the mainframe screen.
+
+        Like the screen snapshot, the field map is cached and only read again from the emulator
+        with a single ReadBuffer(Ascii) command after a command has changed the screen.
+        """
+        field_map = self._field_map
+        if field_map is None or not field_map.is_valid_for(self.screen_generation, self.snapshot_max_age):
+            generation = self.screen_generation
+            cmd = self.exec_command(b"readbuffer(ascii)")
+            self._field_map = FieldMap(
+                generation,
+                FieldMap.parse(cmd.data, self.get_screen_size()[1]),
+                keyboard_unlocked=self.status.keyboard == b"U",
+            )
+        return self._field_map
+
+    def get_fields(self):
+        """
+        Return the list of fields of the mainframe screen, in the order of their position.
+        """
+        return self.get_field_map().fields
+
+    def get_input_fields(self):
+        """
+        Return the list of unprotected fields of the mainframe screen.
+        """
+        return [field for field in self.get_fields() if not field.protected]
+
+    def get_field_at(self, ypos, xpos):
+        """
+        Return the field at screen coordinates `ypos`/`xpos`, or None if the screen is unformatted.
+
+        A position holding a start field attribute belongs to the field that the attribute starts.
+        """
+        self.check_limits(ypos, xpos)
+        field_map = self.get_field_map()
+        rows, columns = self.get_screen_size()
+        self.check_limits(ypos, xpos, (rows, columns))
+        return field_map.field_at((ypos - 1) * columns + xpos - 1)
+
     def read_all_screen(self, replace_unicode=True):
         """
         Read all the mainframe screen and return it in a single string.
         """
-        full_text = ""
-        for ypos in range(self.model_dimensions["rows"]):
-            full_text += self.string_get(ypos + 1, 1, self.model_dimensions["columns"])
-            if replace_unicode:
-                # The following section is necessary for cross-platform compatibility if the host application contains some
-                # special characters. It replaces the Unicode values with the corresponding characters to prevent positioning
-                # errors which are caused by the different client implementations (wc3270 vs. x3270)
-
-                # Replace various box drawing character patterns (multiple stages for different character types,
-                # I added them one by one to catch all cases in out tests)
-
-                # Stage 1: Replace specific multi-byte sequences
-                full_text = full_text.replace("â\x94\x80", "-")  # Horizontal line
-                full_text = full_text.replace("â\x94\x82", "|")  # Vertical line
-                full_text = full_text.replace("â\x94\x8c", "+")  # Top-left corner
-                full_text = full_text.replace("â\x94\x90", "+")  # Top-right corner
-                full_text = full_text.replace("â\x94\x94", "+")  # Bottom-left corner
-                full_text = full_text.replace("â\x94\x98", "+")  # Bottom-right corner
-
-                # Stage 2: Replace any remaining 'â' characters (not sure if this could cause issues if you really want the 'â' character)
-                full_text = full_text.replace("â", "-")
-
-                # Only replace if full_text is a string (in the unit tests these are provided as an instance of MagicMock)
-                if isinstance(full_text, str):
-                    # Stage 3: Replace Unicode box drawing range
-                    full_text = re.sub(r"[\u2500-\u257F]", "-", full_text)
-
-                    # Stage 4: Replace any non-ASCII characters that might be box drawing
-                    full_text = re.sub(r"[^\x20-\x7E]", "-", full_text, flags=re.UNICODE)
+        full_text = "".join(self.read_screen_rows())
+        if replace_unicode:
+            full_text = self.unicode_normalizer.normalize(full_text)
         return full_text
 
     def delete_field(self):
@@ -562,28 +1530,91 @@ class Emulator(object):
         self.delete_field()
         self.send_string(tosend)
 
+    def fill_fields(self, fields, aid=None):
+        """
+        Fill several fields in a single round trip
+
+        `fields` is an iterable of (ypos, xpos, tosend) tuples. For each of them, the cursor is moved
+        to `ypos`/`xpos`, the field is erased from there to its end and the string `tosend` is
+        inserted, with backslash escapes for non-ASCII characters. `aid` is an optional AID key
+        command that is sent afterwards, e.g. b"Enter" or b"PF(3)".
+
+        All commands are sent with exec_batch. Coordinates are 1 based, as listed in the
+        status area of the terminal.
+
+        raises: FieldTruncateError if a string does not fit between its position and the end of
+            its field. The strings are checked against the field map before anything is sent.
+        """
+        field_map = self.get_field_map()
+        rows, columns = self.get_screen_size()
+        size = rows * columns
+        cmdstrs = []
+        for ypos, xpos, tosend in fields:
+            self.check_limits(ypos, xpos, (rows, columns))
+            address = (ypos - 1) * columns + xpos - 1
+            field = field_map.field_at(address)
+            # an unformatted screen is a single field without attribute
+            length = field.length - (address - field.address - 1) % size if field else size - address
+            if length - len(tosend) < 0:
+                raise FieldTruncateError(
+                    'length limit %d at position (%d, %d), but got "%s"' % (max(length, 0), ypos, xpos, tosend)
+                )
+            # the screen's coordinates are 1 based, but the command is 0 based
+            cmdstrs.append("MoveCursor({0}, {1})".format(ypos - 1, xpos - 1).encode("utf-8"))
+            cmdstrs.append(b"EraseEOF")
+            cmdstrs.append(self._string_command(tosend.encode("unicode_escape")))
+        if aid:
+            cmdstrs.append(aid)
+        return self.exec_batch(cmdstrs)
+
+    def get_input_field_after(self, ypos, xpos):
+        """
+        Return the first unprotected field whose attribute is at or after screen coordinates
+        `ypos`/`xpos`, or None if there is none. `xpos` may exceed the number of columns.
+        """
+        input_fields = self.get_input_fields()
+        address = (ypos - 1) * self.get_screen_size()[1] + xpos - 1
+        for field in input_fields:
+            if field.address >= address:
+                return field
+        return None
+
     def save_screen(self, file_path):
         self.exec_command("PrintText(html,file,{0})".format(file_path).encode("utf-8"))
 
-    def get_current_position(self):
-        """Returns the current cursor position as a tuple of 1 indexed integers."""
+    def get_current_position(self, max_age=None):
+        """Returns the current cursor position as a tuple of 1 indexed integers.
+
+        The position is taken from the last status line if it is at most `max_age` (by default
+        `state_max_age`) seconds old and the keyboard was unlocked, i.e. the host was not
+        about to move the cursor."""
+        state = self.session_state
+        if self._state_is_fresh(max_age) and state.keyboard_unlocked and state.cursor is not None:
+            return state.cursor
         command = self.exec_command(b"Query(Cursor)")
         if len(command.data) != 1:
             raise Exception(f'Cursor position returned an unexpected value: "{command.data}"')
         list_of_strings = command.data[0].decode("utf-8").split(" ")
         return tuple([int(i) + 1 for i in list_of_strings])
 
-    def check_limits(self, ypos, xpos):
-        if ypos > self.model_dimensions["rows"]:
+    def check_limits(self, ypos, xpos, size=None):
+        """
+        Check the 1 based coordinates against the screen `size` as a tuple of rows and columns,
+        by default against the screen size of the model.
+        """
+        rows, columns = size or (self.model_dimensions["rows"], self.model_dimensions["columns"])
+        if ypos > rows:
             raise Exception("You have exceeded the y-axis limit of the mainframe screen")
-        if xpos > self.model_dimensions["columns"]:
+        if xpos > columns:
             raise Exception("You have exceeded the x-axis limit of the mainframe screen")
 
     def _get_ypos_and_xpos_from_index(self, index):
-        ypos = math.ceil(index / self.model_dimensions["columns"])
-        remainder = index % self.model_dimensions["columns"]
+        # the index refers to the screen as it was read, which may be smaller than the model
+        columns = self.get_screen_size()[1]
+        ypos = math.ceil(index / columns)
+        remainder = index % columns
         if remainder == 0:
-            xpos = self.model_dimensions["columns"]
+            xpos = columns
         else:
             xpos = remainder
         return (ypos, xpos)
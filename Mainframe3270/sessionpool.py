@@ -0,0 +1,116 @@
+import atexit
+from typing import Dict, List, Optional, Set
+from robot.api import logger
+from robot.utils.connectioncache import NoConnection
+from Mainframe3270.py3270 import Emulator
+
+
+class SessionPool:
+    """
+    Keeps logged-in emulator sessions alive across test suites, so that they can be checked out
+    by a test instead of opening a new connection and logging in again.
+
+    Session pools are kept per process and identified by their name.
+    """
+
+    _pools: Dict[str, "SessionPool"] = {}
+
+    def __init__(self, name: str, size: int, setup_keyword: str, reset_keyword: Optional[str] = None):
+        self.name = name
+        self.size = size
+        self.setup_keyword = setup_keyword
+        self.reset_keyword = reset_keyword
+        self.idle: List[Emulator] = []
+        self.checked_out: Set[Emulator] = set()
+
+    @classmethod
+    def create(cls, name: str, size: int, setup_keyword: str, reset_keyword: Optional[str] = None) -> "SessionPool":
+        """
+        Create the session pool ``name``. If it already exists, e.g. because it was created by a previous
+        suite, its sessions are kept and only its settings are updated.
+        """
+        if not cls._pools:
+            atexit.register(cls.close_all)
+        pool = cls._pools.get(name)
+        if pool is None:
+            pool = cls._pools[name] = cls(name, size, setup_keyword, reset_keyword)
+        else:
+            pool.size = size
+            pool.setup_keyword = setup_keyword
+            pool.reset_keyword = reset_keyword
+        return pool
+
+    @classmethod
+    def get(cls, name: str) -> "SessionPool":
+        try:
+            return cls._pools[name]
+        except KeyError:
+            raise ValueError(f'There is no session pool with the name "{name}". Create it with `Create Session Pool`.')
+
+    @classmethod
+    def close_all(cls) -> None:
+        for name in list(cls._pools):
+            cls._pools.pop(name).close()
+
+    def take_idle(self) -> Optional[Emulator]:
+        """
+        Returns a healthy idle session, or None if there is none. Sessions that are no longer
+        connected are terminated and dropped from the pool.
+        """
+        while self.idle:
+            emulator = self.idle.pop(0)
+            if is_healthy(emulator):
+                self.checked_out.add(emulator)
+                return emulator
+            logger.info(f'Dropping a disconnected session from session pool "{self.name}"')
+            emulator.terminate()
+        return None
+
+    def has_capacity(self) -> bool:
+        # sessions that were closed while checked out do not count against the pool size
+        self.checked_out = {emulator for emulator in self.checked_out if not emulator.is_terminated}
+        return len(self.idle) + len(self.checked_out) < self.size
+
+    def check_out(self, emulator: Emulator) -> None:
+        self.checked_out.add(emulator)
+
+    def check_in(self, emulator: Emulator) -> None:
+        self.checked_out.discard(emulator)
+        if is_healthy(emulator) and len(self.idle) < self.size:
+            self.idle.append(emulator)
+        else:
+            emulator.terminate()
+
+    def discard(self, emulator: Emulator) -> None:
+        self.checked_out.discard(emulator)
+        emulator.terminate()
+
+    def close(self) -> None:
+        for emulator in self.idle:
+            emulator.terminate()
+        self.idle = []
+
+
+class CheckedInSession(NoConnection):
+    """
+    Takes the place of a session in the connection cache of a suite once it was checked in, so that the
+    session can not be reached from that suite anymore while the indices of the other connections stay the same.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(f'The session was checked in to session pool "{name}" and can no longer be used.')
+
+    def terminate(self) -> None:
+        """The session belongs to the pool, closing the connections of the suite keeps it open."""
+
+    def get_stderr(self) -> str:
+        return ""
+
+
+def is_healthy(emulator: Emulator) -> bool:
+    if emulator.is_terminated:
+        return False
+    try:
+        return emulator.is_connected(max_age=0)
+    except Exception:
+        return False
@@ -0,0 +1,8 @@
+"""
+A pure-Python TN3270 client, which the Emulator uses instead of an emulator subprocess with engine="native",
+and a host simulator to test against.
+"""
+
+from Mainframe3270.tn3270.screen import OperatorError, Screen  # noqa: F401
+from Mainframe3270.tn3270.session import NativeApp  # noqa: F401
+from Mainframe3270.tn3270.telnet import TelnetConnection  # noqa: F401
@@ -0,0 +1,98 @@
+"""
+Constants and helpers of the 3270 data stream, see IBM 3270 Data Stream Programmer's Reference (GA23-0059).
+"""
+
+# commands, both the local (channel) and the SNA codes are accepted
+CMD_W = (0xF1, 0x01)
+CMD_EW = (0xF5, 0x05)
+CMD_EWA = (0x7E, 0x0D)
+CMD_RB = (0xF2, 0x02)
+CMD_RM = (0xF6, 0x06)
+CMD_RMA = (0x6E, 0x0E)
+CMD_EAU = (0x6F, 0x0F)
+CMD_WSF = (0xF3, 0x11)
+
+# orders
+ORDER_PT = 0x05
+ORDER_GE = 0x08
+ORDER_SBA = 0x11
+ORDER_EUA = 0x12
+ORDER_IC = 0x13
+ORDER_SF = 0x1D
+ORDER_SA = 0x28
+ORDER_SFE = 0x29
+ORDER_MF = 0x2C
+ORDER_RA = 0x3C
+
+# control characters that are displayed
+CHAR_DUP = 0x1C
+CHAR_FM = 0x1E
+
+# write control character
+WCC_RESET_MDT = 0x01
+WCC_KEYBOARD_RESTORE = 0x02
+
+# field attribute bits, the same as used by py3270.Field
+ATTR_PROTECTED = 0x20
+ATTR_NUMERIC = 0x10
+ATTR_INTENSITY = 0x0C
+ATTR_NONDISPLAY = 0x0C
+ATTR_MODIFIED = 0x01
+
+# extended field attribute type of the basic 3270 field attribute in SFE and MF orders
+XA_3270 = 0xC0
+
+# attention identifiers
+AID_NO = 0x60
+AID_STRUCTURED_FIELD = 0x88
+AID_ENTER = 0x7D
+AID_CLEAR = 0x6D
+AID_PA = (0x6C, 0x6E, 0x6B)
+AID_PF = tuple(bytes.fromhex("F1F2F3F4F5F6F7F8F97A7B7CC1C2C3C4C5C6C7C8C94A4B4C"))
+# AIDs that are answered with a short read, i.e. only the AID without any field data
+SHORT_READ_AIDS = (AID_CLEAR,) + AID_PA
+
+# structured fields
+SF_READ_PARTITION = 0x01
+SF_ERASE_RESET = 0x03
+SF_OUTBOUND_3270DS = 0x40
+READ_PARTITION_QUERY = 0x02
+READ_PARTITION_QUERY_LIST = 0x03
+ERASE_RESET_ALTERNATE = 0x80
+QUERY_REPLY = 0x81
+QR_SUMMARY = 0x80
+QR_USABLE_AREA = 0x81
+QR_IMPLICIT_PARTITION = 0xA6
+
+# the graphic codes of 6 bit values, used for buffer addresses and field attributes
+CODE_TABLE = bytes.fromhex(
+    "40C1C2C3C4C5C6C7C8C94A4B4C4D4E4F"
+    "50D1D2D3D4D5D6D7D8D95A5B5C5D5E5F"
+    "6061E2E3E4E5E6E7E8E96A6B6C6D6E6F"
+    "F0F1F2F3F4F5F6F7F8F97A7B7C7D7E7F"
+)
+
+
+def decode_address(high, low):
+    """
+    Decode a buffer address of two bytes, which is either 12 bit or 14 bit encoded.
+    """
+    if high & 0xC0 == 0:
+        return (high & 0x3F) << 8 | low
+    return (high & 0x3F) << 6 | (low & 0x3F)
+
+
+def encode_address(address, buffer_size):
+    """
+    Encode a buffer address in two bytes, 12 bit encoded if the buffer is small enough and 14 bit encoded otherwise.
+    """
+    if buffer_size > 0x1000:
+        return bytes([(address >> 8) & 0x3F, address & 0xFF])
+    return bytes([CODE_TABLE[(address >> 6) & 0x3F], CODE_TABLE[address & 0x3F]])
+
+
+def encode_attribute(attribute):
+    """
+    Encode the 6 bits of a field attribute as a graphic character.
+    """
+    return CODE_TABLE[attribute & 0x3F]
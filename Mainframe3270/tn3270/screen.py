@@ -0,0 +1,662 @@
+import bisect
+from struct import pack
+from Mainframe3270.tn3270.datastream import (
+    AID_CLEAR,
+    AID_NO,
+    AID_STRUCTURED_FIELD,
+    ATTR_INTENSITY,
+    ATTR_MODIFIED,
+    ATTR_NONDISPLAY,
+    ATTR_NUMERIC,
+    ATTR_PROTECTED,
+    CHAR_DUP,
+    CHAR_FM,
+    CMD_EAU,
+    CMD_EW,
+    CMD_EWA,
+    CMD_RB,
+    CMD_RM,
+    CMD_RMA,
+    CMD_W,
+    CMD_WSF,
+    ERASE_RESET_ALTERNATE,
+    ORDER_EUA,
+    ORDER_GE,
+    ORDER_IC,
+    ORDER_MF,
+    ORDER_PT,
+    ORDER_RA,
+    ORDER_SA,
+    ORDER_SBA,
+    ORDER_SF,
+    ORDER_SFE,
+    QR_IMPLICIT_PARTITION,
+    QR_SUMMARY,
+    QR_USABLE_AREA,
+    QUERY_REPLY,
+    READ_PARTITION_QUERY,
+    READ_PARTITION_QUERY_LIST,
+    SF_ERASE_RESET,
+    SF_OUTBOUND_3270DS,
+    SF_READ_PARTITION,
+    SHORT_READ_AIDS,
+    WCC_KEYBOARD_RESTORE,
+    WCC_RESET_MDT,
+    XA_3270,
+    decode_address,
+    encode_address,
+    encode_attribute,
+)
+
+NULL = "\0"
+
+
+class OperatorError(Exception):
+    """
+    Raised for input the terminal rejects, e.g. typing into a protected field.
+    """
+
+    pass
+
+
+class Screen(object):
+    """
+    The buffer of a 3270 display station.
+
+    The host changes it with 3270 data stream records, see `process`, and the operator with the
+    keyboard methods, like `type_text` or `aid`. Every buffer position holds either a character
+    (NULL for a null character) or a field attribute.
+    """
+
+    def __init__(self, default_size=(24, 80), alternate_size=(24, 80), codec="cp037"):
+        """
+        `default_size` and `alternate_size` are the (rows, columns) of the screen after an Erase/Write
+            respectively an Erase/Write Alternate command, as defined by the terminal model.
+        `codec` is the Python codec of the EBCDIC code page of the host.
+        """
+        self.default_size = default_size
+        self.alternate_size = alternate_size
+        self.codec = codec
+        # the last AID sent to the host, reported in reads the host requests
+        self.last_aid = AID_NO
+        # the keyboard is locked from sending an AID until the host restores it
+        self.locked = False
+        self.operator_error = False
+        # number of write commands received from the host
+        self.writes = 0
+        self.erase(default_size)
+
+    def erase(self, size=None):
+        """
+        Clear the whole buffer and, if `size` is given, change the screen size to it.
+        """
+        if size is not None:
+            self.rows, self.columns = size
+        self.size = self.rows * self.columns
+        self.chars = [NULL] * self.size
+        self.attributes = [None] * self.size
+        self.cursor = 0
+        self._field_addresses = []
+
+    @property
+    def field_addresses(self):
+        """
+        The sorted buffer addresses of all field attributes.
+        """
+        if self._field_addresses is None:
+            self._field_addresses = [
+                address for address, attribute in enumerate(self.attributes) if attribute is not None
+            ]
+        return self._field_addresses
+
+    @property
+    def formatted(self):
+        return bool(self.field_addresses)
+
+    @property
+    def keyboard_unlocked(self):
+        return not self.locked and not self.operator_error
+
+    def _set_attribute(self, address, attribute):
+        self.attributes[address] = attribute
+        self.chars[address] = NULL
+        self._field_addresses = None
+
+    def _set_char(self, address, char):
+        if self.attributes[address] is not None:
+            self.attributes[address] = None
+            self._field_addresses = None
+        self.chars[address] = char
+
+    def field_attribute_address(self, address):
+        """
+        Return the address of the attribute of the field `address` belongs to, or None if the screen is unformatted.
+        """
+        addresses = self.field_addresses
+        if not addresses:
+            return None
+        # fields wrap around the end of the screen, so an address before the first attribute belongs to the last field
+        return addresses[bisect.bisect_right(addresses, address) - 1]
+
+    def is_protected(self, address):
+        """
+        Return whether the operator must not change the buffer position `address`.
+        """
+        field_address = self.field_attribute_address(address)
+        if field_address is None:
+            return False
+        return field_address == address or bool(self.attributes[field_address] & ATTR_PROTECTED)
+
+    def field_end(self, field_address):
+        """
+        Return the address of the attribute that follows the field at `field_address`.
+        """
+        addresses = self.field_addresses
+        return addresses[bisect.bisect_right(addresses, field_address) % len(addresses)]
+
+    def _field_positions(self, field_address):
+        position = (field_address + 1) % self.size
+        end = self.field_end(field_address)
+        while position != end:
+            yield position
+            position = (position + 1) % self.size
+
+    def _input_field_starts(self):
+        attributes = self.attributes
+        size = self.size
+        return [
+            (address + 1) % size
+            for address in self.field_addresses
+            if not attributes[address] & ATTR_PROTECTED and attributes[(address + 1) % size] is None
+        ]
+
+    def next_input_position(self, address):
+        """
+        Return the first position of the first unprotected field whose attribute is at or after `address`,
+        wrapping around the end of the screen, or None if there is no unprotected field.
+        """
+        starts = self._input_field_starts()
+        if not starts:
+            return None
+        # the start of a field is one position after its attribute
+        return starts[bisect.bisect_right(starts, address) % len(starts)]
+
+    # --- host data stream ---
+
+    def process(self, record):
+        """
+        Process a 3270 data stream record sent by the host.
+
+        Returns the inbound data stream the host asked for with a read command, or None.
+        """
+        if not record:
+            return None
+        command = record[0]
+        if command in CMD_W:
+            self._write(record, 1)
+        elif command in CMD_EW:
+            self.erase(self.default_size)
+            self._write(record, 1)
+        elif command in CMD_EWA:
+            self.erase(self.alternate_size)
+            self._write(record, 1)
+        elif command in CMD_EAU:
+            self.erase_all_unprotected()
+            self._restore_keyboard()
+            self.writes += 1
+        elif command in CMD_RB:
+            return self.read_buffer(self.last_aid)
+        elif command in CMD_RM:
+            return self.read_modified(self.last_aid)
+        elif command in CMD_RMA:
+            return self.read_modified(self.last_aid, True)
+        elif command in CMD_WSF:
+            return self._write_structured_fields(record)
+        else:
+            raise ValueError("Unknown 3270 command 0x{0:02x}".format(command))
+        return None
+
+    def _restore_keyboard(self):
+        self.locked = False
+        self.operator_error = False
+        self.last_aid = AID_NO
+
+    def _write(self, data, start):
+        self.writes += 1
+        if start >= len(data):
+            return
+        wcc = data[start]
+        if wcc & WCC_RESET_MDT:
+            self._reset_modified()
+        self._process_orders(data, start + 1, len(data))
+        if wcc & WCC_KEYBOARD_RESTORE:
+            self._restore_keyboard()
+
+    def _process_orders(self, data, index, end):
+        size = self.size
+        address = self.cursor
+        after_data = False
+        while index < end:
+            byte = data[index]
+            if byte == ORDER_SBA:
+                address = decode_address(data[index + 1], data[index + 2]) % size
+                index += 3
+            elif byte == ORDER_SF:
+                self._set_attribute(address, data[index + 1] & 0x3F)
+                address = (address + 1) % size
+                index += 2
+            elif byte == ORDER_IC:
+                self.cursor = address
+                index += 1
+            elif byte == ORDER_PT:
+                if after_data:
+                    # a PT order right after data clears the rest of the field
+                    while self.attributes[address] is None:
+                        self.chars[address] = NULL
+                        address = (address + 1) % size
+                        if address == 0:
+                            break
+                next_position = self.next_input_position(address)
+                address = 0 if next_position is None else next_position
+                index += 1
+            elif byte == ORDER_RA:
+                stop = decode_address(data[index + 1], data[index + 2]) % size
+                if data[index + 3] == ORDER_GE:
+                    char = self._decode_ge(data[index + 4])
+                    index += 5
+                else:
+                    char = self._decode(data[index + 3])
+                    index += 4
+                # the stop address is exclusive, if it is the current address the whole buffer is filled
+                while True:
+                    self._set_char(address, char)
+                    address = (address + 1) % size
+                    if address == stop:
+                        break
+            elif byte == ORDER_EUA:
+                stop = decode_address(data[index + 1], data[index + 2]) % size
+                while True:
+                    if not self.is_protected(address):
+                        self.chars[address] = NULL
+                    address = (address + 1) % size
+                    if address == stop:
+                        break
+                index += 3
+            elif byte == ORDER_GE:
+                self._set_char(address, self._decode_ge(data[index + 1]))
+                address = (address + 1) % size
+                index += 2
+            elif byte == ORDER_SFE:
+                count = data[index + 1]
+                attribute = 0
+                for pair in range(count):
+                    if data[index + 2 + 2 * pair] == XA_3270:
+                        attribute = data[index + 3 + 2 * pair] & 0x3F
+                self._set_attribute(address, attribute)
+                address = (address + 1) % size
+                index += 2 + 2 * count
+            elif byte == ORDER_MF:
+                count = data[index + 1]
+                if self.attributes[address] is not None:
+                    for pair in range(count):
+                        if data[index + 2 + 2 * pair] == XA_3270:
+                            self._set_attribute(address, data[index + 3 + 2 * pair] & 0x3F)
+                address = (address + 1) % size
+                index += 2 + 2 * count
+            elif byte == ORDER_SA:
+                # character attributes like colors are not kept
+                index += 3
+            else:
+                # decode runs of data at once instead of character by character
+                run_end = index + 1
+                while byte >= 0x40 and run_end < end and data[run_end] >= 0x40:
+                    run_end += 1
+                for char in self._decode_run(data[index:run_end]):
+                    self._set_char(address, char)
+                    address = (address + 1) % size
+                index = run_end
+                after_data = True
+                continue
+            after_data = False
+
+    def _decode(self, byte):
+        return self._decode_run(bytes([byte]))
+
+    def _decode_run(self, data):
+        if data[0] < 0x40:
+            if data[0] == CHAR_DUP:
+                return "*"
+            if data[0] == CHAR_FM:
+                return ";"
+            # other control characters are shown as nulls
+            return NULL
+        return data.decode(self.codec, errors="replace")
+
+    @staticmethod
+    def _decode_ge(byte):
+        # the APL and line drawing characters of the graphic escape code page are not supported
+        return " "
+
+    def _write_structured_fields(self, record):
+        reply = None
+        index = 1
+        while index + 3 <= len(record):
+            length = record[index] << 8 | record[index + 1]
+            # a length of 0 means the field extends to the end of the record
+            end = len(record) if length == 0 else index + length
+            field_id = record[index + 2]
+            if field_id == SF_READ_PARTITION:
+                read_type = record[index + 4]
+                if read_type in (READ_PARTITION_QUERY, READ_PARTITION_QUERY_LIST):
+                    reply = self.query_reply()
+                else:
+                    reply = self.process(bytes([read_type]))
+            elif field_id == SF_ERASE_RESET:
+                alternate = index + 3 < end and record[index + 3] & ERASE_RESET_ALTERNATE
+                self.erase(self.alternate_size if alternate else self.default_size)
+            elif field_id == SF_OUTBOUND_3270DS:
+                # the partition id is followed by a regular 3270 command
+                reply = self.process(record[index + 4 : end]) or reply
+            if end <= index:
+                break
+            index = end
+        return reply
+
+    def query_reply(self):
+        """
+        The reply to a Read Partition Query, which describes the capabilities of the terminal.
+        """
+        rows, columns = self.alternate_size
+        default_rows, default_columns = self.default_size
+        summary = bytes([QUERY_REPLY, QR_SUMMARY, QR_SUMMARY, QR_USABLE_AREA, QR_IMPLICIT_PARTITION])
+        # 12/14 bit addressing, the size in characters and the cell size in the units of x3270
+        usable_area = b"".join(
+            [
+                bytes([QUERY_REPLY, QR_USABLE_AREA, 0x01, 0x00]),
+                pack(">HH", columns, rows),
+                bytes([0x01, 0x00, 0x0A, 0x02, 0xE5, 0x00, 0x02, 0x00, 0x6F, 0x09, 0x0C]),
+                pack(">H", rows * columns),
+            ]
+        )
+        implicit_partition = bytes([QUERY_REPLY, QR_IMPLICIT_PARTITION, 0x00, 0x00, 0x0B, 0x01, 0x00]) + pack(
+            ">HHHH", default_columns, default_rows, columns, rows
+        )
+        return bytes([AID_STRUCTURED_FIELD]) + b"".join(
+            pack(">H", len(field) + 2) + field for field in (summary, usable_area, implicit_partition)
+        )
+
+    def _reset_modified(self):
+        attributes = self.attributes
+        for address in self.field_addresses:
+            attributes[address] &= ~ATTR_MODIFIED
+
+    def _set_modified(self, address):
+        field_address = self.field_attribute_address(address)
+        if field_address is not None:
+            self.attributes[field_address] |= ATTR_MODIFIED
+
+    def erase_all_unprotected(self):
+        """
+        Clear all unprotected fields and reset their modified flags.
+        The cursor is moved to the first unprotected field.
+        """
+        if not self.formatted:
+            self.erase()
+            return
+        for address in self.field_addresses:
+            if not self.attributes[address] & ATTR_PROTECTED:
+                self.attributes[address] &= ~ATTR_MODIFIED
+                for position in self._field_positions(address):
+                    self.chars[position] = NULL
+        self.cursor = self.next_input_position(0) or 0
+
+    def _encode(self, chars):
+        return "".join(chars).replace(NULL, "").encode(self.codec, errors="replace")
+
+    def read_buffer(self, aid):
+        """
+        The inbound data stream of a Read Buffer command, i.e. the whole buffer.
+        """
+        out = bytearray([aid])
+        out += encode_address(self.cursor, self.size)
+        for char, attribute in zip(self.chars, self.attributes):
+            if attribute is not None:
+                out.append(ORDER_SF)
+                out.append(encode_attribute(attribute))
+            elif char == NULL:
+                out.append(0)
+            else:
+                out += char.encode(self.codec, errors="replace")
+        return bytes(out)
+
+    def read_modified(self, aid, read_all=False):
+        """
+        The inbound data stream of a Read Modified command, i.e. the contents of all modified fields
+        without null characters.
+        """
+        out = bytearray([aid])
+        if aid in SHORT_READ_AIDS and not read_all:
+            return bytes(out)
+        out += encode_address(self.cursor, self.size)
+        if not self.formatted:
+            out += self._encode(self.chars)
+            return bytes(out)
+        for address in self.field_addresses:
+            if self.attributes[address] & ATTR_MODIFIED:
+                positions = list(self._field_positions(address))
+                out.append(ORDER_SBA)
+                out += encode_address((address + 1) % self.size, self.size)
+                out += self._encode(self.chars[position] for position in positions)
+        return bytes(out)
+
+    # --- keyboard ---
+
+    def _check_input(self, address):
+        if self.is_protected(address):
+            self.operator_error = True
+            raise OperatorError("Keyboard locked, the cursor is in a protected field")
+
+    def move_cursor(self, row, column):
+        """
+        Move the cursor to the 0 based `row` and `column`.
+        """
+        if not (0 <= row < self.rows and 0 <= column < self.columns):
+            raise OperatorError("Invalid cursor position ({0}, {1})".format(row, column))
+        self.cursor = row * self.columns + column
+
+    def type_text(self, text):
+        """
+        Type `text` at the cursor position like the operator would, i.e. the cursor skips
+        to the next unprotected field at the end of a field if the next field is autoskip.
+        """
+        size = self.size
+        formatted = self.formatted
+        for char in text:
+            address = self.cursor
+            if formatted:
+                self._check_input(address)
+                self._set_modified(address)
+            self.chars[address] = char
+            address = (address + 1) % size
+            attribute = self.attributes[address]
+            if attribute is not None:
+                if attribute & ATTR_PROTECTED and attribute & ATTR_NUMERIC:
+                    next_position = self.next_input_position(address)
+                    address = address if next_position is None else next_position
+                else:
+                    address = (address + 1) % size
+            self.cursor = address
+
+    def tab(self):
+        next_position = self.next_input_position(self.cursor)
+        self.cursor = 0 if next_position is None else next_position
+
+    def backtab(self):
+        starts = self._input_field_starts()
+        if not starts:
+            self.cursor = 0
+            return
+        # the start of the current field, if the cursor is not at it, or the start of the previous field
+        self.cursor = starts[bisect.bisect_left(starts, self.cursor) - 1]
+
+    def home(self):
+        next_position = self.next_input_position(self.size - 1)
+        self.cursor = 0 if next_position is None else next_position
+
+    def newline(self):
+        address = (self.cursor // self.columns + 1) % self.rows * self.columns
+        if self.formatted and self.is_protected(address):
+            next_position = self.next_input_position(address)
+            address = address if next_position is None else next_position
+        self.cursor = address
+
+    def move(self, offset):
+        self.cursor = (self.cursor + offset) % self.size
+
+    def _positions_to_field_end(self, address):
+        if not self.formatted:
+            return range(address, self.size)
+        end = self.field_end(self.field_attribute_address(address))
+        return range(address, end if end > address else end + self.size)
+
+    def erase_eof(self):
+        """
+        Clear the current field from the cursor position to its end.
+        """
+        self._check_input(self.cursor)
+        for position in self._positions_to_field_end(self.cursor):
+            self.chars[position % self.size] = NULL
+        self._set_modified(self.cursor)
+
+    def erase_input(self):
+        """
+        Clear all unprotected fields. The cursor is moved to the first unprotected field.
+        """
+        if not self.formatted:
+            self.erase()
+            return
+        for address in self.field_addresses:
+            if not self.attributes[address] & ATTR_PROTECTED:
+                for position in self._field_positions(address):
+                    self.chars[position] = NULL
+        self.home()
+
+    def delete(self):
+        """
+        Delete the character at the cursor position, shifting the rest of the field to the left.
+        """
+        self._check_input(self.cursor)
+        positions = [position % self.size for position in self._positions_to_field_end(self.cursor)]
+        chars = self.chars
+        for position, next_position in zip(positions, positions[1:]):
+            chars[position] = chars[next_position]
+        chars[positions[-1]] = NULL
+        self._set_modified(self.cursor)
+
+    def delete_field(self):
+        """
+        Clear the current field and move the cursor to its start.
+        """
+        self._check_input(self.cursor)
+        if not self.formatted:
+            self.erase()
+            return
+        field_address = self.field_attribute_address(self.cursor)
+        for position in self._field_positions(field_address):
+            self.chars[position] = NULL
+        self.attributes[field_address] |= ATTR_MODIFIED
+        self.cursor = (field_address + 1) % self.size
+
+    def field_end_position(self):
+        """
+        Move the cursor after the last character of the current field, that is not a blank or null character.
+        """
+        self._check_input(self.cursor)
+        field_address = self.field_attribute_address(self.cursor)
+        if field_address is None:
+            positions = list(range(self.size))
+        else:
+            positions = list(self._field_positions(field_address))
+        filled = [index for index, position in enumerate(positions) if self.chars[position] not in (NULL, " ")]
+        if not filled:
+            self.cursor = positions[0]
+        else:
+            self.cursor = positions[min(filled[-1] + 1, len(positions) - 1)]
+
+    def aid(self, aid):
+        """
+        Send an attention identifier. Returns the inbound data stream for the host and locks the keyboard
+        until the host restores it.
+        """
+        if aid == AID_CLEAR:
+            self.erase(self.default_size)
+        data = self.read_modified(aid)
+        self.last_aid = aid
+        self.locked = True
+        return data
+
+    def reset(self):
+        """
+        Reset an operator error.
+        """
+        self.operator_error = False
+
+    # --- reading ---
+
+    def display_chars(self):
+        """
+        Return all buffer positions as they are displayed, i.e. with field attributes,
+        null characters and the contents of non display fields shown as blanks.
+        """
+        chars = list(self.chars)
+        attributes = self.attributes
+        for address in self.field_addresses:
+            chars[address] = " "
+            if attributes[address] & ATTR_INTENSITY == ATTR_NONDISPLAY:
+                for position in self._field_positions(address):
+                    chars[position] = " "
+        return "".join(chars).replace(NULL, " ")
+
+    def ascii_rows(self, row, column, rows, columns):
+        """
+        Return the displayed text of a rectangle of the screen as one string per row.
+        """
+        text = self.display_chars()
+        start = row * self.columns + column
+        return [
+            text[start + offset : start + offset + columns] for offset in range(0, rows * self.columns, self.columns)
+        ]
+
+    def ascii_text(self, address, length):
+        """
+        Return the displayed text of `length` positions from `address` on, split at the end of each row.
+        """
+        text = self.display_chars()
+        result = []
+        while length > 0:
+            row_end = (address // self.columns + 1) * self.columns
+            chunk = min(length, row_end - address)
+            result.append(text[address : address + chunk])
+            address += chunk
+            length -= chunk
+        return result
+
+    def buffer_tokens(self, ebcdic=False):
+        """
+        Return the buffer as rows of tokens like the x3270 ReadBuffer action does, e.g. SF(c0=e0) for
+        a field attribute and the hex code of the character for every other position.
+        """
+        rows = []
+        for row in range(self.rows):
+            tokens = []
+            for address in range(row * self.columns, (row + 1) * self.columns):
+                attribute = self.attributes[address]
+                if attribute is not None:
+                    tokens.append("SF(c0={0:02x})".format(encode_attribute(attribute)))
+                elif ebcdic:
+                    char = self.chars[address]
+                    tokens.append("00" if char == NULL else char.encode(self.codec, errors="replace").hex())
+                else:
+                    tokens.append("{0:02x}".format(ord(self.chars[address])))
+            rows.append(" ".join(tokens))
+        return rows
@@ -0,0 +1,497 @@
+import codecs
+import html
+import re
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from Mainframe3270.py3270 import CommandTimeoutError, Emulator, ExecutableApp
+from Mainframe3270.tn3270.datastream import AID_CLEAR, AID_ENTER, AID_PA, AID_PF
+from Mainframe3270.tn3270.screen import OperatorError, Screen
+from Mainframe3270.tn3270.telnet import TelnetConnection
+
+
+class ActionError(Exception):
+    """
+    Raised by an action that fails, its message is reported to the Emulator like x3270 does.
+    """
+
+    pass
+
+
+# a quoted argument, which may contain escaped quotes, or an unquoted one
+_ARGUMENT_REGEX = re.compile(r'"((?:[^"\\]|\\.)*)"|([^,\s()"]+)')
+_MODEL_REGEX = re.compile(r"^(?:(327[89])-)?([2-5])(-E)?$")
+# x3270 host prefixes, e.g. L: for TLS or N: to not negotiate TN3270E
+_HOST_PREFIX_REGEX = re.compile(r"^([ABCLNPSYabclnpsy]):(?=.)")
+# the escapes of the String action that are not simply replaced by the character
+_STRING_ESCAPE_REGEX = re.compile(r"\\(x[0-9a-fA-F]{1,4}|u[0-9a-fA-F]{4}|.)", re.DOTALL)
+_STRING_KEYS = {"n": "Enter", "t": "Tab", "b": "Left", "f": "Clear", "r": "Newline"}
+
+_HTML_TEMPLATE = """<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+</head>
+<body>
+<table border="0"><tr bgcolor="black"><td>
+<pre><span style="color:#00ff00;background:black;font-family:monospace">{screen}</span></pre>
+</td></tr></table>
+</body>
+</html>
+"""
+
+
+class NativeApp(object):
+    """
+    Runs x3270 script actions in-process on a pure-Python TN3270 client, so that an Emulator
+    can use it instead of an emulator subprocess.
+
+    It implements the interface of ExecutableApp: commands written with `write` are executed when
+    their result is read with `readline`, which answers like s3270 with data lines, the status line
+    and ok or error. The screen is kept in memory, so reading it involves no inter-process communication.
+
+    Only the actions the library uses are supported, e.g. Connect, Wait, String, Enter, PF, Ascii
+    and ReadBuffer, and the emulator arguments -port, -codepage, -model and -utf8.
+    """
+
+    STDERR_MAX_LINES = ExecutableApp.STDERR_MAX_LINES
+    # seconds to wait for the connection to be established and negotiated
+    connect_timeout = 30
+    # called like TelnetConnection to create the connection to the host, replaced to run without a host
+    connection_class = TelnetConnection
+
+    def __init__(self, extra_args=None, model="2"):
+        self.port = 23
+        self.codec = "cp037"
+        self.model = model
+        self._parse_args(extra_args or [])
+        match = _MODEL_REGEX.match(self.model)
+        if not match:
+            raise ValueError(f"The native engine does not support the model '{self.model}'")
+        self.model_number = match.group(2)
+        terminal = match.group(1) or "3279"
+        extended = bool(match.group(3)) or not match.group(1)
+        self.terminal_type = "{0}-{1}{2}".format(terminal, self.model_number, "-E" if extended else "")
+        alternate_size = Emulator._set_model_dimensions(self.model_number)
+        self.screen = Screen((24, 80), (alternate_size["rows"], alternate_size["columns"]), self.codec)
+        self.stderr_lines = deque(maxlen=self.STDERR_MAX_LINES)
+        self.host = None
+        self.connection = None
+        self._changed = threading.Condition()
+        self._input = b""
+        self._commands = deque()
+        self._output = deque()
+        # whether the host has written to the screen since the last AID or Wait(Output)
+        self._output_pending = False
+        self._deadline = None
+        self._actions = {
+            "ignore": self._ignore,
+            "query": self._query,
+            "connect": self._connect,
+            "disconnect": self._disconnect,
+            "quit": self._disconnect,
+            "wait": self._wait,
+            "movecursor": self._move_cursor,
+            "movecursor1": self._move_cursor1,
+            "string": self._string,
+            "enter": lambda: self._aid(AID_ENTER),
+            "clear": lambda: self._aid(AID_CLEAR),
+            "pf": lambda number: self._aid(self._lookup(AID_PF, number, "PF")),
+            "pa": lambda number: self._aid(self._lookup(AID_PA, number, "PA")),
+            "tab": lambda: self._key(self.screen.tab),
+            "backtab": lambda: self._key(self.screen.backtab),
+            "home": lambda: self._key(self.screen.home),
+            "newline": lambda: self._key(self.screen.newline),
+            "left": lambda: self._key(self.screen.move, -1),
+            "backspace": lambda: self._key(self.screen.move, -1),
+            "right": lambda: self._key(self.screen.move, 1),
+            "up": lambda: self._key(self.screen.move, -self.screen.columns),
+            "down": lambda: self._key(self.screen.move, self.screen.columns),
+            "eraseeof": lambda: self._key(self.screen.erase_eof),
+            "eraseinput": lambda: self._key(self.screen.erase_input),
+            "delete": lambda: self._key(self.screen.delete),
+            "deletefield": lambda: self._key(self.screen.delete_field),
+            "fieldend": lambda: self._key(self.screen.field_end_position),
+            "reset": self._reset,
+            "ascii": self._ascii,
+            "readbuffer": self._read_buffer,
+            "printtext": self._print_text,
+        }
+
+    def _parse_args(self, args):
+        args = iter(args)
+        for arg in args:
+            if arg == "-utf8":
+                # the screen is always read as unicode
+                continue
+            if arg == "-port":
+                self.port = int(next(args))
+            elif arg in ("-codepage", "-charset"):
+                self.codec = self._get_codec(next(args))
+            elif arg == "-model":
+                self.model = next(args)
+            elif arg == "-xrm":
+                resource = next(args)
+                name, _, value = resource.partition(":")
+                if name.strip().lstrip("*").rsplit(".", 1)[-1] != "model":
+                    raise ValueError(f"The native engine does not support the resource '{resource}'")
+                self.model = value.strip()
+            else:
+                raise ValueError(f"The native engine does not support the emulator argument '{arg}'")
+
+    @staticmethod
+    def _get_codec(codepage):
+        name = codepage.lower()
+        for candidate in (name, "cp" + name, "cp" + name.lstrip("cp0")):
+            try:
+                return codecs.lookup(candidate).name
+            except LookupError:
+                continue
+        raise ValueError(f"The native engine does not support the code page '{codepage}'")
+
+    # --- the ExecutableApp interface ---
+
+    def connect(self, host):
+        """the host is connected with the Connect action"""
+        return False
+
+    def write(self, data):
+        self._input += data
+        *lines, self._input = self._input.split(b"\n")
+        self._commands.extend(lines)
+
+    def readline(self, timeout=None):
+        """
+        Read one line of the result of the commands written, executing the next command if needed.
+
+        raises: CommandTimeoutError if the command did not complete within `timeout` seconds.
+        """
+        if not self._output:
+            if not self._commands:
+                # like the output of an emulator that has exited
+                return b""
+            deadline = None if timeout is None else time.monotonic() + timeout
+            self._execute(self._commands.popleft(), deadline)
+        return self._output.popleft()
+
+    def watchdog(self, timeout):
+        # readline enforces the timeout itself
+        return nullcontext()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+
+    def kill(self):
+        self._commands.clear()
+        self._output.clear()
+        self.close()
+
+    # --- executing actions ---
+
+    def _execute(self, cmdstr, deadline):
+        start = time.monotonic()
+        data = []
+        result = b"ok"
+        with self._changed:
+            try:
+                name, args = self._parse_action(cmdstr.decode("utf-8").strip())
+                action = self._actions.get(name.lower())
+                if action is None:
+                    raise ActionError(f"Unknown action: {name}")
+                self._deadline = deadline
+                data = action(*args) or []
+            except (ActionError, OperatorError, ValueError) as error:
+                data = [str(error)]
+                result = b"error"
+            except TypeError:
+                data = [f"{cmdstr.decode('utf-8')}: wrong number of arguments"]
+                result = b"error"
+            status_line = self._status_line(time.monotonic() - start)
+        self._output.extend(b"data: " + line.encode("utf-8") + b"\n" for line in data)
+        self._output.append(status_line + b"\n")
+        self._output.append(result + b"\n")
+
+    @staticmethod
+    def _parse_action(action):
+        name, _, rest = action.partition("(")
+        if not rest:
+            name, _, rest = action.partition(" ")
+        name = name.strip()
+        if not name:
+            raise ActionError("Missing action name")
+        args = [quoted if quoted or not unquoted else unquoted for quoted, unquoted in _ARGUMENT_REGEX.findall(rest)]
+        return name, args
+
+    def _status_line(self, elapsed):
+        screen = self.screen
+        connection = self.connection
+        connected = connection is not None and connection.connected
+        if not connected:
+            keyboard, mode = "L", "N"
+        else:
+            keyboard = "U" if screen.keyboard_unlocked else ("E" if screen.operator_error else "L")
+            mode = "I" if connection.in_3270_mode else "P"
+        return " ".join(
+            [
+                keyboard,
+                "F" if screen.formatted else "U",
+                "P" if screen.formatted and screen.is_protected(screen.cursor) else "U",
+                f"C({self.host})" if connected else "N",
+                mode,
+                self.model_number,
+                str(screen.rows),
+                str(screen.columns),
+                str(screen.cursor // screen.columns),
+                str(screen.cursor % screen.columns),
+                "0x0",
+                f"{elapsed:.3f}",
+            ]
+        ).encode("utf-8")
+
+    def _wait_until(self, condition, timeout=None):
+        """
+        Wait until `condition` is true, but at most `timeout` seconds. Returns the last value of `condition`.
+
+        raises: CommandTimeoutError if the deadline of the command passes first.
+        """
+        deadline = self._deadline
+        wait_until = None if timeout is None else time.monotonic() + timeout
+        while True:
+            result = condition()
+            if result:
+                return result
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                raise CommandTimeoutError("The emulator did not answer within the command timeout")
+            if wait_until is not None and now >= wait_until:
+                return result
+            remaining = [limit - now for limit in (deadline, wait_until) if limit is not None]
+            self._changed.wait(min(remaining) if remaining else None)
+
+    def _on_record(self, record):
+        with self._changed:
+            try:
+                reply = self.screen.process(record)
+                if reply is not None:
+                    self.connection.send_record(reply)
+            except Exception as error:
+                self.stderr_lines.append(f"Processing the data from the host failed: {error!r}")
+            self._output_pending = True
+            self._changed.notify_all()
+
+    def _on_state_change(self):
+        with self._changed:
+            connection = self.connection
+            if connection is not None and not connection.connected and connection.error is not None:
+                self.stderr_lines.append(f"The connection to the host failed: {connection.error}")
+            self._changed.notify_all()
+
+    @property
+    def _connected(self):
+        return self.connection is not None and self.connection.connected
+
+    def _check_connected(self):
+        if not self._connected:
+            raise ActionError("Not connected")
+
+    # --- actions ---
+
+    def _ignore(self):
+        return None
+
+    def _query(self, keyword="Cursor"):
+        screen = self.screen
+        values = {
+            "cursor": f"{screen.cursor // screen.columns} {screen.cursor % screen.columns}",
+            "cursor1": f"{screen.cursor // screen.columns + 1} {screen.cursor % screen.columns + 1}",
+            "screencursize": f"rows {screen.rows} columns {screen.columns}",
+            "screenmaxsize": f"rows {screen.alternate_size[0]} columns {screen.alternate_size[1]}",
+            "model": f"IBM-{self.terminal_type}",
+            "host": f"host {self.host}" if self._connected else "",
+            "luname": (self.connection.lu or "") if self._connected else "",
+            "codepage": self.codec,
+        }
+        if keyword.lower() not in values:
+            raise ActionError(f"Query: unknown parameter '{keyword}'")
+        return [values[keyword.lower()]]
+
+    def _connect(self, host):
+        if self._connected:
+            raise ActionError("Already connected")
+        tls, tn3270e = False, True
+        match = _HOST_PREFIX_REGEX.match(host)
+        while match:
+            prefix = match.group(1).upper()
+            tls = tls or prefix == "L"
+            tn3270e = tn3270e and prefix != "N"
+            host = host[2:]
+            match = _HOST_PREFIX_REGEX.match(host)
+        lu, _, host = host.rpartition("@")
+        if host.startswith("["):
+            name, _, port = host[1:].partition("]")
+            port = port.lstrip(":")
+        else:
+            name, _, port = host.partition(":")
+        self.screen.erase(self.screen.default_size)
+        self.connection = self.connection_class(
+            self.terminal_type, self._on_record, self._on_state_change, lu.split(",")[0] or None, tn3270e
+        )
+        try:
+            self.connection.open(name, int(port) if port else self.port, self.connect_timeout, tls)
+        except OSError as error:
+            self.stderr_lines.append(f"Connecting to {host} failed: {error}")
+            raise ActionError(f"Connection failed: {error}")
+        self.host = name
+        # the keyboard is locked until the host has sent the first screen
+        self.screen.locked = True
+        self._output_pending = False
+        if not self._wait_until(lambda: self.connection.in_3270_mode or not self._connected, self.connect_timeout):
+            raise ActionError("The host did not negotiate TN3270 in time")
+        self._check_connected()
+
+    def _disconnect(self):
+        if self.connection is not None:
+            self.connection.close()
+            self._wait_until(lambda: not self.connection.connected, 1)
+
+    def _wait(self, *args):
+        timeout = None
+        if args and re.match(r"^\d+(\.\d+)?$", args[0]):
+            timeout, args = float(args[0]), args[1:]
+        condition = args[0].lower() if args else "inputfield"
+        screen = self.screen
+        conditions = {
+            "inputfield": lambda: screen.keyboard_unlocked and self._has_input_field(),
+            "output": lambda: self._output_pending,
+            "unlock": lambda: screen.keyboard_unlocked,
+            "3270mode": lambda: self.connection.in_3270_mode,
+            "3270": lambda: self.connection.in_3270_mode,
+        }
+        if condition == "seconds":
+            self._wait_until(lambda: False, timeout or 1)
+            return None
+        if condition == "disconnect":
+            met = self._wait_until(lambda: not self._connected, timeout)
+        elif condition in conditions:
+            self._check_connected()
+            check = conditions[condition]
+            met = self._wait_until(lambda: not self._connected or check(), timeout)
+            self._check_connected()
+        else:
+            raise ActionError(f"Wait: unknown condition '{args[0]}'")
+        if not met:
+            raise ActionError("Wait timed out")
+        if condition == "output":
+            self._output_pending = False
+        return None
+
+    def _has_input_field(self):
+        return not self.screen.formatted or self.screen.next_input_position(0) is not None
+
+    def _wait_for_keyboard(self):
+        """
+        Wait until the host unlocks the keyboard, like x3270 does before keyboard actions.
+        """
+        self._check_connected()
+        self._wait_until(lambda: not self.screen.locked or not self._connected)
+        self._check_connected()
+        if self.screen.operator_error:
+            raise ActionError("Keyboard locked")
+
+    def _key(self, method, *args):
+        self._wait_for_keyboard()
+        method(*args)
+
+    def _reset(self):
+        self.screen.reset()
+
+    def _move_cursor(self, row, column):
+        self._key(self.screen.move_cursor, int(row), int(column))
+
+    def _move_cursor1(self, row, column):
+        self._key(self.screen.move_cursor, int(row) - 1, int(column) - 1)
+
+    @staticmethod
+    def _lookup(aids, number, name):
+        if not number.isdigit() or not 1 <= int(number) <= len(aids):
+            raise ActionError(f"{name}: invalid number '{number}'")
+        return aids[int(number) - 1]
+
+    def _aid(self, aid):
+        self._wait_for_keyboard()
+        data = self.screen.aid(aid)
+        self._output_pending = False
+        self.connection.send_record(data)
+
+    def _string(self, *texts):
+        keys = {
+            "Enter": lambda: self._aid(AID_ENTER),
+            "Clear": lambda: self._aid(AID_CLEAR),
+            "Tab": lambda: self._key(self.screen.tab),
+            "Left": lambda: self._key(self.screen.move, -1),
+            "Newline": lambda: self._key(self.screen.newline),
+        }
+        for text in texts:
+            position = 0
+            for match in _STRING_ESCAPE_REGEX.finditer(text):
+                self._type(text[position : match.start()])
+                position = match.end()
+                escape = match.group(1)
+                if escape in _STRING_KEYS:
+                    keys[_STRING_KEYS[escape]]()
+                elif len(escape) > 1:
+                    self._type(chr(int(escape[1:], 16)))
+                else:
+                    self._type(escape)
+            self._type(text[position:])
+
+    def _type(self, text):
+        if text:
+            self._key(self.screen.type_text, text)
+
+    def _check_rectangle(self, row, column, rows, columns):
+        screen = self.screen
+        if not (0 <= row < screen.rows and 0 <= column < screen.columns):
+            raise ActionError("Invalid row or column")
+        if rows < 1 or columns < 1 or row + rows > screen.rows or column + columns > screen.columns:
+            raise ActionError("Invalid number of rows or columns")
+
+    def _ascii(self, *args):
+        screen = self.screen
+        numbers = [int(arg) for arg in args]
+        if len(numbers) == 0:
+            return screen.ascii_rows(0, 0, screen.rows, screen.columns)
+        if len(numbers) == 1:
+            return self._ascii_length(screen.cursor, numbers[0])
+        if len(numbers) == 3:
+            row, column, length = numbers
+            self._check_rectangle(row, column, 1, 1)
+            return self._ascii_length(row * screen.columns + column, length)
+        if len(numbers) == 4:
+            self._check_rectangle(*numbers)
+            return screen.ascii_rows(*numbers)
+        raise ActionError("Ascii: wrong number of arguments")
+
+    def _ascii_length(self, address, length):
+        if length < 1 or address + length > self.screen.size:
+            raise ActionError("Invalid length")
+        return self.screen.ascii_text(address, length)
+
+    def _read_buffer(self, mode="Ascii"):
+        if mode.lower() not in ("ascii", "ebcdic", "unicode"):
+            raise ActionError(f"ReadBuffer: unknown mode '{mode}'")
+        return self.screen.buffer_tokens(ebcdic=mode.lower() == "ebcdic")
+
+    def _print_text(self, *args):
+        if "file" not in [arg.lower() for arg in args[:-1]]:
+            raise ActionError("PrintText: only printing to a file is supported")
+        screen = self.screen
+        rows = screen.ascii_rows(0, 0, screen.rows, screen.columns)
+        if "html" in [arg.lower() for arg in args[:-1]]:
+            content = _HTML_TEMPLATE.format(title=html.escape(self.host or ""), screen=html.escape("\n".join(rows)))
+        else:
+            content = "\n".join(rows) + "\n"
+        with open(args[-1], "w", encoding="utf-8") as file:
+            file.write(content)
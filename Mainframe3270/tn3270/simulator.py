@@ -0,0 +1,660 @@
+"""
+A local TN3270 host that serves screens defined in files, to run tests and benchmarks without a mainframe.
+
+A screens file contains one or more screens. Each screen starts with a line ``=== <name>``, which is followed
+by the rows of the screen and optionally by a line ``---`` and the rules of the screen::
+
+    === logon
+    WELCOME TO THE SIMULATOR
+    USER     ===> [user    ]
+    PASSWORD ===> [*password]
+    ---
+    on ENTER when user=ALICE goto menu
+    on PF3 disconnect
+
+    === menu
+    HELLO {user}, WHAT DO YOU WANT TO DO?
+    ---
+    on PF3 goto logon
+
+In the rows, ``[`` starts an input field and ``]`` ends it, both take up a position like the field attributes
+on a real screen. The text between the brackets names the field and its length is the length of the field,
+a ``*`` before the name makes it a non-display field. All other text is protected. ``{name}`` is replaced with
+the last value that was entered into the field `name`, format specs like ``{name:>8}`` are supported and
+literal braces are written as ``{{`` and ``}}``. Rows and columns that do not fit on the terminal are cut off.
+
+The rules are:
+
+- ``cursor <field>`` or ``cursor <row> <column>`` places the cursor, by default it is in the first input field.
+- ``on <AID> [when <field>=<value> ...] goto <screen>`` shows another screen when the AID key is pressed and
+  the stripped values of all fields match. AIDs are ENTER, CLEAR, PA1 to PA3 and PF1 to PF24.
+- ``on <AID> [when <field>=<value> ...] disconnect`` closes the connection.
+
+The rules are checked in their order and if none applies, the current screen is shown again. Lines starting
+with ``#`` are comments in the rules. The first screen of the first file is shown after connecting.
+
+The simulator can be started from Python with `HostSimulator`, or from the command line with
+``python -m Mainframe3270.tn3270.simulator [options] FILE...``.
+"""
+
+import argparse
+import itertools
+import logging
+import random
+import re
+import socketserver
+import threading
+import time
+from collections import deque
+from Mainframe3270.py3270 import Emulator
+from Mainframe3270.tn3270.datastream import (
+    AID_CLEAR,
+    AID_ENTER,
+    AID_PA,
+    AID_PF,
+    ATTR_NONDISPLAY,
+    ATTR_PROTECTED,
+    CMD_EWA,
+    ORDER_IC,
+    ORDER_SBA,
+    ORDER_SF,
+    WCC_KEYBOARD_RESTORE,
+    WCC_RESET_MDT,
+    decode_address,
+    encode_address,
+    encode_attribute,
+)
+from Mainframe3270.tn3270.telnet import (
+    DO,
+    DONT,
+    EOR,
+    IAC,
+    OPT_BINARY,
+    OPT_EOR,
+    OPT_TN3270E,
+    OPT_TTYPE,
+    SB,
+    SE,
+    TN3270E_3270_DATA,
+    TN3270E_CONNECT,
+    TN3270E_DEVICE_TYPE,
+    TN3270E_FUNCTIONS,
+    TN3270E_HEADER_LENGTH,
+    TN3270E_IS,
+    TN3270E_REQUEST,
+    TN3270E_SEND,
+    TTYPE_IS,
+    TTYPE_SEND,
+    WILL,
+    WONT,
+)
+
+log = logging.getLogger(__name__)
+
+AIDS = {"ENTER": AID_ENTER, "CLEAR": AID_CLEAR}
+AIDS.update((f"PA{number}", aid) for number, aid in enumerate(AID_PA, 1))
+AIDS.update((f"PF{number}", aid) for number, aid in enumerate(AID_PF, 1))
+_KEYBOARD_AIDS = frozenset(AIDS.values())
+
+_FIELD_REGEX = re.compile(r"\[(\*?)([^\[\]]*)\]")
+_MODEL_REGEX = re.compile(r"^IBM-327[89]-(\d)")
+_CODEC = "cp037"
+
+
+class _Values(dict):
+    """The values entered into fields, where fields that were never entered into are empty."""
+
+    def __missing__(self, key):
+        return ""
+
+
+class Rule(object):
+    """
+    What the host does when an AID key is pressed, either show the screen `goto` or disconnect if it is None.
+    """
+
+    def __init__(self, aid, conditions=(), goto=None):
+        self.aid = aid
+        self.conditions = tuple(conditions)
+        self.goto = goto
+
+    def matches(self, aid, values):
+        return aid == self.aid and all(values[name].strip() == value for name, value in self.conditions)
+
+
+class ScreenDefinition(object):
+    """
+    A screen of the simulator, see the module documentation for the format it is defined in.
+    """
+
+    def __init__(self, name, rows, cursor=None, rules=()):
+        """
+        `rows` are the rows of the screen, each a list of protected texts and `(name, length, nondisplay)`
+        tuples for input fields. `cursor` is either the name of a field or a 1-based `(row, column)` tuple.
+        """
+        self.name = name
+        self.rows = rows
+        self.cursor = cursor
+        self.rules = list(rules)
+
+    def render(self, values, rows, columns):
+        """
+        Return an Erase/Write Alternate record of this screen for a terminal of `rows` x `columns`
+        and the names of its input fields by the buffer address they start at.
+        """
+        size = rows * columns
+        # a protected attribute in the last position protects the text before the first field
+        record = bytearray([CMD_EWA[0], encode_attribute(WCC_KEYBOARD_RESTORE | WCC_RESET_MDT)])
+        record += _set_buffer_address(size - 1, size) + _start_field(ATTR_PROTECTED)
+        fields = {}
+        for row, parts in enumerate(self.rows[:rows]):
+            column = 0
+            for part in parts:
+                if column >= columns:
+                    break
+                if isinstance(part, str):
+                    text = part.format_map(values)[: columns - column]
+                    if text:
+                        record += _set_buffer_address(row * columns + column, size)
+                        record += text.encode(_CODEC, errors="replace")
+                    column += len(text)
+                    continue
+                name, length, nondisplay = part
+                length = min(length, columns - column - 2)
+                if length <= 0:
+                    break
+                address = row * columns + column
+                record += _set_buffer_address(address, size) + _start_field(ATTR_NONDISPLAY if nondisplay else 0)
+                record += _set_buffer_address(address + length + 1, size) + _start_field(ATTR_PROTECTED)
+                fields[address + 1] = name
+                column += length + 2
+        record += _set_buffer_address(self._cursor_address(fields, columns, size), size) + bytes([ORDER_IC])
+        return bytes(record), fields
+
+    def _cursor_address(self, fields, columns, size):
+        if isinstance(self.cursor, tuple):
+            row, column = self.cursor
+            return min((row - 1) * columns + column - 1, size - 1)
+        for address, name in fields.items():
+            if self.cursor is None or name == self.cursor:
+                return address
+        return 0
+
+    def next_screen(self, aid, values):
+        """
+        Return the name of the screen the rules lead to, the name of this screen if no rule applies,
+        or None to disconnect.
+        """
+        for rule in self.rules:
+            if rule.matches(aid, values):
+                return rule.goto
+        return self.name
+
+
+def _set_buffer_address(address, size):
+    return bytes([ORDER_SBA]) + encode_address(address, size)
+
+
+def _start_field(attribute):
+    return bytes([ORDER_SF, encode_attribute(attribute)])
+
+
+def read_input(record, fields):
+    """
+    Return the AID of an inbound record and store the values of the modified `fields` in a dict.
+    Fields that were not modified are empty, because every screen is sent with reset modified data tags.
+    """
+    values = dict.fromkeys(fields.values(), "")
+    name = None
+    index = 3
+    while index < len(record):
+        if record[index] == ORDER_SBA and index + 2 < len(record):
+            name = fields.get(decode_address(record[index + 1], record[index + 2]))
+            index += 3
+            continue
+        end = record.find(bytes([ORDER_SBA]), index)
+        end = len(record) if end == -1 else end
+        if name is not None:
+            values[name] = record[index:end].replace(b"\x00", b"").decode(_CODEC)
+        index = end
+    return record[0], values
+
+
+def parse_screens(text, source="<string>"):
+    """
+    Parse the screens in `text` and return them by their name. `source` is used in error messages.
+    """
+    screens = {}
+    screen = None
+    in_rules = False
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.rstrip("\r")
+        try:
+            if line.startswith("==="):
+                name = line[3:].strip()
+                if not name or name in screens:
+                    raise ValueError(f"the screen name '{name}' is empty or not unique")
+                screen = screens[name] = ScreenDefinition(name, [])
+                in_rules = False
+            elif screen is None:
+                if line.strip():
+                    raise ValueError("expected a line '=== <name>' that starts a screen")
+            elif line.strip() == "---" and not in_rules:
+                in_rules = True
+            elif in_rules:
+                _parse_rule(screen, line)
+            else:
+                screen.rows.append(_parse_row(line))
+        except ValueError as error:
+            raise ValueError(f"{source}, line {number}: {error}") from None
+    for screen in screens.values():
+        # blank lines between the rows and the next screen do not belong to the screen
+        while screen.rows and not any(screen.rows[-1]):
+            screen.rows.pop()
+    return screens
+
+
+def _parse_row(line):
+    parts = []
+    position = 0
+    for match in _FIELD_REGEX.finditer(line):
+        parts.append(line[position : match.start()])
+        nondisplay, name = match.group(1), match.group(2).strip()
+        if not name:
+            raise ValueError("input fields need a name")
+        parts.append((name, len(match.group(0)) - 2, bool(nondisplay)))
+        position = match.end()
+    parts.append(line[position:].rstrip())
+    for part in parts:
+        if isinstance(part, str):
+            if "[" in part or "]" in part:
+                raise ValueError("unbalanced brackets of an input field")
+            try:
+                part.format_map(_Values())
+            except (IndexError, KeyError, ValueError) as error:
+                raise ValueError(f"invalid placeholder: {error}")
+    return [part for part in parts if part != ""]
+
+
+def _parse_rule(screen, line):
+    words = line.split()
+    if not words or words[0].startswith("#"):
+        return
+    if words[0] == "cursor" and len(words) == 2:
+        screen.cursor = words[1]
+    elif words[0] == "cursor" and len(words) == 3 and all(word.isdigit() and int(word) > 0 for word in words[1:]):
+        screen.cursor = (int(words[1]), int(words[2]))
+    elif words[0] == "on" and len(words) >= 3:
+        aid = AIDS.get(words[1].upper())
+        if aid is None:
+            raise ValueError(f"unknown AID '{words[1]}', expected one of {', '.join(AIDS)}")
+        conditions = []
+        words = words[2:]
+        while len(words) >= 2 and words[0] == "when":
+            name, equals, value = words[1].partition("=")
+            if not equals:
+                raise ValueError(f"expected a condition '<field>=<value>', but got '{words[1]}'")
+            conditions.append((name, value))
+            words = words[2:]
+        if words == ["disconnect"]:
+            screen.rules.append(Rule(aid, conditions))
+        elif len(words) == 2 and words[0] == "goto":
+            screen.rules.append(Rule(aid, conditions, words[1]))
+        else:
+            raise ValueError(f"expected 'goto <screen>' or 'disconnect', but got '{' '.join(words)}'")
+    else:
+        raise ValueError(f"invalid rule '{line.strip()}'")
+
+
+def load_screens(*paths):
+    """
+    Load the screens from the screens files in `paths` and return them by their name.
+    """
+    screens = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as file:
+            for name, screen in parse_screens(file.read(), str(path)).items():
+                if name in screens:
+                    raise ValueError(f"{path}: the screen '{name}' is already defined")
+                screens[name] = screen
+    return screens
+
+
+class HostConnection(object):
+    """
+    The host side of a TN3270 or TN3270E connection.
+    """
+
+    _ACCEPTED_OPTIONS = (OPT_BINARY, OPT_EOR)
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.terminal_type = None
+        self.lu = None
+        self.tn3270e = False
+        self._data = b""
+        self._index = 0
+        self._record = bytearray()
+        self._local_options = set()
+        self._remote_options = set()
+        self._refused_options = set()
+        self._requested = set()
+        self._records = deque()
+        self._subnegotiations = deque()
+
+    @property
+    def screen_size(self):
+        """The alternate screen size of the terminal model, as rows and columns."""
+        match = _MODEL_REGEX.match(self.terminal_type or "")
+        try:
+            dimensions = Emulator._set_model_dimensions(match.group(1))
+        except (AttributeError, ValueError):
+            return 24, 80
+        return dimensions["rows"], dimensions["columns"]
+
+    def negotiate(self, lu):
+        """
+        Negotiate TN3270E, or TN3270 if the terminal refuses it, and assign the LU `lu`
+        unless the terminal asks for a specific one.
+        """
+        self._request(DO, OPT_TN3270E)
+        self._process_until(lambda: OPT_TN3270E in self._remote_options | self._refused_options)
+        if OPT_TN3270E in self._remote_options:
+            self._negotiate_tn3270e(lu)
+            return
+        self._request(DO, OPT_TTYPE)
+        self._process_until(lambda: OPT_TTYPE in self._remote_options | self._refused_options)
+        if OPT_TTYPE in self._refused_options:
+            raise ConnectionError("The terminal refused to send its terminal type")
+        self._send_subnegotiation(OPT_TTYPE, bytes([TTYPE_SEND]))
+        data = self._subnegotiation(OPT_TTYPE, bytes([TTYPE_IS]))
+        # RFC 1646, the terminal may ask for an LU after the terminal type
+        terminal_type, _, requested_lu = data[1:].decode("ascii", errors="replace").partition("@")
+        self.terminal_type, self.lu = terminal_type, requested_lu or lu
+        for option in self._ACCEPTED_OPTIONS:
+            self._request(DO, option)
+            self._request(WILL, option)
+        self._process_until(
+            lambda: all(
+                option in self._local_options and option in self._remote_options for option in self._ACCEPTED_OPTIONS
+            )
+        )
+
+    def _negotiate_tn3270e(self, lu):
+        self._send_subnegotiation(OPT_TN3270E, bytes([TN3270E_SEND, TN3270E_DEVICE_TYPE]))
+        data = self._subnegotiation(OPT_TN3270E, bytes([TN3270E_DEVICE_TYPE, TN3270E_REQUEST]))
+        device_type, _, requested_lu = data[2:].partition(bytes([TN3270E_CONNECT]))
+        self.terminal_type = device_type.decode("ascii", errors="replace")
+        self.lu = requested_lu.decode("ascii", errors="replace") or lu
+        reply = bytes([TN3270E_DEVICE_TYPE, TN3270E_IS]) + device_type
+        self._send_subnegotiation(OPT_TN3270E, reply + bytes([TN3270E_CONNECT]) + self.lu.encode("ascii"))
+        self._subnegotiation(OPT_TN3270E, bytes([TN3270E_FUNCTIONS, TN3270E_REQUEST]))
+        # none of the TN3270E functions, like responses or BIND images, are supported
+        self._send_subnegotiation(OPT_TN3270E, bytes([TN3270E_FUNCTIONS, TN3270E_IS]))
+        self.tn3270e = True
+
+    def send_record(self, record):
+        if self.tn3270e:
+            record = bytes([TN3270E_3270_DATA, 0, 0, 0, 0]) + record
+        self.sock.sendall(record.replace(b"\xff", b"\xff\xff") + bytes([IAC, EOR]))
+
+    def read_record(self):
+        """
+        Return the next 3270 data stream record of the terminal.
+        """
+        while True:
+            self._process_until(lambda: self._records)
+            record = self._records.popleft()
+            if not self.tn3270e:
+                return record
+            if record[:1] == bytes([TN3270E_3270_DATA]):
+                return record[TN3270E_HEADER_LENGTH:]
+
+    def _request(self, command, option):
+        self._requested.add((command, option))
+        self._send(bytes([IAC, command, option]))
+
+    def _send(self, data):
+        self.sock.sendall(data)
+
+    def _send_subnegotiation(self, option, data):
+        self._send(bytes([IAC, SB, option]) + data.replace(b"\xff", b"\xff\xff") + bytes([IAC, SE]))
+
+    def _subnegotiation(self, option, prefix):
+        """
+        Return the next sub-negotiation of `option`, without the option, that starts with `prefix`.
+        """
+        self._process_until(lambda: self._subnegotiations)
+        received_option, data = self._subnegotiations.popleft()
+        if received_option != option or not data.startswith(prefix):
+            raise ConnectionError(f"Unexpected sub-negotiation of the option {received_option}: {data!r}")
+        return data
+
+    def _read_byte(self):
+        if self._index >= len(self._data):
+            self._data, self._index = self.sock.recv(4096), 0
+            if not self._data:
+                raise EOFError("The terminal closed the connection")
+        self._index += 1
+        return self._data[self._index - 1]
+
+    def _process_until(self, condition):
+        while not condition():
+            byte = self._read_byte()
+            if byte != IAC:
+                self._record.append(byte)
+                continue
+            command = self._read_byte()
+            if command == IAC:
+                self._record.append(IAC)
+            elif command == EOR:
+                self._records.append(bytes(self._record))
+                self._record.clear()
+            elif command == SB:
+                self._read_subnegotiation()
+            elif command in (DO, DONT, WILL, WONT):
+                self._handle_option(command, self._read_byte())
+
+    def _read_subnegotiation(self):
+        data = bytearray()
+        while True:
+            byte = self._read_byte()
+            if byte == IAC:
+                byte = self._read_byte()
+                if byte == SE:
+                    break
+            data.append(byte)
+        if data:
+            self._subnegotiations.append((data[0], bytes(data[1:])))
+
+    def _handle_option(self, command, option):
+        # options that were requested by the host are not acknowledged again, see RFC 1143
+        if command in (WILL, WONT):
+            requested = (DO, option) in self._requested
+            self._requested.discard((DO, option))
+            if command == WILL and option not in self._remote_options:
+                if requested or option in self._ACCEPTED_OPTIONS:
+                    self._remote_options.add(option)
+                    if not requested:
+                        self._send(bytes([IAC, DO, option]))
+                else:
+                    self._send(bytes([IAC, DONT, option]))
+            elif command == WONT:
+                self._refused_options.add(option)
+                if option in self._remote_options:
+                    self._remote_options.discard(option)
+                    if not requested:
+                        self._send(bytes([IAC, DONT, option]))
+        else:
+            requested = (WILL, option) in self._requested
+            self._requested.discard((WILL, option))
+            if command == DO and option not in self._local_options:
+                if requested or option in self._ACCEPTED_OPTIONS:
+                    self._local_options.add(option)
+                    if not requested:
+                        self._send(bytes([IAC, WILL, option]))
+                else:
+                    self._send(bytes([IAC, WONT, option]))
+            elif command == DONT and option in self._local_options:
+                self._local_options.discard(option)
+                if not requested:
+                    self._send(bytes([IAC, WONT, option]))
+
+
+class _SessionHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        simulator = self.server.simulator
+        connection = HostConnection(self.request)
+        simulator._connections.add(self.request)
+        try:
+            connection.negotiate(simulator.next_lu())
+            simulator._serve(connection)
+        except (ConnectionError, EOFError, OSError) as error:
+            log.debug("the session with %s ended: %s", self.client_address, error)
+        finally:
+            simulator._connections.discard(self.request)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+    block_on_close = False
+
+
+class HostSimulator(object):
+    """
+    A TN3270 host that serves `screens` to any number of terminals, each of them with its own field values.
+
+    Every screen is sent after `latency` seconds, which vary randomly by up to `jitter` seconds in either
+    direction. Pass a `seed` to make that variation reproducible.
+
+    Example:
+    | with HostSimulator.from_files("screens.txt", latency=0.05) as simulator:
+    |     emulator.connect(f"127.0.0.1:{simulator.port}")
+    """
+
+    def __init__(self, screens, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, seed=None):
+        if not screens:
+            raise ValueError("At least one screen is needed")
+        for screen in screens.values():
+            for rule in screen.rules:
+                if rule.goto is not None and rule.goto not in screens:
+                    raise ValueError(f"The screen '{screen.name}' goes to the unknown screen '{rule.goto}'")
+        if latency < 0 or jitter < 0:
+            raise ValueError("The latency and the jitter cannot be negative")
+        self.screens = screens
+        self.start_screen = next(iter(screens))
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lu_numbers = itertools.count(1)
+        self._connections = set()
+        self._thread = None
+        self._server = _Server((host, port), _SessionHandler)
+        self._server.simulator = self
+
+    @classmethod
+    def from_files(cls, *paths, **kwargs):
+        """
+        Create a simulator of the screens in the screens files `paths`, see `load_screens`.
+        """
+        return cls(load_screens(*paths), **kwargs)
+
+    @property
+    def host(self):
+        return self._server.server_address[0]
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def next_lu(self):
+        return f"SIM{next(self._lu_numbers):05d}"
+
+    def start(self):
+        """
+        Serve the screens on a background thread until `stop` is called.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, name="tn3270-simulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        """
+        Stop serving and close all connections.
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        for sock in list(self._connections):
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def delay(self):
+        """
+        Wait for the latency of a response.
+        """
+        delay = self.latency + (self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _serve(self, connection):
+        rows, columns = connection.screen_size
+        values = _Values()
+        name = self.start_screen
+        while name is not None:
+            screen = self.screens[name]
+            record, fields = screen.render(values, rows, columns)
+            self.delay()
+            connection.send_record(record)
+            record = connection.read_record()
+            # replies to queries and other structured fields do not come from the keyboard
+            while not record or record[0] not in _KEYBOARD_AIDS:
+                record = connection.read_record()
+            aid, entered = read_input(record, fields)
+            values.update(entered)
+            name = screen.next_screen(aid, values)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m Mainframe3270.tn3270.simulator",
+        description="Serve the screens of screens files like a TN3270 host.",
+    )
+    parser.add_argument("files", nargs="+", metavar="FILE", help="screens file, the first screen is shown first")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=3270, help="port to listen on (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each screen (default: 0)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random variation of the latency (default: 0)")
+    parser.add_argument("--seed", type=int, help="seed of the random variation")
+    args = parser.parse_args(argv)
+    try:
+        simulator = HostSimulator.from_files(
+            *args.files, host=args.host, port=args.port, latency=args.latency, jitter=args.jitter, seed=args.seed
+        )
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    print(f"Serving {len(simulator.screens)} screens on {simulator.host}:{simulator.port}")
+    try:
+        simulator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
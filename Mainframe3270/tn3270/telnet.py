@@ -0,0 +1,248 @@
+import logging
+import socket
+import ssl
+import threading
+
+log = logging.getLogger(__name__)
+
+IAC = 255
+DONT = 254
+DO = 253
+WONT = 252
+WILL = 251
+SB = 250
+SE = 240
+EOR = 239
+
+OPT_BINARY = 0
+OPT_SGA = 3
+OPT_TTYPE = 24
+OPT_EOR = 25
+OPT_TN3270E = 40
+
+TTYPE_IS = 0
+TTYPE_SEND = 1
+
+# TN3270E sub-negotiation, see RFC 2355
+TN3270E_CONNECT = 1
+TN3270E_DEVICE_TYPE = 2
+TN3270E_FUNCTIONS = 3
+TN3270E_IS = 4
+TN3270E_REJECT = 6
+TN3270E_REQUEST = 7
+TN3270E_SEND = 8
+TN3270E_3270_DATA = 0
+TN3270E_HEADER_LENGTH = 5
+
+# the options a 3270 session is negotiated with, in both directions
+_TN3270_OPTIONS = (OPT_BINARY, OPT_EOR)
+
+
+class TelnetConnection(object):
+    """
+    A TN3270 (RFC 1576) or TN3270E (RFC 2355) client connection.
+
+    The telnet negotiation is answered on a background thread, which also passes every
+    3270 data stream record received from the host to `on_record`. `on_state_change` is
+    called without arguments when the connection enters 3270 mode or is closed.
+    """
+
+    def __init__(self, terminal_type, on_record, on_state_change, lu=None, tn3270e=True):
+        """
+        `terminal_type` is the terminal type without the IBM- prefix, e.g. 3279-2-E.
+        `lu` is the name of the logical unit to connect to, if any.
+        `tn3270e` controls whether TN3270E is accepted when the host offers it.
+        """
+        self.terminal_type = terminal_type
+        self.on_record = on_record
+        self.on_state_change = on_state_change
+        self.lu = lu
+        self.tn3270e_allowed = tn3270e
+        self.tn3270e = False
+        self.connected = False
+        self.error = None
+        self.sock = None
+        self._local_options = set()
+        self._remote_options = set()
+        self._send_lock = threading.Lock()
+        self._reader = None
+
+    @property
+    def in_3270_mode(self):
+        if self.tn3270e:
+            return True
+        return all(option in self._local_options and option in self._remote_options for option in _TN3270_OPTIONS)
+
+    def open(self, host, port, timeout=None, tls=False):
+        """
+        Open the connection and start answering the host on a background thread.
+        """
+        sock = socket.create_connection((host, port), timeout)
+        if tls:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+        sock.settimeout(None)
+        self.sock = sock
+        self.connected = True
+        self._reader = threading.Thread(target=self._read_loop, name=f"tn3270-{host}:{port}", daemon=True)
+        self._reader.start()
+
+    def close(self):
+        sock, self.sock = self.sock, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                # the host may have closed the connection already
+                pass
+            sock.close()
+
+    def send_record(self, data):
+        """
+        Send a 3270 data stream record to the host.
+        """
+        if self.tn3270e:
+            data = bytes([TN3270E_3270_DATA, 0, 0, 0, 0]) + data
+        self._send(data.replace(b"\xff", b"\xff\xff") + bytes([IAC, EOR]))
+
+    def _send(self, data):
+        with self._send_lock:
+            if self.sock is None:
+                raise BrokenPipeError("The connection to the host is closed")
+            self.sock.sendall(data)
+
+    def _send_command(self, command, option):
+        self._send(bytes([IAC, command, option]))
+
+    def _send_subnegotiation(self, option, data):
+        self._send(bytes([IAC, SB, option]) + data.replace(b"\xff", b"\xff\xff") + bytes([IAC, SE]))
+
+    def _read_loop(self):
+        try:
+            self._parse()
+        except Exception as error:
+            if self.sock is not None:
+                self.error = error
+                log.debug("reading from the host failed: %s", error)
+        finally:
+            self.connected = False
+            self.close()
+            self.on_state_change()
+
+    def _receive(self):
+        sock = self.sock
+        data = sock.recv(4096) if sock is not None else b""
+        if not data:
+            raise EOFError("The host closed the connection")
+        return data
+
+    def _parse(self):
+        record = bytearray()
+        subnegotiation = None
+        data = b""
+        index = 0
+
+        def next_byte():
+            nonlocal data, index
+            if index >= len(data):
+                data, index = self._receive(), 0
+            index += 1
+            return data[index - 1]
+
+        while True:
+            byte = next_byte()
+            if byte != IAC:
+                if subnegotiation is not None:
+                    subnegotiation.append(byte)
+                else:
+                    record.append(byte)
+                continue
+            command = next_byte()
+            if command == IAC:
+                (record if subnegotiation is None else subnegotiation).append(IAC)
+            elif command == EOR:
+                self._handle_record(bytes(record))
+                record.clear()
+            elif command == SB:
+                subnegotiation = bytearray()
+            elif command == SE:
+                if subnegotiation:
+                    self._handle_subnegotiation(subnegotiation[0], bytes(subnegotiation[1:]))
+                subnegotiation = None
+            elif command in (DO, DONT, WILL, WONT):
+                self._handle_option(command, next_byte())
+
+    def _handle_record(self, record):
+        if self.tn3270e:
+            header, record = record[:TN3270E_HEADER_LENGTH], record[TN3270E_HEADER_LENGTH:]
+            if not header or header[0] != TN3270E_3270_DATA:
+                # SSCP-LU data, NVT data or responses are not supported
+                return
+        if record:
+            self.on_record(record)
+
+    def _handle_option(self, command, option):
+        was_3270_mode = self.in_3270_mode
+        if command == DO:
+            if option in (OPT_BINARY, OPT_EOR, OPT_TTYPE) or (option == OPT_TN3270E and self.tn3270e_allowed):
+                if option not in self._local_options:
+                    self._local_options.add(option)
+                    self._send_command(WILL, option)
+            else:
+                self._send_command(WONT, option)
+        elif command == DONT:
+            if option in self._local_options:
+                self._local_options.discard(option)
+                self._send_command(WONT, option)
+            if option == OPT_TN3270E:
+                self.tn3270e = False
+        elif command == WILL:
+            if option in (OPT_BINARY, OPT_EOR, OPT_SGA):
+                if option not in self._remote_options:
+                    self._remote_options.add(option)
+                    self._send_command(DO, option)
+            else:
+                self._send_command(DONT, option)
+        elif command == WONT:
+            if option in self._remote_options:
+                self._remote_options.discard(option)
+                self._send_command(DONT, option)
+        if self.in_3270_mode != was_3270_mode:
+            self.on_state_change()
+
+    @property
+    def _device_type(self):
+        return b"IBM-" + self.terminal_type.encode("ascii")
+
+    def _handle_subnegotiation(self, option, data):
+        if option == OPT_TTYPE and data[:1] == bytes([TTYPE_SEND]):
+            terminal_type = self._device_type
+            if self.lu:
+                # RFC 1646, the LU is appended to the terminal type
+                terminal_type += b"@" + self.lu.encode("ascii")
+            self._send_subnegotiation(OPT_TTYPE, bytes([TTYPE_IS]) + terminal_type)
+        elif option == OPT_TN3270E:
+            self._handle_tn3270e(data)
+
+    def _handle_tn3270e(self, data):
+        if data[:2] == bytes([TN3270E_SEND, TN3270E_DEVICE_TYPE]):
+            request = bytes([TN3270E_DEVICE_TYPE, TN3270E_REQUEST]) + self._device_type
+            if self.lu:
+                request += bytes([TN3270E_CONNECT]) + self.lu.encode("ascii")
+            self._send_subnegotiation(OPT_TN3270E, request)
+        elif data[:2] == bytes([TN3270E_DEVICE_TYPE, TN3270E_IS]):
+            # the device type may be followed by the name of the LU the host assigned
+            _, _, lu = data[2:].partition(bytes([TN3270E_CONNECT]))
+            if lu:
+                self.lu = lu.decode("ascii", errors="replace")
+            # no TN3270E functions, like responses or BIND images, are supported
+            self._send_subnegotiation(OPT_TN3270E, bytes([TN3270E_FUNCTIONS, TN3270E_REQUEST]))
+        elif data[:2] == bytes([TN3270E_DEVICE_TYPE, TN3270E_REJECT]):
+            log.debug("the host rejected the device type, falling back to TN3270")
+            self._local_options.discard(OPT_TN3270E)
+            self._send_command(WONT, OPT_TN3270E)
+        elif data[:1] == bytes([TN3270E_FUNCTIONS]):
+            if data[1:2] == bytes([TN3270E_REQUEST]):
+                # the host asks for functions, but agreeing on none of them ends the negotiation
+                self._send_subnegotiation(OPT_TN3270E, bytes([TN3270E_FUNCTIONS, TN3270E_IS]))
+            self.tn3270e = True
+            self.on_state_change()
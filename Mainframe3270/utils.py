@@ -1,8 +1,13 @@
+import re
 from datetime import timedelta
 from enum import Enum, auto
-from typing import List, Tuple
+from functools import lru_cache
+from typing import List, Pattern, Tuple
 from robot.api import logger
-from robot.utils import timestr_to_secs
+from robot.utils import Matcher, timestr_to_secs
+
+# the same patterns are usually asserted over and over again, on every connection
+PATTERN_CACHE_SIZE = 512
 
 
 class ResultMode(Enum):
@@ -10,6 +15,17 @@ class ResultMode(Enum):
     As_Dict = auto()
 
 
+class WaitStrategy(Enum):
+    Fixed = auto()
+    Output = auto()
+    Unlock = auto()
+
+
+class Engine(Enum):
+    Executable = auto()
+    Native = auto()
+
+
 def prepare_position_as(position: Tuple[int, int], mode: ResultMode):
     return prepare_positions_as([position], mode)[0]
 
@@ -35,3 +51,13 @@ def convert_timeout(time):
 
 def coordinates_to_dict(ypos: int, xpos: int):
     return {"ypos": ypos, "xpos": xpos}
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_regex(pattern: str, flags: int = 0) -> Pattern:
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def get_matcher(pattern: str, caseless: bool = False, spaceless: bool = False) -> Matcher:
+    return Matcher(pattern, caseless=caseless, spaceless=spaceless)
@@ -0,0 +1,19 @@
+from Mainframe3270.tn3270.simulator import HostSimulator
+
+
+class SimulatorLibrary:
+    ROBOT_LIBRARY_SCOPE = "SUITE"
+
+    def __init__(self):
+        self.simulator = None
+
+    def start_host_simulator(self, *screens_files, latency=0.0, jitter=0.0):
+        """Starts a local TN3270 host that serves the screens files and returns its port."""
+        self.simulator = HostSimulator.from_files(*screens_files, latency=float(latency), jitter=float(jitter))
+        self.simulator.start()
+        return self.simulator.port
+
+    def stop_host_simulator(self):
+        if self.simulator is not None:
+            self.simulator.stop()
+            self.simulator = None
@@ -0,0 +1,105 @@
+"""A fake s3270 for host-free benchmarks of the library and its emulator communication.
+
+It speaks the s3270 script protocol on stdin and stdout, but answers every AID key from the screens of a screens
+file of Mainframe3270.tn3270.simulator instead of a host, optionally after some latency. Connect accepts any host.
+Run it from the root of the repository through an ``executable`` override, e.g. ``Emulator(executable=COMMAND)``.
+"""
+
+import argparse
+import functools
+import os
+import sys
+import threading
+from Mainframe3270.tn3270 import NativeApp
+from Mainframe3270.tn3270.simulator import load_screens, read_input
+
+COMMAND = [sys.executable, "-m", "benchmarks.fake_s3270"]
+DEFAULT_SCREENS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "benchmark.screens")
+
+
+class LoopbackConnection(object):
+    """Takes the place of the TelnetConnection of a NativeApp and answers with the screens of a screens file."""
+
+    in_3270_mode = True
+
+    def __init__(self, screens, size, latency, terminal_type, on_record, on_state_change, lu=None, tn3270e=True):
+        self.screens = screens
+        self.rows, self.columns = size
+        self.latency = latency
+        self.on_record = on_record
+        self.on_state_change = on_state_change
+        self.lu = lu or "FAKE0001"
+        self.connected = False
+        self.error = None
+        self._values = {}
+        self._screen = None
+        self._fields = {}
+
+    def open(self, host, port, timeout=None, tls=False):
+        self.connected = True
+        self._show(next(iter(self.screens)))
+
+    def close(self):
+        if self.connected:
+            self.connected = False
+            self.on_state_change()
+
+    def send_record(self, record):
+        aid, entered = read_input(record, self._fields)
+        self._values.update(entered)
+        name = self._screen.next_screen(aid, self._values)
+        if name is None:
+            self.close()
+        else:
+            self._show(name)
+
+    def _show(self, name):
+        self._screen = self.screens[name]
+        record, self._fields = self._screen.render(self._values, self.rows, self.columns)
+        # the screen arrives asynchronously like from a host, so that the keyboard is locked in between
+        threading.Timer(self.latency, self._receive, (record,)).start()
+
+    def _receive(self, record):
+        if self.connected:
+            self.on_record(record)
+
+
+def _native_args(args):
+    """Keep the model of the s3270 arguments and drop the resources that only apply to s3270."""
+    native_args = []
+    args = iter(args)
+    for arg in args:
+        if arg == "-xrm":
+            resource = next(args)
+            if resource.partition(":")[0].strip().lstrip("*").rsplit(".", 1)[-1] == "model":
+                native_args += [arg, resource]
+        else:
+            native_args.append(arg)
+    return native_args
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="A fake s3270 that answers from the screens of a screens file.")
+    parser.add_argument("--screens", default=DEFAULT_SCREENS, help="screens file (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each screen (default: 0)")
+    args, emulator_args = parser.parse_known_args(argv)
+    app = NativeApp(_native_args(emulator_args))
+    app.connection_class = functools.partial(
+        LoopbackConnection, load_screens(args.screens), app.screen.alternate_size, args.latency
+    )
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+    for command in stdin:
+        if not command.strip():
+            continue
+        app.write(command)
+        line = None
+        while line not in (b"ok\n", b"error\n", b""):
+            line = app.readline()
+            stdout.write(line)
+        stdout.flush()
+        if command.strip().lower() == b"quit":
+            break
+
+
+if __name__ == "__main__":
+    main()
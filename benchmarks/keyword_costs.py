@@ -0,0 +1,281 @@
+"""Measures what every public keyword costs per terminal model: emulator round trips, wall time and allocations.
+
+The keywords run against the fake s3270 of ``fake_s3270.py``, so no host is needed. Round trips are the writes to
+the emulator and commands are the lines written, both are deterministic. Wall times depend on the machine and are
+only comparable between runs on the same one. Allocations are the peak of the memory allocated by Python while
+the keyword runs.
+
+Run it from the root of the repository, e.g. to compare the current code with the committed baseline::
+
+    python -m benchmarks.keyword_costs --compare benchmarks/keyword_costs.json --output results.json
+
+Comparing fails if a keyword needs more round trips or commands than in the baseline.
+"""
+
+import argparse
+import functools
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+from unittest import mock
+from Mainframe3270 import Mainframe3270
+from Mainframe3270.py3270 import Emulator, s3270App
+from Mainframe3270.utils import WaitStrategy
+from .fake_s3270 import COMMAND
+
+MODELS = ("2", "3", "4", "5")
+OPTION = (21, 18)
+
+SKIPPED = {
+    "Open Concurrent Connections": "runs s3270 through asyncio, which cannot be replaced by the fake s3270",
+    "Execute Command On Concurrent Connections": "needs Open Concurrent Connections",
+    "Read All Screens Of Concurrent Connections": "needs Open Concurrent Connections",
+    "Close Concurrent Connections": "needs Open Concurrent Connections",
+    "Open Connection From Session File": "session files configure s3270 itself, which the fake s3270 ignores",
+    "Create Session Pool": "runs keywords through a running Robot Framework",
+    "Check Out Session": "needs Create Session Pool",
+    "Check In Session": "needs Create Session Pool",
+    "Close Session Pool": "needs Create Session Pool",
+    "Take Screenshot": "needs a browser",
+}
+
+
+class Scenario(object):
+    """A keyword with its arguments, and what is done before and after it without being measured."""
+
+    def __init__(self, keyword, *args, setup=None, teardown=None):
+        self.keyword = keyword
+        self.args = args
+        self.setup = setup
+        self.teardown = teardown
+
+
+def _run(library, keyword, *args):
+    return library.run_keyword(keyword, list(args), {})
+
+
+def _open(library):
+    _run(library, "Open Connection", "127.0.0.1")
+    _run(library, "Wait Field Detected")
+
+
+def _close_all(library):
+    _run(library, "Close All Connections")
+
+
+def _reopen(library):
+    _close_all(library)
+    _open(library)
+
+
+def _wait_field_detected(library):
+    _run(library, "Wait Field Detected")
+
+
+def _fresh_menu(library):
+    """Show the menu with an empty option field and the cursor in it, like after navigating to it."""
+    emulator = library.mf
+    emulator.send_enter()
+    emulator.wait_for_field()
+    if emulator.string_get(1, 27, 29) == "WELCOME TO THE BENCHMARK HOST":
+        emulator.send_string(b"ALICE", 4, 35)
+        emulator.send_enter()
+        emulator.wait_for_field()
+    # the keyword runs as the first one after the screen changed
+    emulator.invalidate_screen()
+
+
+SCENARIOS = [
+    Scenario("Change Timeout", timedelta(seconds=5)),
+    Scenario("Change Wait Strategy", WaitStrategy.Unlock),
+    Scenario("Change Wait Time", timedelta(0)),
+    Scenario("Change Wait Time After Write", timedelta(0)),
+    Scenario("Close All Connections", teardown=_open),
+    Scenario("Close Connection", teardown=_open),
+    Scenario("Delete Char", *OPTION),
+    Scenario("Delete Field", *OPTION),
+    Scenario("Execute Command", "Ignore"),
+    Scenario("Execute Commands", "Ascii(0,0,1,80)", "Ascii(1,0,1,80)"),
+    Scenario("Fill Form", {"SELECTION ===>": "1"}),
+    Scenario("Get Current Position"),
+    Scenario("Get Emulator Error Output"),
+    Scenario("Get Field At", *OPTION),
+    Scenario("Get Fields"),
+    Scenario("Get Input Fields"),
+    Scenario("Get String Positions", "WORK WITH"),
+    Scenario("Get String Positions Only After", 10, 1, "WORK WITH"),
+    Scenario("Get String Positions Only Before", 10, 1, "WORK WITH"),
+    Scenario("Move Cursor To", 1, 1),
+    Scenario("Move Next Field"),
+    Scenario("Move Previous Field"),
+    Scenario("Open Connection", "127.0.0.1", setup=_close_all, teardown=_wait_field_detected),
+    Scenario("Page Should Contain All Strings", ["MAIN MENU", "SIGN OFF"]),
+    Scenario("Page Should Contain Any String", ["NOT ON THE SCREEN", "SIGN OFF"]),
+    Scenario("Page Should Contain Match", "*MAIN MENU*"),
+    Scenario("Page Should Contain String", "SIGN OFF"),
+    Scenario("Page Should Contain String X Times", "WORK WITH", 19),
+    Scenario("Page Should Match Regex", r"WORK WITH \w+"),
+    Scenario("Page Should Not Contain All Strings", ["NOT ON THE SCREEN", "NOR THIS"]),
+    Scenario("Page Should Not Contain Any String", ["NOT ON THE SCREEN", "NOR THIS"]),
+    Scenario("Page Should Not Contain Match", "*NOT ON THE SCREEN*"),
+    Scenario("Page Should Not Contain String", "NOT ON THE SCREEN"),
+    Scenario("Page Should Not Match Regex", r"NOT \d+"),
+    Scenario("Read", 1, 32, 9),
+    Scenario("Read All Screen"),
+    Scenario("Read Fields", [(1, 32, 9), (21, 2, 14)]),
+    Scenario("Read From Current Position", 5),
+    Scenario("Read Region", 5, 1, 10, 80),
+    Scenario("Register Run On Failure Keyword", "None"),
+    Scenario("Send Enter"),
+    Scenario("Send PF", "12"),
+    Scenario("Set Screenshot Folder", "."),
+    Scenario("Switch Connection", 1, setup=_reopen),
+    Scenario("Wait Field Detected"),
+    Scenario("Wait Until String", "MAIN MENU", timedelta(seconds=5)),
+    Scenario("Write", "1"),
+    Scenario("Write Bare", "1"),
+    Scenario("Write Bare In Position", "1", *OPTION),
+    Scenario("Write In Position", "1", *OPTION),
+    Scenario("Write Unicode", "1"),
+    Scenario("Write Unicode Bare", "1"),
+]
+
+
+class RoundTripCounter(object):
+    """Counts the writes to all s3270 emulators, and the commands in them, while it is installed."""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.commands = 0
+
+    def reset(self):
+        self.round_trips = self.commands = 0
+
+    def install(self):
+        write = s3270App.write
+        counter = self
+
+        def counting_write(app, data):
+            counter.round_trips += 1
+            counter.commands += data.count(b"\n")
+            return write(app, data)
+
+        return mock.patch.object(s3270App, "write", counting_write)
+
+
+def measure(library, scenario, counter, repetitions):
+    """Return the round trips, commands, median wall time and peak allocations of a scenario."""
+    times = []
+    counts = None
+    for repetition in range(repetitions + 1):
+        (scenario.setup or _fresh_menu)(library)
+        counter.reset()
+        allocations = repetition == repetitions
+        if allocations:
+            tracemalloc.start()
+        start = time.perf_counter()
+        _run(library, scenario.keyword, *scenario.args)
+        elapsed = time.perf_counter() - start
+        if allocations:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        else:
+            times.append(elapsed)
+            counts = counts or (counter.round_trips, counter.commands)
+        if scenario.teardown is not None:
+            scenario.teardown(library)
+    return {
+        "round_trips": counts[0],
+        "commands": counts[1],
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "peak_allocated_bytes": peak,
+    }
+
+
+def run(models=MODELS, repetitions=10):
+    """Measure all scenarios for each model and return the results, which can be written as JSON."""
+    missing = set(Mainframe3270().get_keyword_names()) - set(SKIPPED) - {scenario.keyword for scenario in SCENARIOS}
+    if missing:
+        raise ValueError(f"No scenario for the keywords {', '.join(sorted(missing))}")
+    counter = RoundTripCounter()
+    results = {}
+    emulator_class = functools.partial(Emulator, executable=COMMAND)
+    with counter.install(), mock.patch("Mainframe3270.keywords.connection.Emulator", emulator_class):
+        for model in models:
+            library = Mainframe3270(
+                visible=False, run_on_failure_keyword="None", wait_strategy=WaitStrategy.Unlock, model=model
+            )
+            _open(library)
+            try:
+                results[model] = {
+                    scenario.keyword: measure(library, scenario, counter, repetitions) for scenario in SCENARIOS
+                }
+            finally:
+                _close_all(library)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repetitions": repetitions,
+        "models": results,
+        "skipped": SKIPPED,
+    }
+
+
+def compare(results, baseline):
+    """Return the differences to the baseline as lines, and whether any keyword needs more round trips or commands."""
+    lines = []
+    regression = False
+    for model, keywords in results["models"].items():
+        for keyword, result in keywords.items():
+            expected = baseline["models"].get(model, {}).get(keyword)
+            if expected is None:
+                lines.append(f"model {model}, {keyword}: not in the baseline")
+                continue
+            for name in ("round_trips", "commands"):
+                if result[name] != expected[name]:
+                    regression = regression or result[name] > expected[name]
+                    lines.append(f"model {model}, {keyword}: {expected[name]} -> {result[name]} {name}")
+    return lines, regression
+
+
+def _print_table(results):
+    for model, keywords in results["models"].items():
+        print(f"Model {model}")
+        print(f"  {'Keyword':<45} {'Round trips':>11} {'Commands':>9} {'Median ms':>10} {'Peak bytes':>11}")
+        for keyword, result in keywords.items():
+            print(
+                f"  {keyword:<45} {result['round_trips']:>11} {result['commands']:>9} "
+                f"{result['median_ms']:>10.3f} {result['peak_allocated_bytes']:>11}"
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.keyword_costs",
+        description="Measure the round trips, wall time and allocations of every keyword per model.",
+    )
+    parser.add_argument("--models", nargs="+", default=list(MODELS), choices=MODELS, help="models to measure")
+    parser.add_argument("--repetitions", type=int, default=10, help="timed runs per keyword (default: 10)")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare the results with a JSON file of results")
+    args = parser.parse_args(argv)
+    results = run(args.models, args.repetitions)
+    _print_table(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            lines, regression = compare(results, json.load(file))
+        print("\n".join(lines) or "The round trips and commands are the same as in the baseline")
+        if regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
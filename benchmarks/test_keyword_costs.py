@@ -0,0 +1,48 @@
+"""Checks that no keyword needs more emulator round trips than in the committed baseline ``keyword_costs.json``.
+
+Run ``python -m benchmarks.keyword_costs --output benchmarks/keyword_costs.json`` to update the baseline after a
+change that is meant to change the round trips.
+"""
+
+import functools
+import json
+import os
+from unittest import mock
+from Mainframe3270 import Mainframe3270
+from Mainframe3270.py3270 import Emulator
+from Mainframe3270.utils import WaitStrategy
+from .fake_s3270 import COMMAND
+from .keyword_costs import RoundTripCounter, _fresh_menu, _open, _run, compare, run
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "keyword_costs.json")
+
+
+def test_round_trips_are_the_same_as_in_the_baseline():
+    with open(BASELINE, encoding="utf-8") as file:
+        baseline = json.load(file)
+
+    lines, _ = compare(run(models=["2"], repetitions=1), baseline)
+
+    assert lines == []
+
+
+def test_keywords_on_an_unchanged_screen_read_it_once():
+    counter = RoundTripCounter()
+    emulator_class = functools.partial(Emulator, executable=COMMAND)
+    with counter.install(), mock.patch("Mainframe3270.keywords.connection.Emulator", emulator_class):
+        library = Mainframe3270(
+            visible=False, run_on_failure_keyword="None", wait_strategy=WaitStrategy.Unlock, snapshot_max_age=60
+        )
+        _open(library)
+        try:
+            _fresh_menu(library)
+            counter.reset()
+
+            _run(library, "Page Should Contain String", "MAIN MENU")
+            assert _run(library, "Read", 1, 32, 9) == "MAIN MENU"
+            _run(library, "Get String Positions Only After", 10, 1, "WORK WITH")
+            _run(library, "Page Should Match Regex", r"WORK WITH \w+")
+
+            assert counter.round_trips == 1
+        finally:
+            _run(library, "Close All Connections")
@@ -0,0 +1,83 @@
+"""Benchmarks of common keyword sequences, against the fake s3270 of ``fake_s3270.py`` instead of a host.
+
+Every keyword runs through ``Mainframe3270.run_keyword`` and a real emulator subprocess, so that regressions in the
+per-command overhead of the keywords, the emulator communication and the status line parsing show up here.
+"""
+
+import pytest
+from Mainframe3270 import Mainframe3270
+from Mainframe3270.py3270 import Emulator
+from Mainframe3270.utils import WaitStrategy
+from .fake_s3270 import COMMAND
+
+USER_POSITION = (4, 35)
+OPTION_POSITION = (21, 18)
+
+
+def run(library, name, *args):
+    return library.run_keyword(name, list(args), {})
+
+
+def log_on(library):
+    run(library, "Write Bare In Position", "ALICE", *USER_POSITION)
+    run(library, "Send Enter")
+    run(library, "Wait Field Detected")
+
+
+@pytest.fixture(scope="module")
+def library():
+    library = Mainframe3270(visible=False, run_on_failure_keyword="None", wait_strategy=WaitStrategy.Unlock)
+    emulator = Emulator(timeout=5, executable=COMMAND)
+    library.cache.register(emulator, None)
+    emulator.connect("127.0.0.1")
+    run(library, "Wait Field Detected")
+    yield library
+    run(library, "Close All Connections")
+
+
+@pytest.fixture
+def logon_screen(library):
+    if run(library, "Read", 1, 27, 29) != "WELCOME TO THE BENCHMARK HOST":
+        run(library, "Send PF", "3")
+        run(library, "Wait Field Detected")
+    return library
+
+
+@pytest.fixture
+def menu_screen(logon_screen):
+    log_on(logon_screen)
+    return logon_screen
+
+
+def test_execute_command(benchmark, library):
+    benchmark(run, library, "Execute Command", "Ignore")
+
+
+def test_read(benchmark, menu_screen):
+    assert benchmark(run, menu_screen, "Read", 1, 32, 9) == "MAIN MENU"
+
+
+def test_read_all_screen(benchmark, menu_screen):
+    assert "WORK WITH ACCOUNTS" in benchmark(run, menu_screen, "Read All Screen")
+
+
+def test_page_should_contain_string(benchmark, menu_screen):
+    benchmark(run, menu_screen, "Page Should Contain String", "SIGN OFF")
+
+
+def test_write_in_position(benchmark, menu_screen):
+    def write_option():
+        run(menu_screen, "Write In Position", "1", *OPTION_POSITION)
+        run(menu_screen, "Wait Field Detected")
+
+    benchmark(write_option)
+
+
+def test_log_on_and_off(benchmark, logon_screen):
+    def log_on_and_off():
+        log_on(logon_screen)
+        run(logon_screen, "Page Should Contain String", "MAIN MENU")
+        run(logon_screen, "Send PF", "3")
+        run(logon_screen, "Wait Field Detected")
+
+    benchmark(log_on_and_off)
@@ -0,0 +1,81 @@
+"""Micro-benchmarks of the objects that are created for every emulator command.
+
+Run them with ``pytest benchmarks/``, see https://pytest-benchmark.readthedocs.io for how to compare runs.
+The allocation tests fail if creating the objects allocates considerably more memory than now, e.g. because
+``Status`` gets an instance dict again or parses the status line eagerly.
+"""
+
+import tracemalloc
+from contextlib import nullcontext
+from Mainframe3270.py3270 import Command, Status
+
+STATUS_LINE = b"U F U C(pub400.com) I 2 24 80 4 9 0x0 0.000"
+
+
+class ReplayApp(object):
+    """Replays the same reply for every command, without any emulator process."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.lines = iter(())
+
+    def write(self, data):
+        self.lines = iter(self.reply)
+
+    def readline(self, timeout=None):
+        return next(self.lines)
+
+    def watchdog(self, timeout):
+        return nullcontext()
+
+
+def peak_allocated_bytes(function):
+    """Return the peak of the memory allocated by Python while ``function`` runs, after a first warm-up run."""
+    function()
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_status(benchmark):
+    benchmark(Status, STATUS_LINE)
+
+
+def test_status_keyboard(benchmark):
+    benchmark(lambda: Status(STATUS_LINE).keyboard)
+
+
+def test_execute_command(benchmark):
+    app = ReplayApp([STATUS_LINE + b"\n", b"ok\n"])
+
+    benchmark(lambda: Command(app, b"Enter").execute())
+
+
+def test_execute_command_with_screen_data(benchmark):
+    app = ReplayApp([b"data: " + b"a" * 80 + b"\n"] * 24 + [STATUS_LINE + b"\n", b"ok\n"])
+
+    benchmark(lambda: Command(app, b"ascii(0,0,24,80)").execute())
+
+
+def test_status_allocations():
+    # only the slotted object itself, the status line is split when a field is first accessed
+    assert peak_allocated_bytes(lambda: Status(STATUS_LINE)) <= 64
+
+
+def test_status_keyboard_allocations():
+    assert peak_allocated_bytes(lambda: Status(STATUS_LINE).keyboard) <= 512
+
+
+def test_execute_command_allocations():
+    app = ReplayApp([STATUS_LINE + b"\n", b"ok\n"])
+
+    assert peak_allocated_bytes(lambda: Command(app, b"Enter").execute()) <= 1024
+
+
+def test_execute_command_with_screen_data_allocations():
+    app = ReplayApp([b"data: " + b"a" * 80 + b"\n"] * 24 + [STATUS_LINE + b"\n", b"ok\n"])
+
+    assert peak_allocated_bytes(lambda: Command(app, b"ascii(0,0,24,80)").execute()) <= 4608
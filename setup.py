@@ -27,7 +27,7 @@ package_kwargs = {
     "license": "MIT License",
     "license_files": ["LICENSE.md", "THIRD-PARTY-NOTICES.txt"],
     "url": "https://github.com/MarketSquare/Robot-Framework-Mainframe-3270-Library",
-    "packages": ["Mainframe3270", "Mainframe3270.keywords"],
+    "packages": ["Mainframe3270", "Mainframe3270.keywords", "Mainframe3270.tn3270"],
     "install_requires": ["robotframework", "robotframework-pythonlibcore", "html2image"],
     "classifiers": [
         "Development Status :: 5 - Production/Stable",
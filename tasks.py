@@ -5,9 +5,9 @@ from invoke import task
 def lint_python(c):
     """Perform python code formatting with black, isort and flake8."""
     print("Linting python code with black, isort, flake8 and mypy...")
-    c.run("black ./setup.py ./tasks.py Mainframe3270/ atest/ utest/")
-    c.run("isort ./setup.py ./tasks.py Mainframe3270/ atest/ utest/")
-    c.run("flake8 ./setup.py ./tasks.py Mainframe3270/ atest/ utest/")
+    c.run("black ./setup.py ./tasks.py Mainframe3270/ atest/ utest/ benchmarks/")
+    c.run("isort ./setup.py ./tasks.py Mainframe3270/ atest/ utest/ benchmarks/")
+    c.run("flake8 ./setup.py ./tasks.py Mainframe3270/ atest/ utest/ benchmarks/")
     c.run("mypy ./setup.py ./tasks.py Mainframe3270/")
 
 
@@ -34,6 +34,18 @@ def utest(c):
     c.run("pytest utest/")
 
 
+@task
+def benchmark(c):
+    """Runs python micro-benchmarks."""
+    c.run("pytest benchmarks/")
+
+
+@task
+def keyword_costs(c):
+    """Measures the round trips, wall time and allocations of every keyword and compares them with the baseline."""
+    c.run("python -m benchmarks.keyword_costs --compare benchmarks/keyword_costs.json")
+
+
 @task
 def atest(c):
     """Runs robot acceptance tests."""
@@ -3,6 +3,7 @@ import pytest
 from pytest_mock import MockerFixture
 from robot.api import logger
 from Mainframe3270.keywords import AssertionKeywords
+from Mainframe3270.py3270 import Emulator, ScreenSnapshot
 from .utils import create_test_object_for
 
 
@@ -12,7 +13,7 @@ def under_test():
 
 
 def test_page_should_contain_string(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
     mocker.patch("robot.api.logger.info")
 
     under_test.page_should_contain_string("abc")
@@ -20,8 +21,16 @@ def test_page_should_contain_string(mocker: MockerFixture, under_test: Assertion
     logger.info.assert_called_with('The string "abc" was found')
 
 
+def test_page_should_contain_string_in_region(mocker: MockerFixture, under_test: AssertionKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_region", return_value=["abc"])
+
+    under_test.page_should_contain_string("abc", region=(24, 1, 1, 80))
+
+    Emulator.read_region.assert_called_once_with(24, 1, 1, 80)
+
+
 def test_page_should_contain_string_ignore_case(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="aBc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["aBc"] * 24)
     mocker.patch("robot.api.logger.info")
 
     under_test.page_should_contain_string("abc", ignore_case=True)
@@ -30,165 +39,187 @@ def test_page_should_contain_string_ignore_case(mocker: MockerFixture, under_tes
 
 
 def test_page_should_contain_string_fails(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match='The string "def" was not found'):
         under_test.page_should_contain_string("def")
 
 
 def test_page_should_contain_string_custom_message(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match="my error message"):
         under_test.page_should_contain_string("def", error_message="my error message")
 
 
 def test_page_should_not_contain_string(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     under_test.page_should_not_contain_string("ABC")
 
 
 def test_page_should_not_contain_string_ignore_case(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     under_test.page_should_not_contain_string("def", ignore_case=True)
 
 
 def test_page_should_not_contain_string_fails(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match='The string "ABC" was found'):
         under_test.page_should_not_contain_string("ABC", ignore_case=True)
 
 
 def test_page_should_not_contain_string_custom_message(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match="my error message"):
         under_test.page_should_not_contain_string("abc", error_message="my error message")
 
 
 def test_page_should_contain_any_string(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     under_test.page_should_contain_any_string(["abc", "def"])
 
 
+def test_page_should_contain_any_string_logs_found_strings(mocker: MockerFixture, under_test: AssertionKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc", "xdef"])
+    mocker.patch("robot.api.logger.info")
+
+    under_test.page_should_contain_any_string(["abc", "def", "ghi"])
+
+    Emulator.read_screen_rows.assert_called_once()
+    logger.info.assert_any_call('The string "abc" was found at positions [(1, 1)]')
+    logger.info.assert_any_call('The string "def" was found at positions [(2, 2)]')
+    assert logger.info.call_count == 2
+
+
 def test_page_should_contain_any_string_ignore_case(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     under_test.page_should_contain_any_string(["ABC", "def"], ignore_case=True)
 
 
 def test_page_should_contain_any_string_fails(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match=re.escape("The strings \"['def', 'ghi']\" were not found")):
         under_test.page_should_contain_any_string(["def", "ghi"])
 
 
 def test_page_should_contain_any_string_custom_message(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match="my error message"):
         under_test.page_should_contain_any_string(["def", "ghi"], error_message="my error message")
 
 
 def test_page_should_contain_all_strings(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", side_effect=["abc", "def"])
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc", "def"])
+
+    under_test.page_should_contain_all_strings(["abc", "def"])
+
+
+def test_page_should_contain_all_strings_reads_screen_once(mocker: MockerFixture, under_test: AssertionKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc", "def"])
+    mocker.patch("robot.api.logger.info")
 
     under_test.page_should_contain_all_strings(["abc", "def"])
 
+    Emulator.read_screen_rows.assert_called_once()
+    logger.info.assert_called_with('The string "def" was found at positions [(2, 1)]')
+
 
 def test_page_should_contain_all_strings_ignore_case(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", side_effect=["AbC", "DeF"])
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["AbC", "DeF"])
 
     under_test.page_should_contain_all_strings(["abc", "def"], ignore_case=True)
 
 
 def test_page_should_contain_all_strings_fails(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value=["def"])
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["def"])
 
     with pytest.raises(Exception, match='The string "ghi" was not found'):
         under_test.page_should_contain_all_strings(["def", "ghi"])
 
 
 def test_page_should_contain_all_strings_custom_message(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match="my error message"):
         under_test.page_should_contain_all_strings(["abc", "def"], error_message="my error message")
 
 
 def test_page_should_not_contain_any_string(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     under_test.page_should_not_contain_any_string(["def", "ghi"])
 
 
 def test_page_should_not_contain_any_string_fails(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match='The string "abc" was found'):
         under_test.page_should_not_contain_any_string(["abc", "def"])
 
 
 def test_page_should_not_contain_any_string_ignore_case(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="ABC")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["ABC"] * 24)
 
     with pytest.raises(Exception, match='The string "abc" was found'):
         under_test.page_should_not_contain_any_string(["abc", "def"], ignore_case=True)
 
 
 def test_page_should_not_contain_any_string_custom_message(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match="my error message"):
         under_test.page_should_not_contain_any_string(["abc", "def"], error_message="my error message")
 
 
 def test_page_should_not_contain_all_strings(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     under_test.page_should_not_contain_all_strings(["def", "ghi"])
 
 
 def test_page_should_not_contain_all_strings_ignore_case(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match='The string "abc" was found'):
         under_test.page_should_not_contain_all_strings(["ABC", "def"], ignore_case=True)
 
 
 def test_page_should_not_contain_all_strings_fails(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match='The string "abc" was found'):
         under_test.page_should_not_contain_all_strings(["abc", "def"])
 
 
 def test_page_should_not_contain_all_strings_custom_message(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match="my error message"):
         under_test.page_should_not_contain_all_strings(["abc", "def"], error_message="my error message")
 
 
 def test_page_should_contain_string_x_times(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="a")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["a"] * 24)
 
     under_test.page_should_contain_string_x_times("a", 24)
 
 
 def test_page_should_contain_string_x_times_ignore_case(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="a")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["a"] * 24)
 
     under_test.page_should_contain_string_x_times("A", 24, ignore_case=True)
 
 
 def test_page_should_contain_string_x_times_fails(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="a")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["a"] * 24)
 
     with pytest.raises(Exception, match='The string "a" was not found "1" times, it appears "24" times'):
         under_test.page_should_contain_string_x_times("a", 1)
@@ -198,86 +229,98 @@ def test_page_should_contain_string_x_times_fails(mocker: MockerFixture, under_t
 
 
 def test_page_should_contain_string_x_times_custom_message(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="a")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["a"] * 24)
 
     with pytest.raises(Exception, match="my error message"):
         under_test.page_should_contain_string_x_times("b", 1, error_message="my error message")
 
 
 def test_page_should_match_regex(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     under_test.page_should_match_regex(r"\w+")
 
 
 def test_page_should_match_regex_fails(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match=re.escape(r'No matches found for "\d+" pattern')):
         under_test.page_should_match_regex(r"\d+")
 
 
 def test_page_should_not_match_regex(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     under_test.page_should_not_match_regex(r"\d+")
 
 
 def test_page_should_not_match_regex_fails(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="a")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["a"] * 24)
 
     with pytest.raises(Exception, match=re.escape('There are matches found for "[a]+" pattern')):
         under_test.page_should_not_match_regex("[a]+")
 
 
 def test_page_should_contain_match(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     under_test.page_should_contain_match("*a?c*")
 
 
 def test_page_should_contain_match_fails(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match=re.escape('No matches found for "*e?g*" pattern')):
         under_test.page_should_contain_match("*e?g*")
 
 
 def test_page_should_contain_match_ignore_case(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="ABC")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["ABC"] * 24)
 
     under_test.page_should_contain_match("*a?c*", ignore_case=True)
 
 
 def test_page_should_contain_match_custom_message(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match="my error message"):
         under_test.page_should_contain_match("*def*", error_message="my error message")
 
 
 def test_page_should_not_contain_match(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     under_test.page_should_not_contain_match("*def*")
 
 
 def test_page_should_not_contain_match_fails(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match=re.escape('There are matches found for "*abc*" pattern')):
         under_test.page_should_not_contain_match("*abc*")
 
 
 def test_page_should_not_contain_match_ignore_case(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match=re.escape('There are matches found for "*abc*" pattern')):
         under_test.page_should_not_contain_match("*ABC*", ignore_case=True)
 
 
 def test_page_should_not_contain_match_custom_message(mocker: MockerFixture, under_test: AssertionKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
 
     with pytest.raises(Exception, match="my error message"):
         under_test.page_should_not_contain_match("*abc*", error_message="my error message")
+
+
+def test_assertions_on_same_screen_read_it_once(mocker: MockerFixture, under_test: AssertionKeywords):
+    mocker.patch("Mainframe3270.py3270.Command.execute")
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_command", wraps=under_test.mf.exec_command)
+    under_test.mf._screen_snapshot = ScreenSnapshot(0, ["abc"] * 24)
+
+    under_test.page_should_contain_string("abc")
+    under_test.page_should_match_regex(r"\w+")
+    under_test.page_should_contain_match("*a?c*")
+
+    Emulator.exec_command.assert_not_called()
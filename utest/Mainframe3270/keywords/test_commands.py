@@ -3,8 +3,8 @@ import pytest
 from pytest_mock import MockerFixture
 from robot.api import logger
 from Mainframe3270.keywords import CommandKeywords
-from Mainframe3270.py3270 import Emulator
-from Mainframe3270.utils import ResultMode
+from Mainframe3270.py3270 import Command, Emulator
+from Mainframe3270.utils import ResultMode, WaitStrategy
 from .utils import create_test_object_for
 
 
@@ -22,6 +22,19 @@ def test_execute_command(mocker: MockerFixture, under_test: CommandKeywords):
     time.sleep.assert_called_with(under_test.wait_time)
 
 
+def test_execute_commands(mocker: MockerFixture, under_test: CommandKeywords):
+    command = Command(None, b"ascii(0,0,3)")
+    command.data = [b"abc"]
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_batch", return_value=[Command(None, b"Tab"), command])
+    mocker.patch("time.sleep")
+
+    output = under_test.execute_commands("Tab", "ascii(0,0,3)")
+
+    Emulator.exec_batch.assert_called_once_with([b"Tab", b"ascii(0,0,3)"])
+    time.sleep.assert_called_once_with(under_test.wait_time)
+    assert output == ["", "abc"]
+
+
 def test_delete_char(mocker: MockerFixture, under_test: CommandKeywords):
     mocker.patch("Mainframe3270.py3270.Emulator.move_to")
     mocker.patch("Mainframe3270.py3270.Emulator.exec_command")
@@ -143,3 +156,45 @@ def test_move_cursor_to_exceeds_ypos(
         under_test.move_cursor_to(ypos, xpos)
 
     Emulator.exec_command.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("wait_strategy", "condition"), [(WaitStrategy.Output, "Output"), (WaitStrategy.Unlock, "Unlock")]
+)
+def test_send_enter_with_wait_strategy(
+    mocker: MockerFixture, under_test: CommandKeywords, wait_strategy: WaitStrategy, condition: str
+):
+    mocker.patch("Mainframe3270.py3270.Emulator.send_enter")
+    mocker.patch("Mainframe3270.py3270.Emulator.wait_for")
+    mocker.patch("time.sleep")
+
+    under_test.send_enter(wait_strategy)
+
+    Emulator.wait_for.assert_called_once_with(condition, under_test.timeout)
+    time.sleep.assert_not_called()
+
+
+def test_send_pf_with_library_wait_strategy(mocker: MockerFixture, under_test: CommandKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_command")
+    mocker.patch("Mainframe3270.py3270.Emulator.wait_for")
+    mocker.patch("time.sleep")
+    under_test.wait_strategy = WaitStrategy.Unlock
+
+    under_test.send_pf("3")
+
+    Emulator.wait_for.assert_called_once_with("Unlock", under_test.timeout)
+    time.sleep.assert_not_called()
+
+
+def test_execute_command_wait_strategy_overrides_library_wait_strategy(
+    mocker: MockerFixture, under_test: CommandKeywords
+):
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_command")
+    mocker.patch("Mainframe3270.py3270.Emulator.wait_for")
+    mocker.patch("time.sleep")
+    under_test.wait_strategy = WaitStrategy.Unlock
+
+    under_test.execute_command("Home", WaitStrategy.Fixed)
+
+    Emulator.wait_for.assert_not_called()
+    time.sleep.assert_called_with(under_test.wait_time)
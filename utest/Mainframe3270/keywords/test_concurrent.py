@@ -0,0 +1,60 @@
+import asyncio
+import pytest
+from pytest_mock import MockerFixture
+from robot.api import logger
+from Mainframe3270.asyncemulator import AsyncEmulator
+from Mainframe3270.keywords import ConcurrentConnectionKeywords
+from Mainframe3270.py3270 import Command
+from .utils import create_test_object_for
+
+
+@pytest.fixture
+def under_test():
+    return create_test_object_for(ConcurrentConnectionKeywords)
+
+
+def test_open_concurrent_connections(mocker: MockerFixture, under_test: ConcurrentConnectionKeywords):
+    mocker.patch("Mainframe3270.asyncemulator.AsyncEmulator.connect")
+    mocker.patch("Mainframe3270.asyncemulator.AsyncEmulator.wait_for_field")
+
+    count = asyncio.run(under_test.open_concurrent_connections("myhost", 3, 992, "-trace -tracefile x.log"))
+
+    assert count == 3
+    assert len(under_test.concurrent_connections) == 3
+    assert AsyncEmulator.connect.call_count == 3
+    AsyncEmulator.connect.assert_called_with("myhost:992")
+    assert AsyncEmulator.wait_for_field.call_count == 3
+    assert under_test.concurrent_connections[0].args[-3:] == ["-trace", "-tracefile", "x.log"]
+
+
+def test_execute_command_on_concurrent_connections(mocker: MockerFixture, under_test: ConcurrentConnectionKeywords):
+    command = Command(None, b"Ascii(0,0,1,3)")
+    command.data = [b"abc"]
+    mocker.patch("Mainframe3270.asyncemulator.AsyncEmulator.exec_command", return_value=command)
+    under_test.concurrent_connections.extend([AsyncEmulator(), AsyncEmulator()])
+
+    results = asyncio.run(under_test.execute_command_on_concurrent_connections("Ascii(0,0,1,3)"))
+
+    assert results == [["abc"], ["abc"]]
+    AsyncEmulator.exec_command.assert_called_with(b"Ascii(0,0,1,3)")
+
+
+def test_read_all_screens_of_concurrent_connections(mocker: MockerFixture, under_test: ConcurrentConnectionKeywords):
+    mocker.patch("Mainframe3270.asyncemulator.AsyncEmulator.read_all_screen", side_effect=["first", "second"])
+    under_test.concurrent_connections.extend([AsyncEmulator(), AsyncEmulator()])
+
+    assert asyncio.run(under_test.read_all_screens_of_concurrent_connections()) == ["first", "second"]
+
+
+def test_close_concurrent_connections(mocker: MockerFixture, under_test: ConcurrentConnectionKeywords):
+    mocker.patch(
+        "Mainframe3270.asyncemulator.AsyncEmulator.terminate", side_effect=[None, BrokenPipeError("broken pipe")]
+    )
+    mocker.patch("robot.api.logger.warn")
+    under_test.concurrent_connections.extend([AsyncEmulator(), AsyncEmulator()])
+
+    asyncio.run(under_test.close_concurrent_connections())
+
+    assert under_test.concurrent_connections == []
+    assert AsyncEmulator.terminate.call_count == 2
+    logger.warn.assert_called_once_with("Closing a concurrent connection failed: broken pipe")
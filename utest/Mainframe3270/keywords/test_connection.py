@@ -6,6 +6,8 @@ from robot.api import logger
 from robot.utils import ConnectionCache
 from Mainframe3270.keywords import ConnectionKeywords
 from Mainframe3270.py3270 import Emulator
+from Mainframe3270.sessionpool import CheckedInSession
+from Mainframe3270.utils import Engine
 from .utils import create_test_object_for
 
 CURDIR = os.path.dirname(os.path.realpath(__file__))
@@ -70,7 +72,19 @@ def test_open_connection_with_extra_args(mocker: MockerFixture, under_test: Conn
 
     under_test.open_connection("myhost", extra_args=extra_args)
 
-    Emulator.__init__.assert_called_with(True, 30.0, extra_args, "2")
+    Emulator.__init__.assert_called_with(
+        True,
+        30.0,
+        extra_args,
+        "2",
+        False,
+        60.0,
+        app_pool=None,
+        unicode_replacements=None,
+        snapshot_max_age=1.0,
+        engine="executable",
+        instrumentation=None,
+    )
 
 
 def test_open_connection_with_port_from_argument_and_from_extra_args(
@@ -95,7 +109,19 @@ def test_open_connection_with_default_model(mocker: MockerFixture, under_test: C
 
     under_test.open_connection("myhost")
 
-    Emulator.__init__.assert_called_with(True, 30.0, ['-utf8'], "2")
+    Emulator.__init__.assert_called_with(
+        True,
+        30.0,
+        ["-utf8"],
+        "2",
+        False,
+        60.0,
+        app_pool=None,
+        unicode_replacements=None,
+        snapshot_max_age=1.0,
+        engine="executable",
+        instrumentation=None,
+    )
 
 
 def test_open_connection_with_model_from_extra_args(mocker: MockerFixture, under_test: ConnectionKeywords):
@@ -106,7 +132,19 @@ def test_open_connection_with_model_from_extra_args(mocker: MockerFixture, under
 
     under_test.open_connection("myhost", extra_args=extra_args)
 
-    Emulator.__init__.assert_called_with(True, 30.0, extra_args, model)
+    Emulator.__init__.assert_called_with(
+        True,
+        30.0,
+        extra_args,
+        model,
+        False,
+        60.0,
+        app_pool=None,
+        unicode_replacements=None,
+        snapshot_max_age=1.0,
+        engine="executable",
+        instrumentation=None,
+    )
 
 
 def test_process_args_returns_empty_list(under_test: ConnectionKeywords):
@@ -283,7 +321,17 @@ def test_open_connection_from_session_file_uses_default_model(
     with patch("builtins.open", mock_open(read_data="*hostname: pub400.com")):
         under_test.open_connection_from_session_file("session.s3270")
 
-        Emulator.__init__.assert_called_with(visible, 30.0, ["session.s3270"], "2")
+        Emulator.__init__.assert_called_with(
+            visible,
+            30.0,
+            ["session.s3270"],
+            "2",
+            False,
+            60.0,
+            unicode_replacements=None,
+            snapshot_max_age=1.0,
+            instrumentation=None,
+        )
 
 
 def test_open_connection_from_session_file_uses_default_model_for_wc3270(
@@ -297,7 +345,16 @@ def test_open_connection_from_session_file_uses_default_model_for_wc3270(
     with patch("builtins.open", mock_open(read_data="*hostname: pub400.com")):
         under_test.open_connection_from_session_file("session.s3270")
 
-        Emulator.__init__.assert_called_with(True, 30.0, model="2")
+        Emulator.__init__.assert_called_with(
+            True,
+            30.0,
+            model="2",
+            write_behind=False,
+            command_timeout=60.0,
+            unicode_replacements=None,
+            snapshot_max_age=1.0,
+            instrumentation=None,
+        )
 
 
 @pytest.mark.parametrize(
@@ -319,7 +376,17 @@ def test_open_connection_from_session_file_uses_model_from_file(
     with patch("builtins.open", mock_open(read_data="*hostname: pub400.com\n*model: 5")):
         under_test.open_connection_from_session_file("session.x3270")
 
-        Emulator.__init__.assert_called_with(visible, 30.0, ["session.x3270"], "5")
+        Emulator.__init__.assert_called_with(
+            visible,
+            30.0,
+            ["session.x3270"],
+            "5",
+            False,
+            60.0,
+            unicode_replacements=None,
+            snapshot_max_age=1.0,
+            instrumentation=None,
+        )
 
 
 def test_open_connection_from_session_file_uses_model_from_file_for_wc3270(
@@ -333,7 +400,27 @@ def test_open_connection_from_session_file_uses_model_from_file_for_wc3270(
     with patch("builtins.open", mock_open(read_data="*hostname: pub400.com\nwc3270.model: 5")):
         under_test.open_connection_from_session_file("session.wc3270")
 
-        Emulator.__init__.assert_called_with(True, 30.0, model="5")
+        Emulator.__init__.assert_called_with(
+            True,
+            30.0,
+            model="5",
+            write_behind=False,
+            command_timeout=60.0,
+            unicode_replacements=None,
+            snapshot_max_age=1.0,
+            instrumentation=None,
+        )
+
+
+def test_open_connection_from_session_file_does_not_use_app_pool(mocker: MockerFixture, under_test: ConnectionKeywords):
+    mocker.patch("Mainframe3270.keywords.connection.os_name", "posix")
+    mocker.patch("Mainframe3270.keywords.ConnectionKeywords._check_session_file_extension")
+    under_test.library.app_pool = mocker.Mock()
+
+    with patch("builtins.open", mock_open(read_data="*hostname: pub400.com")):
+        under_test.open_connection_from_session_file("session.s3270")
+
+    under_test.app_pool.checkout.assert_not_called()
 
 
 def test_open_connection_from_session_file_registers_connection(mocker: MockerFixture, under_test: ConnectionKeywords):
@@ -395,8 +482,44 @@ def test_close_connection(mocker: MockerFixture, under_test: ConnectionKeywords)
 
 
 def test_close_all_connections(mocker: MockerFixture, under_test: ConnectionKeywords):
-    mocker.patch("robot.utils.ConnectionCache.close_all")
+    mocker.patch("Mainframe3270.py3270.Emulator.terminate")
+    under_test.cache.register(Emulator(), None)
 
     under_test.close_all_connections()
 
-    ConnectionCache.close_all.assert_called_with("terminate")
+    assert Emulator.terminate.call_count == 2
+    assert len(under_test.cache) == 0
+    assert under_test.cache.current_index is None
+
+
+def test_close_all_connections_keeps_checked_in_sessions(mocker: MockerFixture, under_test: ConnectionKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.terminate")
+    under_test.cache._connections[0] = CheckedInSession("main")
+
+    under_test.close_all_connections()
+
+    Emulator.terminate.assert_not_called()
+    assert len(under_test.cache) == 0
+
+
+def test_get_emulator_error_output(under_test: ConnectionKeywords):
+    under_test.mf.app.stderr_lines.extend(["first", "second"])
+
+    assert under_test.get_emulator_error_output() == "first\nsecond"
+
+
+def test_open_connection_with_native_engine(mocker: MockerFixture, under_test: ConnectionKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.__init__", return_value=None)
+    mocker.patch("Mainframe3270.py3270.Emulator.connect")
+    under_test.library.engine = Engine.Native
+
+    under_test.open_connection("myhost")
+
+    assert Emulator.__init__.call_args.kwargs["engine"] == "native"
+
+
+def test_open_connection_from_session_file_with_native_engine(under_test: ConnectionKeywords):
+    under_test.library.engine = Engine.Native
+
+    with pytest.raises(ValueError, match="Session files are not supported by the native engine"):
+        under_test.open_connection_from_session_file("session.s3270")
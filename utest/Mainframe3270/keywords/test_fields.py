@@ -0,0 +1,103 @@
+import pytest
+from pytest_mock import MockerFixture
+from Mainframe3270.keywords import FieldKeywords
+from Mainframe3270.py3270 import Emulator, Field, FieldMap
+from .utils import create_test_object_for
+
+PROTECTED_FIELD = Field(0, 1, 2, 9, 0xE8)
+INPUT_FIELD = Field(10, 1, 12, 5, 0xD1)
+
+
+@pytest.fixture
+def under_test():
+    return create_test_object_for(FieldKeywords)
+
+
+def test_get_fields(mocker: MockerFixture, under_test: FieldKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.get_fields", return_value=[PROTECTED_FIELD, INPUT_FIELD])
+
+    assert under_test.get_fields() == [
+        {
+            "ypos": 1,
+            "xpos": 2,
+            "length": 9,
+            "protected": True,
+            "numeric": False,
+            "intensified": True,
+            "modified": False,
+        },
+        {
+            "ypos": 1,
+            "xpos": 12,
+            "length": 5,
+            "protected": False,
+            "numeric": True,
+            "intensified": False,
+            "modified": True,
+        },
+    ]
+
+
+def test_get_input_fields(mocker: MockerFixture, under_test: FieldKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.get_fields", return_value=[PROTECTED_FIELD, INPUT_FIELD])
+
+    assert under_test.get_input_fields() == [INPUT_FIELD.as_dict()]
+
+
+def test_get_field_at(mocker: MockerFixture, under_test: FieldKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.get_field_at", return_value=INPUT_FIELD)
+
+    assert under_test.get_field_at(1, 14) == INPUT_FIELD.as_dict()
+
+    Emulator.get_field_at.assert_called_once_with(1, 14)
+
+
+def test_get_field_at_on_unformatted_screen(mocker: MockerFixture, under_test: FieldKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.get_field_at", return_value=None)
+
+    assert under_test.get_field_at(1, 1) is None
+
+
+def test_fill_form(mocker: MockerFixture, under_test: FieldKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.fill_fields")
+    mocker.patch("Mainframe3270.librarycomponent.LibraryComponent.wait_for_host")
+
+    under_test.fill_form({"5,10": "abc", "(6, 20)": 42})
+
+    Emulator.fill_fields.assert_called_once_with([(5, 10, "abc"), (6, 20, "42")], None)
+    under_test.wait_for_host.assert_not_called()
+
+
+def test_fill_form_with_label(mocker: MockerFixture, under_test: FieldKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.get_string_positions", return_value=[(1, 3), (5, 3)])
+    mocker.patch(
+        "Mainframe3270.py3270.Emulator.get_field_map", return_value=FieldMap(0, [PROTECTED_FIELD, INPUT_FIELD])
+    )
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_batch")
+    mocker.patch("Mainframe3270.librarycomponent.LibraryComponent.wait_for_host")
+
+    under_test.fill_form({"User:": "abc"}, aid="PF(3)")
+
+    Emulator.get_string_positions.assert_called_once_with("User:")
+    Emulator.exec_batch.assert_called_once_with([b"MoveCursor(0, 11)", b"EraseEOF", b'String("abc")', b"PF(3)"])
+    under_test.wait_for_host.assert_called_once_with(None)
+
+
+def test_fill_form_label_not_found(mocker: MockerFixture, under_test: FieldKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.get_string_positions", return_value=[])
+    mocker.patch("Mainframe3270.py3270.Emulator.fill_fields")
+
+    with pytest.raises(Exception, match='The label "User:" was not found'):
+        under_test.fill_form({"User:": "abc"})
+
+    Emulator.fill_fields.assert_not_called()
+
+
+def test_fill_form_without_input_field_after_label(mocker: MockerFixture, under_test: FieldKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.get_string_positions", return_value=[(2, 1)])
+    mocker.patch(
+        "Mainframe3270.py3270.Emulator.get_field_map", return_value=FieldMap(0, [PROTECTED_FIELD, INPUT_FIELD])
+    )
+
+    with pytest.raises(Exception, match='There is no input field after the label "User:"'):
+        under_test.fill_form({"User:": "abc"})
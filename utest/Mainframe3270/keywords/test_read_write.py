@@ -20,6 +20,33 @@ def test_read(under_test: ReadWriteKeywords, mocker: MockerFixture):
     assert string == "abc"
 
 
+def test_read_fields(under_test: ReadWriteKeywords, mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.string_get_many", return_value=["abc", "de"])
+
+    values = under_test.read_fields([(1, 1, 3), (2, 1, 2)])
+
+    Emulator.string_get_many.assert_called_once_with([(1, 1, 3), (2, 1, 2)])
+    assert values == ["abc", "de"]
+
+
+def test_read_fields_as_dict(under_test: ReadWriteKeywords, mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc", "def"])
+
+    values = under_test.read_fields({"first": (1, 1, 3), "second": (2, 2, 2)})
+
+    Emulator.read_screen_rows.assert_called_once()
+    assert values == {"first": "abc", "second": "ef"}
+
+
+def test_read_region(under_test: ReadWriteKeywords, mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_region", return_value=["abc", "def"])
+
+    rows = under_test.read_region(1, 1, 2, 3)
+
+    Emulator.read_region.assert_called_once_with(1, 1, 2, 3)
+    assert rows == ["abc", "def"]
+
+
 def test_read_all_screen(under_test: ReadWriteKeywords, mocker: MockerFixture):
     mocker.patch("Mainframe3270.py3270.Emulator.read_all_screen", return_value="all screen")
 
@@ -107,7 +134,15 @@ def test_get_string_positions(mocker: MockerFixture, under_test: ReadWriteKeywor
 
     assert under_test.get_string_positions("abc") == [(5, 10)]
 
-    Emulator.get_string_positions.assert_called_once_with("abc", False, True)
+    Emulator.get_string_positions.assert_called_once_with("abc", False, True, None)
+
+
+def test_get_string_positions_in_region(mocker: MockerFixture, under_test: ReadWriteKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.get_string_positions", return_value=[(22, 10)])
+
+    assert under_test.get_string_positions("abc", region=(21, 1, 3, 80)) == [(22, 10)]
+
+    Emulator.get_string_positions.assert_called_once_with("abc", False, True, (21, 1, 3, 80))
 
 
 def test_get_string_positions_as_dict(mocker: MockerFixture, under_test: ReadWriteKeywords):
@@ -118,7 +153,7 @@ def test_get_string_positions_as_dict(mocker: MockerFixture, under_test: ReadWri
         {"ypos": 6, "xpos": 11},
     ]
 
-    Emulator.get_string_positions.assert_called_once_with("abc", False, True)
+    Emulator.get_string_positions.assert_called_once_with("abc", False, True, None)
 
 
 def test_get_string_positions_invalid_mode(mocker: MockerFixture, under_test: ReadWriteKeywords):
@@ -130,7 +165,7 @@ def test_get_string_positions_invalid_mode(mocker: MockerFixture, under_test: Re
     logger.warn.assert_called_with(
         '"mode" should be either "ResultMode.As_Dict" or "ResultMode.As_Tuple". ' "Returning the result as tuple"
     )
-    Emulator.get_string_positions.assert_called_once_with("abc", False, True)
+    Emulator.get_string_positions.assert_called_once_with("abc", False, True, None)
 
 
 def test_get_string_positions_ignore_case(mocker: MockerFixture, under_test: ReadWriteKeywords):
@@ -138,7 +173,7 @@ def test_get_string_positions_ignore_case(mocker: MockerFixture, under_test: Rea
 
     assert under_test.get_string_positions("abc", ignore_case=True) == [(5, 10)]
 
-    Emulator.get_string_positions.assert_called_once_with("abc", True, True)
+    Emulator.get_string_positions.assert_called_once_with("abc", True, True, None)
 
 
 def test_get_string_positions_only_after(mocker: MockerFixture, under_test: ReadWriteKeywords):
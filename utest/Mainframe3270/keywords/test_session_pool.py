@@ -0,0 +1,123 @@
+import pytest
+from pytest_mock import MockerFixture
+from robot.api import logger
+from robot.libraries.BuiltIn import BuiltIn
+from Mainframe3270.keywords import SessionPoolKeywords
+from Mainframe3270.py3270 import Emulator
+from Mainframe3270.sessionpool import SessionPool
+from .utils import create_test_object_for
+
+
+@pytest.fixture
+def under_test():
+    return create_test_object_for(SessionPoolKeywords)
+
+
+@pytest.fixture(autouse=True)
+def empty_pools(mocker: MockerFixture):
+    mocker.patch.object(SessionPool, "_pools", {})
+    mocker.patch("atexit.register")
+
+
+def test_create_session_pool(under_test: SessionPoolKeywords):
+    under_test.create_session_pool("main", "Log In", "Go To Main Menu", 2)
+
+    pool = SessionPool.get("main")
+    assert pool.setup_keyword == "Log In"
+    assert pool.reset_keyword == "Go To Main Menu"
+    assert pool.size == 2
+
+
+def test_create_session_pool_without_reset_keyword(under_test: SessionPoolKeywords):
+    under_test.create_session_pool("main", "Log In")
+
+    assert SessionPool.get("main").reset_keyword is None
+
+
+def test_check_out_session_runs_setup_keyword(mocker: MockerFixture, under_test: SessionPoolKeywords):
+    mocker.patch("robot.libraries.BuiltIn.BuiltIn.run_keyword")
+    under_test.create_session_pool("main", "Log In")
+
+    index = under_test.check_out_session("main")
+
+    BuiltIn.run_keyword.assert_called_once_with("Log In")
+    assert index == 1
+    assert SessionPool.get("main").checked_out == {under_test.mf}
+
+
+def test_check_out_session_reuses_idle_session(mocker: MockerFixture, under_test: SessionPoolKeywords):
+    mocker.patch("robot.libraries.BuiltIn.BuiltIn.run_keyword")
+    mocker.patch("Mainframe3270.py3270.Emulator.is_connected", return_value=True)
+    under_test.create_session_pool("main", "Log In")
+    pooled = Emulator()
+    SessionPool.get("main").idle.append(pooled)
+
+    index = under_test.check_out_session("main")
+
+    BuiltIn.run_keyword.assert_not_called()
+    assert index == 2
+    assert under_test.mf is pooled
+
+
+def test_check_out_session_when_all_sessions_are_checked_out(mocker: MockerFixture, under_test: SessionPoolKeywords):
+    under_test.create_session_pool("main", "Log In")
+    SessionPool.get("main").check_out(under_test.mf)
+
+    with pytest.raises(Exception, match='All 1 sessions of session pool "main" are checked out'):
+        under_test.check_out_session("main")
+
+
+def test_check_in_session(mocker: MockerFixture, under_test: SessionPoolKeywords):
+    mocker.patch("robot.libraries.BuiltIn.BuiltIn.run_keyword")
+    mocker.patch("Mainframe3270.py3270.Emulator.is_connected", return_value=True)
+    under_test.create_session_pool("main", "Log In", "Go To Main Menu")
+    emulator = under_test.mf
+    SessionPool.get("main").check_out(emulator)
+
+    under_test.check_in_session("main")
+
+    BuiltIn.run_keyword.assert_called_once_with("Go To Main Menu")
+    assert SessionPool.get("main").idle == [emulator]
+    assert under_test.cache.current_index is None
+    assert emulator not in under_test.cache
+    assert len(under_test.cache) == 1
+
+
+def test_checked_in_session_can_not_be_switched_to(mocker: MockerFixture, under_test: SessionPoolKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.is_connected", return_value=True)
+    under_test.create_session_pool("main", "Log In")
+    other = Emulator()
+    under_test.cache.register(other, None)
+    under_test.cache.switch(1)
+    SessionPool.get("main").check_out(under_test.mf)
+
+    under_test.check_in_session("main")
+
+    assert under_test.cache.get_connection(2) is other
+    under_test.cache.switch(1)
+    with pytest.raises(RuntimeError, match='The session was checked in to session pool "main"'):
+        under_test.mf.string_get(1, 1, 5)
+
+
+def test_check_in_session_when_reset_fails(mocker: MockerFixture, under_test: SessionPoolKeywords):
+    mocker.patch("robot.libraries.BuiltIn.BuiltIn.run_keyword", side_effect=Exception("not found"))
+    mocker.patch("Mainframe3270.py3270.Emulator.terminate")
+    mocker.patch("robot.api.logger.warn")
+    under_test.create_session_pool("main", "Log In", "Go To Main Menu")
+
+    under_test.check_in_session("main")
+
+    logger.warn.assert_called_with('Resetting the session failed, it is removed from session pool "main": not found')
+    Emulator.terminate.assert_called_once()
+    assert not SessionPool.get("main").idle
+
+
+def test_close_session_pool(mocker: MockerFixture, under_test: SessionPoolKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.terminate")
+    under_test.create_session_pool("main", "Log In")
+    SessionPool.get("main").idle.append(Emulator())
+
+    under_test.close_session_pool("main")
+
+    Emulator.terminate.assert_called_once()
+    assert not SessionPool.get("main").idle
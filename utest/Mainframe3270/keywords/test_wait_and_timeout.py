@@ -1,7 +1,9 @@
+import time
 import pytest
 from pytest_mock import MockerFixture
 from Mainframe3270.keywords import WaitAndTimeoutKeywords
-from Mainframe3270.py3270 import Emulator
+from Mainframe3270.py3270 import CommandError, Emulator
+from Mainframe3270.utils import WaitStrategy
 from .utils import create_test_object_for
 
 
@@ -28,6 +30,12 @@ def test_change_timeout_with_timer_string(under_test: WaitAndTimeoutKeywords):
     assert under_test.timeout == 120
 
 
+def test_change_wait_strategy(under_test: WaitAndTimeoutKeywords):
+    under_test.change_wait_strategy(WaitStrategy.Output)
+
+    assert under_test.wait_strategy == WaitStrategy.Output
+
+
 def test_change_wait_time(under_test: WaitAndTimeoutKeywords):
     under_test.change_wait_time(2.5)
 
@@ -77,7 +85,8 @@ def test_wait_field_detected(mocker: MockerFixture, under_test: WaitAndTimeoutKe
 
 
 def test_wait_until_string(mocker: MockerFixture, under_test: WaitAndTimeoutKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
+    mocker.patch("Mainframe3270.py3270.Emulator.wait_for_output", side_effect=lambda timeout: time.sleep(timeout))
 
     txt = under_test.wait_until_string("abc")
 
@@ -85,21 +94,92 @@ def test_wait_until_string(mocker: MockerFixture, under_test: WaitAndTimeoutKeyw
 
 
 def test_wait_until_string_string_not_found(mocker: MockerFixture, under_test: WaitAndTimeoutKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
+    mocker.patch("Mainframe3270.py3270.Emulator.wait_for_output", side_effect=lambda timeout: time.sleep(timeout))
 
     with pytest.raises(Exception, match='String "def" not found in 1 second'):
         under_test.wait_until_string("def", 1)
 
 
 def test_wait_until_string_with_time_time_string(mocker: MockerFixture, under_test: WaitAndTimeoutKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
+    mocker.patch("Mainframe3270.py3270.Emulator.wait_for_output", side_effect=lambda timeout: time.sleep(timeout))
 
     with pytest.raises(Exception, match='String "def" not found in 500 milliseconds'):
         under_test.wait_until_string("def", "500 millis")
 
 
 def test_wait_until_string_with_time_timer_string(mocker: MockerFixture, under_test: WaitAndTimeoutKeywords):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
+    mocker.patch("Mainframe3270.py3270.Emulator.wait_for_output", side_effect=lambda timeout: time.sleep(timeout))
 
     with pytest.raises(Exception, match='String "def" not found in 500 milliseconds'):
         under_test.wait_until_string("def", "00:00:00.500")
+
+
+def test_wait_until_string_waits_for_output_between_checks(mocker: MockerFixture, under_test: WaitAndTimeoutKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", side_effect=[["abc"], ["abc"], ["def"]])
+    mocker.patch("Mainframe3270.py3270.Emulator.wait_for_output", return_value=True)
+
+    txt = under_test.wait_until_string("def")
+
+    assert txt == "def"
+    assert Emulator.read_screen_rows.call_count == 3
+    assert Emulator.wait_for_output.call_count == 2
+
+
+def test_wait_until_string_does_not_read_unchanged_screen_again(
+    mocker: MockerFixture, under_test: WaitAndTimeoutKeywords
+):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", side_effect=[["abc"], ["def"]])
+    mocker.patch("Mainframe3270.py3270.Emulator.wait_for_output", side_effect=[False, False, True])
+
+    txt = under_test.wait_until_string("def")
+
+    assert txt == "def"
+    assert Emulator.read_screen_rows.call_count == 2
+    assert Emulator.wait_for_output.call_count == 3
+
+
+def test_wait_until_string_reads_unchanged_screen_after_rescan_interval(
+    mocker: MockerFixture, under_test: WaitAndTimeoutKeywords
+):
+    mocker.patch("Mainframe3270.keywords.WaitAndTimeoutKeywords.RESCAN_INTERVAL", 0)
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", side_effect=[["abc"], ["def"]])
+    mocker.patch("Mainframe3270.py3270.Emulator.wait_for_output", return_value=False)
+
+    txt = under_test.wait_until_string("def")
+
+    assert txt == "def"
+    assert Emulator.wait_for_output.call_count == 1
+
+
+def test_wait_until_string_does_not_overrun_short_timeout(mocker: MockerFixture, under_test: WaitAndTimeoutKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
+    mocker.patch("Mainframe3270.py3270.Emulator.wait_for_output")
+
+    with pytest.raises(Exception, match='String "def" not found in 200 milliseconds'):
+        under_test.wait_until_string("def", 0.2)
+
+    Emulator.wait_for_output.assert_not_called()
+
+
+def test_wait_until_string_fails_if_emulator_can_not_wait(mocker: MockerFixture, under_test: WaitAndTimeoutKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"] * 24)
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_command", side_effect=CommandError("Not connected"))
+
+    with pytest.raises(CommandError, match="Not connected"):
+        under_test.wait_until_string("def")
+
+    assert Emulator.read_screen_rows.call_count == 1
+
+
+def test_wait_until_string_in_region(mocker: MockerFixture, under_test: WaitAndTimeoutKeywords):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_region", side_effect=[["abc"], ["def"]])
+    mocker.patch("Mainframe3270.py3270.Emulator.wait_for_output", return_value=True)
+
+    txt = under_test.wait_until_string("def", region=(22, 1, 3, 80))
+
+    assert txt == "def"
+    Emulator.read_region.assert_called_with(22, 1, 3, 80)
+    assert Emulator.read_region.call_count == 2
@@ -1,15 +1,23 @@
 import os
 from Mainframe3270 import Mainframe3270
+from Mainframe3270.py3270 import AppPool
+from Mainframe3270.utils import Engine, WaitStrategy
 
 
 def test_default_args():
     under_test = Mainframe3270()
     assert under_test.visible is True
     assert under_test.timeout == 30
+    assert under_test.command_timeout == 60
+    assert under_test.snapshot_max_age == 1
     assert under_test.wait_time == 0.5
     assert under_test.wait_time_after_write == 0.0
     assert under_test.img_folder == os.getcwd()
     assert under_test.model == "2"
+    assert under_test.wait_strategy == WaitStrategy.Fixed
+    assert under_test.write_behind is False
+    assert under_test.app_pool is None
+    assert under_test.engine == Engine.Executable
     under_test.mf is None
 
 
@@ -18,3 +26,25 @@ def test_import_with_time_string():
     assert under_test.timeout == 30
     assert under_test.wait_time == 0.5
     assert under_test.wait_time_after_write == 60
+
+
+def test_import_with_command_timeout():
+    assert Mainframe3270(command_timeout="2 minutes").command_timeout == 120
+    assert Mainframe3270(command_timeout=None).command_timeout is None
+
+
+def test_import_with_snapshot_max_age():
+    assert Mainframe3270(snapshot_max_age="500 milliseconds").snapshot_max_age == 0.5
+
+
+def test_import_with_unicode_replacements():
+    under_test = Mainframe3270(unicode_replacements={"Ü": "U"})
+
+    assert under_test.unicode_replacements == {"Ü": "U"}
+
+
+def test_import_with_process_pool_size():
+    under_test = Mainframe3270(process_pool_size=2)
+
+    assert under_test.app_pool is AppPool.shared(1)
+    assert under_test.app_pool.size == 2
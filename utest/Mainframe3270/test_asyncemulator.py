@@ -0,0 +1,198 @@
+import asyncio
+import pytest
+from pytest_mock import MockerFixture
+from Mainframe3270.asyncemulator import AsyncEmulator
+from Mainframe3270.py3270 import CommandError, CommandTimeoutError, KeyboardStateError, TerminatedError
+
+STATUS_LINE = b"U F U C(pub400.com) I 4 24 80 0 0 0x0 0.000"
+
+
+class FakeProcess:
+    """Answers every command written to stdin with the next of the given responses."""
+
+    def __init__(self, responses, stderr=b""):
+        self.stdout = asyncio.StreamReader()
+        self.stderr = asyncio.StreamReader()
+        self.stderr.feed_data(stderr)
+        self.stderr.feed_eof()
+        self.stdin = self
+        self.commands = []
+        self.responses = list(responses)
+        self.returncode = None
+
+    def write(self, data):
+        self.commands.append(data)
+        if self.responses:
+            self.stdout.feed_data(self.responses.pop(0))
+
+    def kill(self):
+        self.returncode = -9
+
+    async def wait(self):
+        self.returncode = self.returncode or 0
+        return self.returncode
+
+
+def response(*data, status=STATUS_LINE, result=b"ok"):
+    return b"".join(b"data: " + line + b"\n" for line in data) + status + b"\n" + result + b"\n"
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture
+def create_process(mocker: MockerFixture):
+    def create(*responses, stderr=b""):
+        process = None
+
+        async def create_subprocess_exec(*args, **kwargs):
+            nonlocal process
+            process = FakeProcess(responses, stderr)
+            process.args = args
+            return process
+
+        mocker.patch("asyncio.create_subprocess_exec", side_effect=create_subprocess_exec)
+        return lambda: process
+
+    return create
+
+
+def test_args(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.asyncemulator.os_name", "posix")
+
+    under_test = AsyncEmulator(extra_args=["-port", "992"], model="4")
+
+    assert under_test.executable == "s3270"
+    assert under_test.args == ["-xrm", "s3270.unlockDelay: False", "-xrm", "*model: 4", "-port", "992"]
+    assert under_test.model_dimensions == {"rows": 43, "columns": 80}
+
+
+def test_visible_on_windows_raises_ValueError(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.asyncemulator.os_name", "nt")
+
+    with pytest.raises(ValueError, match="wc3270 can not be driven asynchronously"):
+        AsyncEmulator(visible=True)
+
+
+def test_exec_command(create_process):
+    process = create_process(response(b"abc", b"def"))
+
+    async def test():
+        under_test = AsyncEmulator()
+        command = await under_test.exec_command(b"Ascii(0,0,2,3)")
+        return under_test, command
+
+    under_test, command = run(test())
+
+    assert process().commands == [b"Ascii(0,0,2,3)\n"]
+    assert command.data == [b"abc", b"def"]
+    assert under_test.status.connection_state == b"C(pub400.com)"
+
+
+def test_exec_command_error(create_process):
+    create_process(response(b"invalid command", result=b"error"))
+
+    with pytest.raises(CommandError, match="invalid command"):
+        run(AsyncEmulator().exec_command(b"Wrong"))
+
+
+def test_exec_command_timeout(create_process):
+    process = create_process()
+
+    async def test():
+        under_test = AsyncEmulator(command_timeout=0.01)
+        with pytest.raises(CommandTimeoutError, match="The emulator did not answer within 0.01 seconds"):
+            await under_test.exec_command(b"Enter")
+        return under_test
+
+    under_test = run(test())
+
+    assert under_test.is_terminated
+    assert process().returncode == -9
+
+
+def test_exec_command_after_terminate_raises_TerminatedError():
+    under_test = AsyncEmulator()
+    under_test.is_terminated = True
+
+    with pytest.raises(TerminatedError):
+        run(under_test.exec_command(b"Enter"))
+
+
+def test_concurrent_commands_are_sent_one_after_another(create_process):
+    create_process(response(b"first"), response(b"second"))
+
+    async def test():
+        under_test = AsyncEmulator()
+        return await asyncio.gather(under_test.exec_command(b"First"), under_test.exec_command(b"Second"))
+
+    first, second = run(test())
+
+    assert first.data == [b"first"]
+    assert second.data == [b"second"]
+
+
+def test_connect_and_terminate(create_process):
+    process = create_process(response(), response(), response(), stderr=b"some error\n")
+
+    async def test():
+        async with AsyncEmulator() as under_test:
+            await under_test.connect("pub400.com")
+            assert await under_test.is_connected()
+        return under_test
+
+    under_test = run(test())
+
+    assert process().commands == [b"Connect(pub400.com)\n", b"ignore\n", b"Quit\n"]
+    assert under_test.last_host == "pub400.com"
+    assert under_test.is_terminated
+    assert under_test.get_stderr() == "some error"
+
+
+def test_wait_for_field(create_process):
+    process = create_process(response())
+
+    run(AsyncEmulator(timeout=5).wait_for_field())
+
+    assert process().commands == [b"Wait(5, InputField)\n"]
+
+
+def test_wait_for_field_keyboard_locked(create_process):
+    create_process(response(status=b"L F U C(pub400.com) I 4 24 80 0 0 0x0 0.000"))
+
+    with pytest.raises(KeyboardStateError, match="keyboard not unlocked, state was: L"):
+        run(AsyncEmulator().wait_for_field())
+
+
+def test_send_string(create_process):
+    process = create_process(response(), response())
+
+    run(AsyncEmulator().send_string(b"abc", 5, 10))
+
+    assert process().commands == [b"MoveCursor(4, 9)\n", b'String("abc")\n']
+
+
+def test_string_get(create_process):
+    process = create_process(response(b"abc"))
+
+    assert run(AsyncEmulator().string_get(5, 10, 3)) == "abc"
+    assert process().commands == [b"ascii(4,9,3)\n"]
+
+
+def test_string_get_exceeds_x_axis():
+    with pytest.raises(Exception, match="You have exceeded the x-axis limit of the mainframe screen"):
+        run(AsyncEmulator().string_get(1, 79, 3))
+
+
+def test_read_all_screen(create_process):
+    process = create_process(response(b"\xe2\x94\x80abc", *[b""] * 23))
+
+    assert run(AsyncEmulator().read_all_screen()) == "-abc"
+    assert process().commands == [b"ascii(0,0,24,80)\n"]
+
+
+def test_search_string(create_process):
+    create_process(response(b"ABC", b"def"))
+
+    assert run(AsyncEmulator().search_string("abc", ignore_case=True))
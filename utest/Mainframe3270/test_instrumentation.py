@@ -0,0 +1,214 @@
+import asyncio
+import json
+import os
+import time
+import pytest
+from pytest_mock import MockerFixture
+from robot.api import logger
+from robot.result import TestSuite as ResultSuite
+from Mainframe3270 import Mainframe3270
+from Mainframe3270.instrumentation import Instrumentation, KeywordRecord
+from Mainframe3270.py3270 import Emulator
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "instrumentation.jsonl")
+
+
+@pytest.fixture
+def under_test(path):
+    return Instrumentation(path)
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def create_test():
+    suite = ResultSuite(name="Suite")
+    return suite.tests.create(name="Test", status="PASS")
+
+
+def test_instrumentation_is_disabled_by_default():
+    library = Mainframe3270()
+
+    assert library.instrumentation is None
+    assert not hasattr(library, "ROBOT_LIBRARY_LISTENER")
+
+
+def test_import_with_instrumentation_file(tmp_path):
+    library = Mainframe3270(instrumentation_file=str(tmp_path / "library.jsonl"))
+
+    assert library.instrumentation is Instrumentation.shared(str(tmp_path / "library.jsonl"))
+    assert library.ROBOT_LIBRARY_LISTENER == [library.instrumentation]
+    assert os.path.isfile(tmp_path / "library.jsonl")
+
+
+def test_relative_instrumentation_file_is_in_output_directory(mocker: MockerFixture, tmp_path):
+    mocker.patch("robot.libraries.BuiltIn.BuiltIn.get_variable_value", return_value=str(tmp_path))
+
+    library = Mainframe3270(instrumentation_file="relative.jsonl")
+
+    assert library.instrumentation.path == str(tmp_path / "relative.jsonl")
+
+
+def test_shared_instrumentation_is_created_once(path):
+    assert Instrumentation.shared(path) is Instrumentation.shared(path)
+
+
+def test_run_keyword_splits_time(mocker: MockerFixture, under_test: Instrumentation):
+    mocker.patch("time.perf_counter", side_effect=[0.0, 1.0, 3.0, 4.0, 7.0, 10.0])
+    mocker.patch("time.sleep")
+
+    def keyword():
+        under_test.emulator_call(lambda command: command, 1, b"Enter")
+        under_test.sleep(0.5)
+        return "result"
+
+    assert under_test.run_keyword("Send Enter", keyword) == "result"
+
+    [record] = under_test.records
+    assert (record.name, record.commands) == ("Send Enter", 1)
+    assert (record.seconds, record.emulator_seconds, record.sleep_seconds, record.python_seconds) == (10, 2, 3, 5)
+
+
+def test_run_keyword_records_failing_keyword(under_test: Instrumentation):
+    def keyword():
+        raise ValueError("my error message")
+
+    with pytest.raises(ValueError, match="my error message"):
+        under_test.run_keyword("Failing", keyword)
+
+    assert [record.name for record in under_test.records] == ["Failing"]
+
+
+def test_run_keyword_records_asynchronous_keyword_when_awaited(under_test: Instrumentation):
+    async def keyword():
+        under_test.emulator_call(lambda: None, 2)
+        return "result"
+
+    coroutine = under_test.run_keyword("Async", keyword)
+
+    assert under_test.records == []
+    assert asyncio.run(coroutine) == "result"
+    assert [(record.name, record.commands) for record in under_test.records] == [("Async", 2)]
+
+
+def test_nested_keywords_are_part_of_the_calling_keyword(under_test: Instrumentation):
+    def inner():
+        under_test.emulator_call(lambda: None, 1)
+
+    def outer():
+        under_test.run_keyword("Inner", inner)
+        under_test.emulator_call(lambda: None, 1)
+
+    under_test.run_keyword("Outer", outer)
+
+    assert [(record.name, record.commands) for record in under_test.records] == [("Outer", 2)]
+
+
+def test_nested_emulator_calls_are_recorded_once(under_test: Instrumentation):
+    def keyword():
+        under_test.emulator_call(lambda: under_test.emulator_call(lambda: None, 3), 1)
+
+    under_test.run_keyword("Keyword", keyword)
+
+    assert under_test.records[0].commands == 1
+
+
+def test_emulator_calls_outside_of_keywords_are_not_recorded(under_test: Instrumentation):
+    assert under_test.emulator_call(lambda value: value, 1, "value") == "value"
+
+    assert under_test.records == []
+
+
+def test_library_records_commands_and_waits(mocker: MockerFixture, path: str):
+    mocker.patch("Mainframe3270.py3270.Emulator._exec_command")
+    mocker.patch("Mainframe3270.py3270.Emulator._exec_batch")
+    mocker.patch("time.sleep")
+    library = Mainframe3270(instrumentation_file=path, run_on_failure_keyword="None")
+    library.cache.register(Emulator(instrumentation=library.instrumentation), None)
+
+    library.run_keyword("Send Enter", [], {})
+    library.run_keyword("Execute Commands", ["Tab", "Home"], {})
+
+    records = library.instrumentation._take_records()
+    assert [(record.name, record.commands) for record in records] == [("Send Enter", 1), ("Execute Commands", 2)]
+    time.sleep.assert_called_with(library.wait_time)
+
+
+def test_library_sleeps_without_instrumentation(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_command")
+    mocker.patch("time.sleep")
+    library = Mainframe3270(run_on_failure_keyword="None")
+    library.cache.register(Emulator(), None)
+
+    library.run_keyword("Send Enter", [], {})
+
+    Emulator.exec_command.assert_called_once_with(b"Enter")
+
+
+def test_end_test_logs_summary_and_writes_line(mocker: MockerFixture, under_test: Instrumentation, path: str):
+    mocker.patch("robot.api.logger.info")
+    record = KeywordRecord("Send Enter")
+    record.commands, record.seconds, record.emulator_seconds, record.sleep_seconds = 1, 1.0, 0.25, 0.5
+    under_test.records = [record, KeywordRecord("Read")]
+    test = create_test()
+
+    under_test.end_test(None, test)
+    under_test.end_test(None, test)
+
+    logger.info.assert_called_once_with(
+        "Mainframe3270 keywords: 2 calls, 1 emulator commands, 1.000 s, of which 0.250 s emulator I/O, "
+        "0.500 s sleeping and 0.250 s Python\n"
+        "Keyword                                  Calls Commands   Total s Emulator s   Sleep s  Python s\n"
+        "Send Enter                                   1        1     1.000      0.250     0.500     0.250\n"
+        "Read                                         1        0     0.000      0.000     0.000     0.000"
+    )
+    [line] = read_lines(path)
+    assert line == {
+        "suite": "Suite",
+        "test": "Test",
+        "status": "PASS",
+        "keywords": 2,
+        "commands": 1,
+        "seconds": 1.0,
+        "emulator_seconds": 0.25,
+        "sleep_seconds": 0.5,
+        "python_seconds": 0.25,
+        "details": [record.to_dict(), KeywordRecord("Read").to_dict()],
+    }
+    assert under_test.records == []
+
+
+def test_keywords_outside_of_tests_are_written_without_test_name(
+    mocker: MockerFixture, under_test: Instrumentation, path: str
+):
+    mocker.patch("robot.api.logger.info")
+    test = create_test()
+    under_test.records = [KeywordRecord("Open Connection")]
+    under_test.start_test(None, test)
+    under_test.end_test(None, test)
+    under_test.records = [KeywordRecord("Close All Connections")]
+
+    under_test.end_suite(None, test.parent)
+    under_test.end_suite(None, test.parent)
+
+    lines = read_lines(path)
+    assert [(line["test"], line["status"], line["keywords"]) for line in lines] == [
+        (None, None, 1),
+        ("Test", "PASS", 0),
+        (None, None, 1),
+    ]
+    assert lines[2]["details"][0]["keyword"] == "Close All Connections"
+
+
+def test_new_instrumentation_overwrites_file(path: str):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("old results\n")
+
+    Instrumentation(path)
+
+    assert read_lines(path) == []
@@ -23,6 +23,8 @@ def test_librarycomponent_returns_common_attributes():
     assert library.cache == under_test.cache
     assert library.mf == under_test.mf
     assert library.model == under_test.model
+    assert library.wait_strategy == under_test.wait_strategy
+    assert library.write_behind == under_test.write_behind
 
 
 def test_can_set_visible():
@@ -1,7 +1,10 @@
+import asyncio
 import pytest
 from pytest_mock import MockerFixture
 from robot.api import logger
+from robot.libraries.BuiltIn import BuiltIn
 from Mainframe3270 import Mainframe3270
+from Mainframe3270.py3270 import Emulator
 
 
 def test_register_run_on_failure_keyword():
@@ -36,3 +39,43 @@ def test_run_on_failure_could_not_be_run(mocker: MockerFixture):
     with pytest.raises(Exception, match="my error message"):
         under_test.run_keyword("Keyword", None, None)
         logger.warn.assert_called_with("Keyword 'Keyword' could not be run on failure: my error message")
+
+
+def test_emulator_error_output_is_logged_on_failure(mocker: MockerFixture):
+    mocker.patch("robotlibcore.DynamicCore.run_keyword", side_effect=Exception("my error message"))
+    mocker.patch("robot.api.logger.info")
+    under_test = Mainframe3270(run_on_failure_keyword="None")
+    emulator = Emulator()
+    emulator.app.stderr_lines.append("TLS warning")
+    under_test.cache.register(emulator, None)
+
+    with pytest.raises(Exception, match="my error message"):
+        under_test.run_keyword("Keyword", None, None)
+
+    logger.info.assert_called_with("Emulator error output:\nTLS warning")
+
+
+def test_emulator_error_output_without_connection(mocker: MockerFixture):
+    mocker.patch("robotlibcore.DynamicCore.run_keyword", side_effect=Exception("my error message"))
+    mocker.patch("robot.api.logger.info")
+    under_test = Mainframe3270(run_on_failure_keyword="None")
+
+    with pytest.raises(Exception, match="my error message"):
+        under_test.run_keyword("Keyword", None, None)
+
+    logger.info.assert_not_called()
+
+
+def test_run_on_failure_of_async_keyword(mocker: MockerFixture):
+    async def failing_keyword():
+        raise Exception("my error message")
+
+    mocker.patch("robotlibcore.DynamicCore.run_keyword", side_effect=lambda *args: failing_keyword())
+    mocker.patch("robot.libraries.BuiltIn.BuiltIn.run_keyword")
+    under_test = Mainframe3270()
+
+    result = under_test.run_keyword("Keyword", None, None)
+
+    with pytest.raises(Exception, match="my error message"):
+        asyncio.run(result)
+    BuiltIn.run_keyword.assert_called_once_with("Take Screenshot")
@@ -0,0 +1,102 @@
+import pytest
+from pytest_mock import MockerFixture
+from Mainframe3270.py3270 import Emulator
+from Mainframe3270.sessionpool import SessionPool, is_healthy
+
+
+@pytest.fixture(autouse=True)
+def empty_pools(mocker: MockerFixture):
+    mocker.patch.object(SessionPool, "_pools", {})
+    mocker.patch("atexit.register")
+
+
+def _emulator(mocker: MockerFixture, connected: bool = True) -> Emulator:
+    emulator = Emulator()
+    mocker.patch.object(emulator, "is_connected", return_value=connected)
+    mocker.patch.object(emulator, "terminate")
+    return emulator
+
+
+def test_create_keeps_existing_pool():
+    pool = SessionPool.create("main", 1, "Log In")
+    pool.idle.append("session")
+
+    under_test = SessionPool.create("main", 2, "Log In Again", "Reset")
+
+    assert under_test is pool
+    assert under_test.idle == ["session"]
+    assert under_test.size == 2
+    assert under_test.setup_keyword == "Log In Again"
+    assert under_test.reset_keyword == "Reset"
+
+
+def test_get_unknown_pool():
+    with pytest.raises(ValueError, match='There is no session pool with the name "unknown"'):
+        SessionPool.get("unknown")
+
+
+def test_take_idle_drops_disconnected_sessions(mocker: MockerFixture):
+    under_test = SessionPool.create("main", 2, "Log In")
+    disconnected = _emulator(mocker, connected=False)
+    connected = _emulator(mocker)
+    under_test.idle = [disconnected, connected]
+
+    assert under_test.take_idle() is connected
+    disconnected.terminate.assert_called_once()
+    assert under_test.checked_out == {connected}
+    assert under_test.take_idle() is None
+
+
+def test_has_capacity_ignores_closed_sessions(mocker: MockerFixture):
+    under_test = SessionPool.create("main", 1, "Log In")
+    emulator = _emulator(mocker)
+    under_test.check_out(emulator)
+
+    assert not under_test.has_capacity()
+
+    emulator.is_terminated = True
+
+    assert under_test.has_capacity()
+
+
+def test_check_in(mocker: MockerFixture):
+    under_test = SessionPool.create("main", 1, "Log In")
+    emulator = _emulator(mocker)
+    under_test.check_out(emulator)
+
+    under_test.check_in(emulator)
+
+    assert under_test.idle == [emulator]
+    assert not under_test.checked_out
+
+
+def test_check_in_terminates_disconnected_session(mocker: MockerFixture):
+    under_test = SessionPool.create("main", 1, "Log In")
+    emulator = _emulator(mocker, connected=False)
+    under_test.check_out(emulator)
+
+    under_test.check_in(emulator)
+
+    assert not under_test.idle
+    emulator.terminate.assert_called_once()
+
+
+def test_close_all(mocker: MockerFixture):
+    emulator = _emulator(mocker)
+    SessionPool.create("main", 1, "Log In").idle.append(emulator)
+
+    SessionPool.close_all()
+
+    emulator.terminate.assert_called_once()
+    assert not SessionPool._pools
+
+
+def test_is_healthy(mocker: MockerFixture):
+    emulator = _emulator(mocker)
+    assert is_healthy(emulator)
+
+    emulator.is_connected.side_effect = BrokenPipeError
+    assert not is_healthy(emulator)
+
+    emulator.is_terminated = True
+    assert not is_healthy(emulator)
@@ -1,10 +1,13 @@
+import re
 from datetime import timedelta
 from pytest_mock import MockerFixture
 from robot.api import logger
 from Mainframe3270.utils import (
     ResultMode,
+    compile_regex,
     convert_timeout,
     coordinates_to_dict,
+    get_matcher,
     prepare_position_as,
     prepare_positions_as,
 )
@@ -49,3 +52,20 @@ def test_prepare_positions_as_invalid_mode(mocker: MockerFixture):
 
 def test_coordinates_to_dict():
     assert coordinates_to_dict(1, 5) == {"ypos": 1, "xpos": 5}
+
+
+def test_compile_regex_is_cached():
+    pattern = compile_regex(r"\d+", re.MULTILINE)
+
+    assert pattern.flags & re.MULTILINE
+    assert compile_regex(r"\d+", re.MULTILINE) is pattern
+    assert compile_regex(r"\d+") is not pattern
+
+
+def test_get_matcher_is_cached():
+    matcher = get_matcher("*a?c*")
+
+    assert matcher.match("xabc")
+    assert not matcher.match("xABC")
+    assert get_matcher("*a?c*") is matcher
+    assert get_matcher("*a?c*", caseless=True) is not matcher
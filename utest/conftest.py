@@ -4,4 +4,6 @@ from pytest_mock import MockerFixture
 
 @pytest.fixture(autouse=True)
 def mock_subprocess(mocker: MockerFixture):
-    mocker.patch("subprocess.Popen")
+    popen = mocker.patch("subprocess.Popen")
+    # make the background thread that drains the emulator's stderr stop right away
+    popen.return_value.stderr.readline.return_value = b""
@@ -0,0 +1,99 @@
+import threading
+from collections import deque
+import pytest
+from pytest_mock import MockerFixture
+from Mainframe3270.py3270 import AppPool, Emulator, s3270App, wc3270App
+
+
+@pytest.fixture
+def no_background_refill(mocker: MockerFixture):
+    mocker.patch("threading.Thread")
+
+
+def _alive_app(mocker: MockerFixture):
+    app = mocker.MagicMock()
+    app.sp.poll.return_value = None
+    return app
+
+
+@pytest.mark.usefixtures("no_background_refill")
+def test_checkout_spawns_app_if_pool_is_empty():
+    under_test = AppPool(2)
+
+    app = under_test.checkout(s3270App, ["-utf8"], "2")
+
+    assert isinstance(app, s3270App)
+    assert app.args[-1] == "-utf8"
+    threading.Thread.assert_any_call(
+        target=under_test._refill,
+        args=((s3270App, ("-utf8",), "2"),),
+        name="emulator-pool-refill",
+        daemon=True,
+    )
+
+
+@pytest.mark.usefixtures("no_background_refill")
+def test_checkout_returns_pre_spawned_app(mocker: MockerFixture):
+    under_test = AppPool(2)
+    pooled_app = _alive_app(mocker)
+    under_test._apps[(s3270App, ("-utf8",), "2")] = deque([pooled_app])
+
+    assert under_test.checkout(s3270App, ["-utf8"], "2") is pooled_app
+
+
+@pytest.mark.usefixtures("no_background_refill")
+def test_checkout_skips_exited_apps(mocker: MockerFixture):
+    under_test = AppPool(2)
+    exited_app = _alive_app(mocker)
+    exited_app.sp.poll.return_value = 1
+    pooled_app = _alive_app(mocker)
+    key = (s3270App, (), "2")
+    under_test._apps[key] = deque([exited_app, pooled_app])
+
+    assert under_test.checkout(s3270App, None, "2") is pooled_app
+    exited_app.kill.assert_called_once()
+
+
+def test_refill_spawns_apps_up_to_size(mocker: MockerFixture):
+    under_test = AppPool(3)
+    key = (s3270App, ("-utf8",), "4")
+    under_test._apps[key] = deque([_alive_app(mocker)])
+    under_test._refilling.add(key)
+
+    under_test._refill(key)
+
+    assert len(under_test._apps[key]) == 3
+    assert under_test._apps[key][-1].args[-3:] == ["-xrm", "*model: 4", "-utf8"]
+    assert key not in under_test._refilling
+
+
+def test_close_kills_pooled_apps(mocker: MockerFixture):
+    under_test = AppPool()
+    pooled_app = _alive_app(mocker)
+    under_test._apps[(s3270App, (), "2")] = deque([pooled_app])
+
+    under_test.close()
+
+    pooled_app.kill.assert_called_once()
+    under_test._start_refill((s3270App, (), "2"))
+    assert not under_test._refilling
+
+
+@pytest.mark.usefixtures("mock_posix")
+def test_emulator_takes_app_from_pool(mocker: MockerFixture):
+    app_pool = mocker.MagicMock(spec=AppPool)
+
+    under_test = Emulator(extra_args=["-utf8"], model="3", app_pool=app_pool)
+
+    app_pool.checkout.assert_called_once_with(s3270App, ["-utf8"], "3")
+    assert under_test.app is app_pool.checkout.return_value
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_emulator_does_not_take_wc3270_from_pool(mocker: MockerFixture):
+    app_pool = mocker.MagicMock(spec=AppPool)
+
+    under_test = Emulator(visible=True, app_pool=app_pool)
+
+    app_pool.checkout.assert_not_called()
+    assert isinstance(under_test.app, wc3270App)
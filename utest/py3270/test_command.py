@@ -9,7 +9,6 @@ from Mainframe3270.py3270 import Command, CommandError, Emulator, s3270App, wc32
 
 
 def test_command_default(mocker: MockerFixture):
-    mocker.patch("subprocess.Popen")
     app = Emulator()
 
     under_test = Command(app, b"abc")
@@ -20,8 +19,11 @@ def test_command_default(mocker: MockerFixture):
     assert under_test.data == []
 
 
+def test_command_has_no_instance_dict():
+    assert not hasattr(Command(None, b"abc"), "__dict__")
+
+
 def test_command_with_text_type(mocker: MockerFixture):
-    mocker.patch("subprocess.Popen")
     mocker.patch("warnings.warn")
     app = Emulator()
 
@@ -32,7 +34,6 @@ def test_command_with_text_type(mocker: MockerFixture):
 
 
 def test_execute(mocker: MockerFixture):
-    mocker.patch("subprocess.Popen")
     mocker.patch(
         "Mainframe3270.py3270.ExecutableApp.readline",
         side_effect=[
@@ -50,7 +51,6 @@ def test_execute(mocker: MockerFixture):
 
 
 def test_handle_result_quit(mocker: MockerFixture):
-    mocker.patch("subprocess.Popen")
     mocker.patch("Mainframe3270.py3270.ExecutableApp.readline", return_value=b"")
     app = x3270App()
     under_test = Command(app, b"Quit")
@@ -59,7 +59,6 @@ def test_handle_result_quit(mocker: MockerFixture):
 
 
 def test_handle_result_error(mocker: MockerFixture):
-    mocker.patch("subprocess.Popen")
     mocker.patch("Mainframe3270.py3270.ExecutableApp.readline", return_value=b"error")
     app = s3270App()
     under_test = Command(app, b"abc")
@@ -69,7 +68,6 @@ def test_handle_result_error(mocker: MockerFixture):
 
 
 def test_handle_result_with_data(mocker: MockerFixture):
-    mocker.patch("subprocess.Popen")
     mocker.patch(
         "Mainframe3270.py3270.ExecutableApp.readline",
         side_effect=[
@@ -1,8 +1,25 @@
 import errno
+import re
+import time
 import pytest
 from pytest_mock import MockerFixture
 from Mainframe3270 import py3270
-from Mainframe3270.py3270 import Command, Emulator, TerminatedError
+from Mainframe3270.py3270 import (
+    BatchCommandError,
+    Command,
+    CommandError,
+    CommandTimeoutError,
+    Emulator,
+    Field,
+    FieldMap,
+    FieldTruncateError,
+    ScreenSnapshot,
+    TerminatedError,
+    _get_string_automaton,
+    get_command_timeout,
+    s3270App,
+)
+from Mainframe3270.tn3270 import NativeApp
 
 
 @pytest.mark.usefixtures("mock_windows")
@@ -100,6 +117,30 @@ def test_emulator_sets_model_dimensions(model, model_dimensions):
     assert under_test.model_dimensions == model_dimensions
 
 
+def test_native_engine():
+    under_test = Emulator(engine="native", extra_args=["-port", "992"], model="3")
+
+    assert isinstance(under_test.app, NativeApp)
+    assert under_test.app.port == 992
+    assert under_test.app.screen.alternate_size == (32, 80)
+
+
+@pytest.mark.usefixtures("mock_posix")
+def test_executable_override_is_not_taken_from_app_pool(mocker: MockerFixture):
+    app_pool = mocker.Mock()
+
+    under_test = Emulator(app_pool=app_pool, executable=["python", "-m", "fake_s3270"])
+
+    app_pool.checkout.assert_not_called()
+    assert isinstance(under_test.app, s3270App)
+    assert under_test.app.executable == ["python", "-m", "fake_s3270"]
+
+
+def test_unknown_engine_raises_ValueError():
+    with pytest.raises(ValueError, match="Engine should be 'executable' or 'native', but was 'wrong engine'."):
+        Emulator(engine="wrong engine")
+
+
 @pytest.mark.usefixtures("mock_windows")
 def test_set_model_dimensions_raises_ValueError():
     under_test = Emulator()
@@ -117,6 +158,161 @@ def test_exec_command_when_is_terminated():
         under_test.exec_command(b"abc")
 
 
+@pytest.mark.usefixtures("mock_windows")
+def test_exec_batch(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.wc3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.wc3270App.readline",
+        side_effect=[
+            b"U F U C(pub400.com) I 2 24 80 0 4 0x0 0.000",
+            b"ok",
+            b"data: abc",
+            b"U F U C(pub400.com) I 2 24 80 0 4 0x0 0.000",
+            b"ok",
+        ],
+    )
+    under_test = Emulator(True)
+
+    commands = under_test.exec_batch([b"MoveCursor(0, 4)", b"ascii(0,4,3)"])
+
+    under_test.app.write.assert_called_once_with(b"MoveCursor(0, 4)\nascii(0,4,3)\n")
+    assert [command.data for command in commands] == [[], [b"abc"]]
+    assert under_test.status.cursor_col == b"4"
+    assert under_test.screen_generation == 1
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_exec_batch_raises_first_error_and_reads_all_replies(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.wc3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.wc3270App.readline",
+        side_effect=[
+            b"U F U C(pub400.com) I 2 24 80 0 4 0x0 0.000",
+            b"ok",
+            b"data: Keyboard locked",
+            b"L F U C(pub400.com) I 2 24 80 0 4 0x0 0.000",
+            b"error",
+            b"data: Keyboard locked",
+            b"L F U C(pub400.com) I 2 24 80 0 4 0x0 0.000",
+            b"error",
+        ],
+    )
+    under_test = Emulator(True)
+
+    with pytest.raises(BatchCommandError, match=r"Command 1 \(String\(\"abc\"\)\) failed: Keyboard locked") as error:
+        under_test.exec_batch([b"MoveCursor(0, 4)", b'String("abc")', b"Tab"])
+
+    assert error.value.index == 1
+    assert len(error.value.commands) == 3
+    assert under_test.app.readline.call_count == 8
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_exec_batch_when_is_terminated():
+    under_test = Emulator()
+    under_test.is_terminated = True
+
+    with pytest.raises(TerminatedError, match="This Emulator instance has been terminated"):
+        under_test.exec_batch([b"abc"])
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_write_behind_queues_writes_until_result_is_needed(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.wc3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.wc3270App.readline",
+        side_effect=[
+            b"U F U C(pub400.com) I 2 24 80 4 9 0x0 0.000",
+            b"ok",
+            b"U F U C(pub400.com) I 2 24 80 4 9 0x0 0.000",
+            b"ok",
+            b"U F U C(pub400.com) I 2 24 80 4 12 0x0 0.000",
+            b"ok",
+            b"data: 4 12",
+            b"U F U C(pub400.com) I 2 24 80 4 12 0x0 0.000",
+            b"ok",
+        ],
+    )
+    under_test = Emulator(True, write_behind=True)
+
+    under_test.fill_field(5, 10, b"abc", 5)
+    under_test.app.write.assert_not_called()
+
+    assert under_test.get_current_position() == (5, 13)
+    under_test.app.write.assert_called_once_with(b'MoveCursor(4, 9)\nDeleteField\nString("abc")\nQuery(Cursor)\n')
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_write_behind_flush(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.wc3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.wc3270App.readline",
+        side_effect=[b"U F U C(pub400.com) I 2 24 80 4 9 0x0 0.000", b"ok"] * 2,
+    )
+    under_test = Emulator(True, write_behind=True)
+    under_test.move_to(5, 10)
+    under_test.exec_command(b"Tab")
+
+    under_test.flush()
+    under_test.flush()
+
+    under_test.app.write.assert_called_once_with(b"MoveCursor(4, 9)\nTab\n")
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_write_behind_reports_error_of_queued_command(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.wc3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.wc3270App.readline",
+        side_effect=[
+            b"data: Keyboard locked",
+            b"L F P C(pub400.com) I 2 24 80 4 9 0x0 0.000",
+            b"error",
+            b"L F P C(pub400.com) I 2 24 80 4 9 0x0 0.000",
+            b"ok",
+        ],
+    )
+    under_test = Emulator(True, write_behind=True)
+    under_test.send_string(b"abc")
+
+    with pytest.raises(BatchCommandError, match=r"Command -1 \(String\(\"abc\"\)\) failed") as error:
+        under_test.send_enter()
+
+    assert error.value.index == -1
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_exec_command_kills_emulator_on_timeout(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.ws3270App.write")
+    mocker.patch("Mainframe3270.py3270.ws3270App.readline", side_effect=CommandTimeoutError("timed out"))
+    mocker.patch("Mainframe3270.py3270.ws3270App.kill")
+    under_test = Emulator(command_timeout=5)
+
+    with pytest.raises(CommandTimeoutError):
+        under_test.exec_command(b"Enter")
+
+    assert 4 < under_test.app.readline.call_args[0][0] <= 5
+    under_test.app.kill.assert_called_once()
+    assert under_test.is_terminated
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_exec_batch_kills_emulator_on_timeout(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.ws3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.ws3270App.readline",
+        side_effect=[b"U F U C(pub400.com) I 2 24 80 0 0 0x0 0.000", b"ok", CommandTimeoutError("timed out")],
+    )
+    mocker.patch("Mainframe3270.py3270.ws3270App.kill")
+    under_test = Emulator()
+
+    with pytest.raises(CommandTimeoutError):
+        under_test.exec_batch([b"Tab", b"Enter"])
+
+    under_test.app.kill.assert_called_once()
+    assert under_test.is_terminated
+
+
 @pytest.mark.usefixtures("mock_windows")
 def test_terminate_BrokenPipeError(mocker: MockerFixture):
     mocker.patch("Mainframe3270.py3270.wc3270App.close")
@@ -183,6 +379,47 @@ def test_is_not_connected(mocker: MockerFixture):
     assert not under_test.is_connected()
 
 
+@pytest.mark.usefixtures("mock_windows")
+def test_is_connected_from_session_state(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.wc3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.wc3270App.readline",
+        side_effect=[
+            b"U U U C(pub400.com) C 4 43 80 4 24 0x0 0.000",
+            b"ok",
+            b"U U U N C 4 43 80 4 24 0x0 0.000",
+            b"ok",
+        ],
+    )
+    under_test = Emulator(True)
+    under_test.send_enter()
+
+    assert under_test.is_connected()
+    under_test.app.write.assert_called_once_with(b"Enter\n")
+    assert not under_test.is_connected(max_age=0)
+    under_test.app.write.assert_called_with(b"ignore\n")
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_is_keyboard_unlocked(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.wc3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.wc3270App.readline",
+        side_effect=[
+            b"L U U C(pub400.com) C 4 43 80 4 24 0x0 0.000",
+            b"ok",
+            b"U U U C(pub400.com) C 4 43 80 4 24 0x0 0.000",
+            b"ok",
+        ],
+    )
+    under_test = Emulator(True)
+    under_test.send_enter()
+
+    assert not under_test.is_keyboard_unlocked()
+    assert under_test.is_keyboard_unlocked(max_age=0)
+    assert under_test.app.write.call_count == 2
+
+
 @pytest.mark.usefixtures("mock_windows")
 def test_is_connected_NotConnectedException():
     under_test = Emulator(True)
@@ -190,13 +427,81 @@ def test_is_connected_NotConnectedException():
     assert not under_test.is_connected()
 
 
+@pytest.mark.usefixtures("mock_windows")
+def test_wait_for(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_command")
+    under_test = Emulator(timeout=30)
+
+    under_test.wait_for("Output")
+    Emulator.exec_command.assert_called_with(b"Wait(30, Output)")
+
+    under_test.wait_for("Unlock", 5)
+    Emulator.exec_command.assert_called_with(b"Wait(5, Unlock)")
+
+    under_test.wait_for("Output", 0.5)
+    Emulator.exec_command.assert_called_with(b"Wait(1, Output)")
+
+
+@pytest.mark.parametrize(
+    ("cmdstr", "timeout", "command_timeout", "expected"),
+    [
+        (b"Enter", None, 60, 60),
+        (b"Enter", 5, 60, 5),
+        (b"Wait(120, Output)", None, 60, 180),
+        (b"wait(0.5,Unlock)", None, 60, 60.5),
+        (b"Wait(120, Output)", 5, 60, 5),
+        (b"Wait(Output)", None, 60, None),
+        (b"Wait(120, Output)", None, None, None),
+        (b"Enter", None, None, None),
+    ],
+)
+def test_get_command_timeout(cmdstr: bytes, timeout, command_timeout, expected):
+    assert get_command_timeout(cmdstr, timeout, command_timeout) == expected
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_wait_in_command_extends_command_timeout(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Command.execute")
+    under_test = Emulator(command_timeout=60)
+
+    command = under_test.exec_command(b"Wait(120, Output)")
+
+    assert command.timeout == 180
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_wait_for_output(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_command")
+    under_test = Emulator()
+
+    assert under_test.wait_for_output(5)
+    Emulator.exec_command.assert_called_with(b"Wait(5, Output)")
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_wait_for_output_times_out(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_command", side_effect=CommandError("Wait timed out"))
+    under_test = Emulator()
+
+    assert not under_test.wait_for_output(5)
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_wait_for_output_raises_other_errors(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_command", side_effect=CommandError("Not connected"))
+    under_test = Emulator()
+
+    with pytest.raises(CommandError, match="Not connected"):
+        under_test.wait_for_output(5)
+
+
 @pytest.mark.usefixtures("mock_windows")
 def test_string_get(mocker: MockerFixture):
     mocker.patch("Mainframe3270.py3270.wc3270App.write")
     mocker.patch(
         "Mainframe3270.py3270.wc3270App.readline",
         side_effect=[
-            b"data: Welcome to PUB400.COM * your public IBM i server",
+            b"data:          Welcome to PUB400.COM * your public IBM i server",
             b"U U U C(pub400.com) C 4 43 80 0 56 0x1a00169 0.000",
             b"ok",
         ],
@@ -224,7 +529,8 @@ def test_string_get_calls_check_limits(mocker: MockerFixture):
 
     under_test.string_get(1, 10, 48)
 
-    Emulator.check_limits.assert_called_with(1, 10)
+    Emulator.check_limits.assert_any_call(1, 10, None)
+    Emulator.check_limits.assert_called_with(1, 10, (43, 80))
 
 
 @pytest.mark.usefixtures("mock_windows")
@@ -245,9 +551,29 @@ def test_string_get_exceeds_x_axis(mocker: MockerFixture, model: str, length: in
         under_test.string_get(1, 10, length)
 
 
+@pytest.mark.usefixtures("mock_windows")
+def test_string_get_many(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abcdef", "ghijkl"])
+    under_test = Emulator()
+
+    assert under_test.string_get_many([(1, 2, 3), (2, 1, 2), ("2", "5", "2")]) == ["bcd", "gh", "kl"]
+    Emulator.read_screen_rows.assert_called_once()
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_string_get_many_checks_all_limits_before_reading(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows")
+    under_test = Emulator()
+
+    with pytest.raises(Exception, match="You have exceeded the y-axis limit of the mainframe screen"):
+        under_test.string_get_many([(1, 1, 5), (25, 1, 5)])
+
+    Emulator.read_screen_rows.assert_not_called()
+
+
 @pytest.mark.usefixtures("mock_windows")
 def test_search_string(mocker: MockerFixture):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"])
     under_test = Emulator()
 
     assert under_test.search_string("abc")
@@ -255,7 +581,7 @@ def test_search_string(mocker: MockerFixture):
 
 @pytest.mark.usefixtures("mock_windows")
 def test_search_string_returns_False(mocker: MockerFixture):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="abc")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["abc"])
     under_test = Emulator()
 
     assert not under_test.search_string("def")
@@ -263,27 +589,501 @@ def test_search_string_returns_False(mocker: MockerFixture):
 
 @pytest.mark.usefixtures("mock_windows")
 def test_search_string_ignoring_case(mocker: MockerFixture):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="ABC")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["ABC"])
     under_test = Emulator()
 
     assert under_test.search_string("aBc", True)
 
 
+@pytest.mark.usefixtures("mock_windows")
+def test_search_string_does_not_match_across_rows(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["ab", "c"])
+    under_test = Emulator()
+
+    assert not under_test.search_string("abc")
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_search_strings(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["ushers", "his he", "xy"])
+    under_test = Emulator()
+
+    positions = under_test.search_strings(["he", "she", "his", "hers", "abc", "yx"])
+
+    Emulator.read_screen_rows.assert_called_once()
+    assert positions == {
+        "he": [(1, 3), (2, 5)],
+        "she": [(1, 2)],
+        "his": [(2, 1)],
+        "hers": [(1, 3)],
+        "abc": [],
+        "yx": [],
+    }
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_search_strings_ignoring_case(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["AbC", "dEf"])
+    under_test = Emulator()
+
+    positions = under_test.search_strings(["aBc", "DEF", ""], ignore_case=True)
+
+    assert positions == {"aBc": [(1, 1)], "DEF": [(2, 1)], "": [(1, 1)]}
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_search_strings_does_not_match_across_rows(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["ab", "c"])
+    under_test = Emulator()
+
+    assert under_test.search_strings(["abc", "bc"]) == {"abc": [], "bc": []}
+
+
+def test_string_automaton_is_cached():
+    automaton = _get_string_automaton(("abc", "def"), False)
+
+    assert _get_string_automaton(("abc", "def"), False) is automaton
+    assert _get_string_automaton(("abc", "def"), True) is not automaton
+    assert _get_string_automaton(("def", "abc"), False) is not automaton
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_read_screen_rows(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.wc3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.wc3270App.readline",
+        side_effect=[
+            b"data: Welcome to PUB400.COM",
+            b"data: * your public IBM i server",
+            b"U U U C(pub400.com) C 4 43 80 0 56 0x1a00169 0.000",
+            b"ok",
+        ],
+    )
+    under_test = Emulator(True)
+
+    rows = under_test.read_screen_rows()
+
+    assert rows == ["Welcome to PUB400.COM", "* your public IBM i server"]
+
+
 @pytest.mark.usefixtures("mock_windows")
 @pytest.mark.parametrize(("model", "rows", "columns"), [("2", 24, 80), ("3", 32, 80), ("4", 43, 80), ("5", 27, 132)])
-def test_search_string_with_different_model_dimensions(mocker: MockerFixture, model: str, rows: int, columns: int):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get")
+def test_read_screen_rows_with_different_model_dimensions(mocker: MockerFixture, model: str, rows: int, columns: int):
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_command")
     under_test = Emulator(model=model)
 
-    under_test.search_string("abc")
+    under_test.read_screen_rows()
+
+    Emulator.exec_command.assert_called_once_with(f"ascii(0,0,{rows},{columns})".encode("utf-8"))
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_read_region(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.wc3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.wc3270App.readline",
+        side_effect=[
+            b"data: abc",
+            b"data: def",
+            b"U F U C(pub400.com) I 2 24 80 0 0 0x0 0.000",
+            b"ok",
+        ],
+    )
+    under_test = Emulator(True)
+
+    assert under_test.read_region(22, 5, 2, 3) == ["abc", "def"]
+    under_test.app.write.assert_called_once_with(b"ascii(21,4,2,3)\n")
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_read_region_from_valid_snapshot(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_command")
+    under_test = Emulator()
+    under_test._screen_snapshot = ScreenSnapshot(0, ["abcde", "fghij", "klmno"])
+
+    assert under_test.read_region(2, 2, 2, 3) == ["ghi", "lmn"]
+    Emulator.exec_command.assert_not_called()
+
+
+@pytest.mark.usefixtures("mock_windows")
+@pytest.mark.parametrize(
+    ("region", "error"),
+    [
+        ((23, 1, 3, 80), "You have exceeded the y-axis limit of the mainframe screen"),
+        ((1, 70, 1, 12), "You have exceeded the x-axis limit of the mainframe screen"),
+        ((1, 1, 0, 80), "A region must have at least one row and one column"),
+    ],
+)
+def test_read_region_checks_limits(mocker: MockerFixture, region: tuple, error: str):
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_command")
+    under_test = Emulator()
+
+    with pytest.raises(Exception, match=error):
+        under_test.read_region(*region)
+
+    Emulator.exec_command.assert_not_called()
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_search_string_in_region(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_region", return_value=["abc"])
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows")
+    under_test = Emulator()
+
+    assert under_test.search_string("ABC", True, (24, 1, 1, 3))
+    Emulator.read_region.assert_called_once_with(24, 1, 1, 3)
+    Emulator.read_screen_rows.assert_not_called()
+
+
+READ_BUFFER = [
+    b"data: SF(c0=e0) 41 42 SF(c0=c1,41=f2) 00 SA(41=f1) 00 00",
+    b"data: 00 SF(c0=f8) 43 44 45",
+    b"U F U C(pub400.com) I 2 24 80 0 0 0x0 0.000",
+    b"ok",
+]
+
+
+def test_parse_field_map():
+    fields = FieldMap.parse([line[6:] for line in READ_BUFFER[:2]], 8)
+
+    assert [field.as_dict() for field in fields] == [
+        {
+            "ypos": 1,
+            "xpos": 2,
+            "length": 2,
+            "protected": True,
+            "numeric": False,
+            "intensified": False,
+            "modified": False,
+        },
+        {
+            "ypos": 1,
+            "xpos": 5,
+            "length": 4,
+            "protected": False,
+            "numeric": False,
+            "intensified": False,
+            "modified": True,
+        },
+        {
+            "ypos": 2,
+            "xpos": 2,
+            "length": 3,
+            "protected": True,
+            "numeric": True,
+            "intensified": True,
+            "modified": False,
+        },
+    ]
+
+
+def test_parse_field_map_with_single_field():
+    fields = FieldMap.parse([b"00 00 SF(c0=c0) 00", b"00 00 00 00"], 4)
+
+    assert len(fields) == 1
+    assert (fields[0].ypos, fields[0].xpos, fields[0].length) == (1, 4, 7)
+
+
+def test_parse_field_map_of_unformatted_screen():
+    assert FieldMap.parse([b"41 42", b"43 44"], 2) == []
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_get_fields_is_cached_until_screen_changes(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.wc3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.wc3270App.readline",
+        side_effect=READ_BUFFER + [b"U F U C(pub400.com) I 2 24 80 0 0 0x0 0.000", b"ok"] + READ_BUFFER,
+    )
+    under_test = Emulator(True)
+
+    assert len(under_test.get_fields()) == 3
+    assert [field.xpos for field in under_test.get_input_fields()] == [5]
+    under_test.app.write.assert_called_once_with(b"readbuffer(ascii)\n")
+    under_test.send_enter()
+    under_test.get_fields()
+    assert under_test.app.write.call_count == 3
+
+
+@pytest.mark.usefixtures("mock_windows")
+@pytest.mark.parametrize(
+    ("ypos", "xpos", "expected_address"),
+    [
+        (1, 1, 0),
+        (1, 3, 0),
+        (1, 4, 3),
+        (2, 1, 3),
+        (2, 2, 81),
+        (24, 80, 81),
+    ],
+)
+def test_get_field_at(mocker: MockerFixture, ypos: int, xpos: int, expected_address: int):
+    fields = [Field(0, 1, 2, 2, 0xE0), Field(3, 1, 5, 77, 0xC1), Field(81, 2, 3, 1838, 0xF8)]
+    mocker.patch("Mainframe3270.py3270.Emulator.get_field_map", return_value=FieldMap(0, fields))
+    under_test = Emulator()
+
+    assert under_test.get_field_at(ypos, xpos).address == expected_address
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_get_field_at_before_first_attribute(mocker: MockerFixture):
+    fields = [Field(5, 1, 7, 94, 0xE0), Field(100, 2, 22, 1824, 0xC1)]
+    mocker.patch("Mainframe3270.py3270.Emulator.get_field_map", return_value=FieldMap(0, fields))
+    under_test = Emulator()
 
-    assert Emulator.string_get.call_count == rows
-    Emulator.string_get.assert_called_with(rows, 1, columns)
+    assert under_test.get_field_at(1, 1) is fields[1]
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_get_field_at_on_unformatted_screen(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.get_field_map", return_value=FieldMap(0, []))
+    under_test = Emulator()
+
+    assert under_test.get_field_at(1, 1) is None
+
+
+FORM_FIELDS = [Field(0, 1, 2, 9, 0xE0), Field(10, 1, 12, 5, 0xC0), Field(17, 1, 19, 1900, 0xE0)]
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_fill_fields(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.get_field_map", return_value=FieldMap(0, FORM_FIELDS))
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_batch")
+    under_test = Emulator()
+
+    under_test.fill_fields([(1, 12, "abcde"), (1, 14, 'ä"')], b"Enter")
+
+    Emulator.exec_batch.assert_called_once_with(
+        [
+            b"MoveCursor(0, 11)",
+            b"EraseEOF",
+            b'String("abcde")',
+            b"MoveCursor(0, 13)",
+            b"EraseEOF",
+            b'String("\\xe4"")',
+            b"Enter",
+        ]
+    )
+
+
+@pytest.mark.usefixtures("mock_windows")
+@pytest.mark.parametrize(
+    ("ypos", "xpos", "tosend", "error"),
+    [
+        (1, 12, "abcdef", 'length limit 5 at position (1, 12), but got "abcdef"'),
+        (1, 16, "ab", 'length limit 1 at position (1, 16), but got "ab"'),
+        (1, 11, "a", 'length limit 0 at position (1, 11), but got "a"'),
+    ],
+)
+def test_fill_fields_raises_before_sending(mocker: MockerFixture, ypos: int, xpos: int, tosend: str, error: str):
+    mocker.patch("Mainframe3270.py3270.Emulator.get_field_map", return_value=FieldMap(0, FORM_FIELDS))
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_batch")
+    under_test = Emulator()
+
+    with pytest.raises(FieldTruncateError, match=re.escape(error)):
+        under_test.fill_fields([(1, 12, "abc"), (ypos, xpos, tosend)])
+
+    Emulator.exec_batch.assert_not_called()
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_fill_fields_on_unformatted_screen(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.get_field_map", return_value=FieldMap(0, []))
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_batch")
+    under_test = Emulator()
+
+    under_test.fill_fields([(24, 78, "abc")])
+    with pytest.raises(FieldTruncateError):
+        under_test.fill_fields([(24, 78, "abcd")])
+
+    Emulator.exec_batch.assert_called_once_with([b"MoveCursor(23, 77)", b"EraseEOF", b'String("abc")'])
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_get_input_field_after(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.get_field_map", return_value=FieldMap(0, FORM_FIELDS))
+    under_test = Emulator()
+
+    assert under_test.get_input_field_after(1, 1) is FORM_FIELDS[1]
+    assert under_test.get_input_field_after(1, 11) is FORM_FIELDS[1]
+    assert under_test.get_input_field_after(1, 12) is None
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_get_screen_snapshot_is_reused_until_screen_changes(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.wc3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.wc3270App.readline",
+        side_effect=[
+            b"data: first screen",
+            b"U F U C(pub400.com) I 2 24 80 0 0 0x0 0.000",
+            b"ok",
+            b"U F U C(pub400.com) I 2 24 80 0 0 0x0 0.000",
+            b"ok",
+            b"data: second screen",
+            b"U F U C(pub400.com) I 2 24 80 0 0 0x0 0.000",
+            b"ok",
+        ],
+    )
+    under_test = Emulator(True)
+
+    assert under_test.read_screen_rows() == ["first screen"]
+    assert under_test.string_get(1, 1, 5) == "first"
+    under_test.send_enter()
+    assert under_test.read_screen_rows() == ["second screen"]
+    assert under_test.app.write.call_count == 3
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_get_screen_snapshot_is_not_reused_when_keyboard_locked(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.wc3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.wc3270App.readline",
+        side_effect=[
+            b"data: first screen",
+            b"L F U C(pub400.com) I 2 24 80 0 0 0x0 0.000",
+            b"ok",
+            b"data: second screen",
+            b"U F U C(pub400.com) I 2 24 80 0 0 0x0 0.000",
+            b"ok",
+        ],
+    )
+    under_test = Emulator(True)
+
+    assert under_test.read_screen_rows() == ["first screen"]
+    assert under_test.read_screen_rows() == ["second screen"]
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_get_screen_snapshot_is_not_reused_after_max_age(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.wc3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.wc3270App.readline",
+        side_effect=[
+            b"data: first screen",
+            b"U F U C(pub400.com) I 2 24 80 0 0 0x0 0.000",
+            b"ok",
+            b"data: second screen",
+            b"U F U C(pub400.com) I 2 24 80 0 0 0x0 0.000",
+            b"ok",
+        ],
+    )
+    under_test = Emulator(True, snapshot_max_age=0)
+
+    assert under_test.read_screen_rows() == ["first screen"]
+    mocker.patch("Mainframe3270.py3270.time.monotonic", return_value=time.monotonic() + 1)
+    assert under_test.read_screen_rows() == ["second screen"]
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_get_screen_snapshot_uses_screen_size_of_status_line(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.wc3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.wc3270App.readline",
+        side_effect=[
+            b"U F U C(pub400.com) I 4 24 80 0 0 0x0 0.000",
+            b"ok",
+            b"data: first row",
+            b"U F U C(pub400.com) I 4 24 80 0 0 0x0 0.000",
+            b"ok",
+        ],
+    )
+    under_test = Emulator(True, model="4")
+
+    under_test.send_enter()
+    under_test.read_screen_rows()
+
+    under_test.app.write.assert_called_with(b"ascii(0,0,24,80)\n")
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_string_get_below_current_screen(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["a" * 80] * 24)
+    under_test = Emulator(model="4")
+    under_test._update_status(b"U F U C(pub400.com) I 4 24 80 0 0 0x0 0.000")
+
+    with pytest.raises(Exception, match="You have exceeded the y-axis limit of the mainframe screen"):
+        under_test.string_get(30, 1, 5)
+
+
+@pytest.fixture
+def model_5_with_default_screen(mocker: MockerFixture):
+    """A model 5 emulator whose host uses the default 24x80 screen"""
+    under_test = Emulator(model="5")
+    under_test._update_status(b"U F U C(pub400.com) I 5 24 80 0 0 0x0 0.000")
+    rows = ["." * 80 for _ in range(24)]
+    rows[1] = "." * 9 + "HELLO" + "." * 66
+    under_test._screen_snapshot = ScreenSnapshot(under_test.screen_generation, rows)
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_command")
+    return under_test
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_get_string_positions_on_smaller_screen_than_model(model_5_with_default_screen: Emulator):
+    assert model_5_with_default_screen.get_string_positions("HELLO") == [(2, 10)]
+    Emulator.exec_command.assert_not_called()
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_string_get_many_below_smaller_screen_than_model(model_5_with_default_screen: Emulator):
+    with pytest.raises(Exception, match="You have exceeded the y-axis limit of the mainframe screen"):
+        model_5_with_default_screen.string_get_many([(2, 10, 5), (25, 1, 5)])
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_string_get_beyond_columns_of_smaller_screen_than_model(model_5_with_default_screen: Emulator):
+    assert model_5_with_default_screen.string_get(2, 10, 5) == "HELLO"
+    with pytest.raises(Exception, match="You have exceeded the x-axis limit of the mainframe screen"):
+        model_5_with_default_screen.string_get(2, 100, 5)
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_get_field_at_on_smaller_screen_than_model(mocker: MockerFixture, model_5_with_default_screen: Emulator):
+    fields = [Field(0, 1, 2, 79, 0x20), Field(80, 2, 2, 1839, 0x00)]
+    mocker.patch("Mainframe3270.py3270.Emulator.get_field_map", return_value=FieldMap(0, fields))
+
+    assert model_5_with_default_screen.get_field_at(2, 10) is fields[1]
+    with pytest.raises(Exception, match="You have exceeded the y-axis limit of the mainframe screen"):
+        model_5_with_default_screen.get_field_at(25, 1)
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_fill_fields_on_smaller_screen_than_model(mocker: MockerFixture, model_5_with_default_screen: Emulator):
+    fields = [Field(0, 1, 2, 79, 0x20), Field(80, 2, 2, 1839, 0x00)]
+    mocker.patch("Mainframe3270.py3270.Emulator.get_field_map", return_value=FieldMap(0, fields))
+    mocker.patch("Mainframe3270.py3270.Emulator.exec_batch")
+
+    model_5_with_default_screen.fill_fields([(24, 71, "x" * 10)])
+
+    with pytest.raises(FieldTruncateError):
+        model_5_with_default_screen.fill_fields([(24, 71, "x" * 11)])
+
+
+@pytest.mark.usefixtures("mock_windows")
+@pytest.mark.parametrize(
+    ("command", "invalidates"),
+    [
+        (b"Enter", True),
+        (b"PF(3)", True),
+        (b'String("abc")', True),
+        (b"Tab", True),
+        (b"ascii(0,0,24,80)", False),
+        (b"Query(Cursor)", False),
+        (b"ignore", False),
+    ],
+)
+def test_exec_command_invalidates_screen(mocker: MockerFixture, command: bytes, invalidates: bool):
+    mocker.patch("Mainframe3270.py3270.Command.execute")
+    under_test = Emulator()
+
+    under_test.exec_command(command)
+
+    assert under_test.screen_generation == (1 if invalidates else 0)
 
 
 @pytest.mark.usefixtures("mock_windows")
 def test_read_all_screen(mocker: MockerFixture):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get", return_value="a")
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["a"] * 24)
     under_test = Emulator()
 
     content = under_test.read_all_screen()
@@ -292,15 +1092,30 @@ def test_read_all_screen(mocker: MockerFixture):
 
 
 @pytest.mark.usefixtures("mock_windows")
-@pytest.mark.parametrize(("model", "rows", "columns"), [("2", 24, 80), ("3", 32, 80), ("4", 43, 80), ("5", 27, 132)])
-def test_read_all_screen_with_different_model_dimensions(mocker: MockerFixture, model: str, rows: int, columns: int):
-    mocker.patch("Mainframe3270.py3270.Emulator.string_get")
-    under_test = Emulator(model=model)
+def test_read_all_screen_replace_unicode(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["\u250cab\u2510", "Üc"])
+    under_test = Emulator()
+
+    assert under_test.read_all_screen() == "-ab--c"
+    assert under_test.read_all_screen(replace_unicode=False) == "\u250cab\u2510Üc"
 
-    under_test.read_all_screen()
 
-    assert Emulator.string_get.call_count == rows
-    Emulator.string_get.assert_called_with(rows, 1, columns)
+@pytest.mark.usefixtures("mock_windows")
+def test_read_all_screen_replace_unicode_sequences(mocker: MockerFixture):
+    mocker.patch(
+        "Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["â\x94\x8câ\x94\x80â\x94\x90", "â\x94\x82â\x01"]
+    )
+    under_test = Emulator()
+
+    assert under_test.read_all_screen() == "+-+|--"
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_read_all_screen_with_unicode_replacements(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_screen_rows", return_value=["\u250cab\u2510", "Üc", "é"])
+    under_test = Emulator(unicode_replacements={"\u250c": "+", "Ü": "Ü", "ab": "xy", "é": "e"})
+
+    assert under_test.read_all_screen() == "+xy-Üce"
 
 
 @pytest.mark.usefixtures("mock_windows")
@@ -342,6 +1157,41 @@ def test_get_current_cursor_position(mocker: MockerFixture):
     assert under_test.get_current_position() == (6, 6)
 
 
+@pytest.mark.usefixtures("mock_windows")
+def test_get_current_cursor_position_from_session_state(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.wc3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.wc3270App.readline",
+        side_effect=[b"U F U C(pub400.com) I 2 24 80 4 9 0x0 0.000", b"ok"],
+    )
+    under_test = Emulator(True)
+    under_test.move_to(5, 10)
+
+    assert under_test.get_current_position() == (5, 10)
+    under_test.app.write.assert_called_once_with(b"MoveCursor(4, 9)\n")
+
+
+@pytest.mark.usefixtures("mock_windows")
+@pytest.mark.parametrize(
+    ("status_line", "max_age"),
+    [
+        (b"L F U C(pub400.com) I 2 24 80 4 9 0x0 0.000", None),
+        (b"U F U C(pub400.com) I 2 24 80 4 9 0x0 0.000", 0),
+    ],
+)
+def test_get_current_cursor_position_queries_emulator(mocker: MockerFixture, status_line: bytes, max_age):
+    mocker.patch("Mainframe3270.py3270.wc3270App.write")
+    mocker.patch(
+        "Mainframe3270.py3270.wc3270App.readline",
+        side_effect=[status_line, b"ok", b"data: 5 5", b"U F U C(pub400.com) I 2 24 80 5 5 0x0 0.000", b"ok"],
+    )
+    under_test = Emulator(True)
+    under_test.send_enter()
+
+    assert under_test.get_current_position(max_age) == (6, 6)
+    under_test.app.write.assert_called_with(b"Query(Cursor)\n")
+
+
 def test_get_current_cursor_position_returns_unexpected_value(mocker: MockerFixture):
     command = Command(None, b"Query(Cursor)")
     command.data = [b"5 5", b"unexpected"]
@@ -391,6 +1241,17 @@ def test_get_string_positions_without_result(mocker: MockerFixture):
     assert under_test.get_string_positions("does not exist") == []
 
 
+@pytest.mark.usefixtures("mock_windows")
+def test_get_string_positions_in_region(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.Emulator.read_region", return_value=["xabc", "abc\u2502", "ab"])
+    under_test = Emulator()
+
+    assert under_test.get_string_positions("abc", region=(20, 10, 3, 4)) == [(20, 11), (21, 10)]
+    assert under_test.get_string_positions("c-", region=(20, 10, 3, 4)) == [(21, 12)]
+    assert under_test.get_string_positions("C\u2502", True, False, (20, 10, 3, 4)) == [(21, 12)]
+    Emulator.read_region.assert_called_with(20, 10, 3, 4)
+
+
 def _mock_return_all_screen(emulator: Emulator, insert_string: str, at_index: int):
     base_str = "a" * (emulator.model_dimensions["rows"] * emulator.model_dimensions["columns"])
     return base_str[:at_index] + insert_string + base_str[at_index : -len(insert_string)]
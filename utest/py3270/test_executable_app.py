@@ -0,0 +1,166 @@
+import os
+import socket
+import subprocess
+import threading
+import pytest
+from pytest_mock import MockerFixture
+from Mainframe3270.py3270 import Command, CommandTimeoutError, s3270App, wc3270App, ws3270App
+
+
+@pytest.fixture
+def pipe():
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd, "rb") as stdout:
+        yield stdout, write_fd
+        try:
+            os.close(write_fd)
+        except OSError:
+            pass
+
+
+@pytest.mark.usefixtures("mock_posix")
+def test_readline_with_selector(pipe):
+    stdout, write_fd = pipe
+    under_test = s3270App()
+    under_test.sp.stdout = stdout
+    os.write(write_fd, b"data: abc\nU F U C(pub400.com) I 2 24 80 0 0 0x0 0.000\nok")
+
+    assert under_test.readline(1) == b"data: abc\n"
+    assert under_test.readline(1) == b"U F U C(pub400.com) I 2 24 80 0 0 0x0 0.000\n"
+
+    os.write(write_fd, b"\n")
+
+    assert under_test.readline(1) == b"ok\n"
+
+
+@pytest.mark.usefixtures("mock_posix")
+def test_readline_with_selector_times_out(pipe):
+    stdout, write_fd = pipe
+    under_test = s3270App()
+    under_test.sp.stdout = stdout
+    os.write(write_fd, b"incomplete line")
+
+    with pytest.raises(CommandTimeoutError, match="The emulator did not answer within 0.1 seconds"):
+        under_test.readline(0.1)
+
+
+@pytest.mark.usefixtures("mock_posix")
+def test_readline_with_selector_returns_rest_on_eof(pipe):
+    stdout, write_fd = pipe
+    under_test = s3270App()
+    under_test.sp.stdout = stdout
+    os.write(write_fd, b"ok")
+    os.close(write_fd)
+
+    assert under_test.readline(1) == b"ok"
+    assert under_test.readline(1) == b""
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_readline_with_watchdog(pipe):
+    stdout, write_fd = pipe
+    under_test = ws3270App()
+    under_test.sp.stdout = stdout
+    os.write(write_fd, b"data: abc\nok\n")
+
+    with under_test.watchdog(1):
+        assert under_test.readline(1) == b"data: abc\n"
+        assert under_test.readline(1) == b"ok\n"
+    under_test.sp.kill.assert_not_called()
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_readline_with_watchdog_kills_emulator_on_timeout(pipe):
+    stdout, write_fd = pipe
+    under_test = ws3270App()
+    under_test.sp.stdout = stdout
+    # killing the emulator closes its end of the pipe
+    under_test.sp.kill.side_effect = lambda: os.close(write_fd)
+
+    with pytest.raises(CommandTimeoutError, match="The emulator did not answer within 0.1 seconds"):
+        with under_test.watchdog(0.1):
+            under_test.readline(0.1)
+
+    under_test.sp.kill.assert_called_once()
+
+
+@pytest.mark.usefixtures("mock_windows")
+def test_watchdog_is_started_once_per_command(mocker: MockerFixture):
+    mocker.patch("threading.Timer")
+    under_test = ws3270App()
+    under_test.sp.stdout.readline.side_effect = [
+        b"data: abc\n",
+        b"data: def\n",
+        b"U F U C(pub400.com) I 2 24 80 0 0 0x0 0.000\n",
+        b"ok\n",
+    ]
+
+    Command(under_test, b"ascii(0,0,2,3)", 5).execute()
+
+    threading.Timer.assert_called_once()
+
+
+def test_kill_reaps_the_emulator():
+    under_test = s3270App()
+
+    under_test.kill()
+
+    under_test.sp.kill.assert_called_once()
+    under_test.sp.wait.assert_called_once()
+
+
+def test_wc3270_readline_times_out(mocker: MockerFixture):
+    under_test = wc3270App()
+    under_test.socket = mocker.MagicMock()
+    under_test.socket_fh = mocker.MagicMock()
+    under_test.socket_fh.readline.side_effect = socket.timeout
+
+    with pytest.raises(CommandTimeoutError, match="The emulator did not answer within 5 seconds"):
+        under_test.readline(5)
+
+    under_test.socket.settimeout.assert_called_with(5)
+
+
+def test_stderr_is_drained_into_bounded_buffer(mocker: MockerFixture):
+    mocker.patch("Mainframe3270.py3270.ExecutableApp.STDERR_MAX_LINES", 2)
+    under_test = s3270App()
+    stderr = mocker.MagicMock()
+    stderr.readline.side_effect = [b"first\n", b"second\r\n", b"third\n", b""]
+
+    under_test._drain_stderr(stderr)
+
+    assert list(under_test.stderr_lines) == ["second", "third"]
+
+
+def test_stderr_drain_runs_in_background(mocker: MockerFixture):
+    mocker.patch("threading.Thread")
+
+    under_test = s3270App()
+
+    threading.Thread.assert_called_once_with(
+        target=under_test._drain_stderr, args=(under_test.sp.stderr,), name="s3270-stderr", daemon=True
+    )
+    threading.Thread.return_value.start.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    ("executable", "command"),
+    [
+        ("/opt/s3270", ["/opt/s3270"]),
+        (["python", "-m", "fake_s3270"], ["python", "-m", "fake_s3270"]),
+    ],
+)
+def test_executable_override(mocker: MockerFixture, executable, command):
+    mocker.patch("threading.Thread")
+
+    under_test = s3270App(model="3", executable=executable)
+
+    subprocess.Popen.assert_called_once_with(
+        command + ["-xrm", "s3270.unlockDelay: False", "-xrm", "*model: 3"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    assert threading.Thread.call_args.kwargs["name"] == f"{os.path.basename(command[0])}-stderr"
+    assert s3270App.executable == "s3270"
+    assert under_test.executable == executable
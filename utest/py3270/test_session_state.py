@@ -0,0 +1,38 @@
+import math
+from pytest_mock import MockerFixture
+from Mainframe3270.py3270 import SessionState, Status
+
+
+def test_initial_state():
+    under_test = SessionState()
+
+    assert under_test.age == math.inf
+    assert not under_test.is_fresh(60)
+    assert not under_test.connected
+    assert not under_test.keyboard_unlocked
+    assert under_test.cursor is None
+    assert under_test.screen_size is None
+
+
+def test_update(mocker: MockerFixture):
+    mocker.patch("time.monotonic", return_value=100.0)
+    under_test = SessionState()
+
+    under_test.update(Status(b"U F U C(pub400.com) I 4 43 80 4 24 0x0 0.000"))
+
+    assert under_test.connected
+    assert under_test.keyboard_unlocked
+    assert under_test.cursor == (5, 25)
+    assert under_test.screen_size == (43, 80)
+    assert under_test.is_fresh(0)
+
+
+def test_is_fresh(mocker: MockerFixture):
+    mocker.patch("time.monotonic", side_effect=[100.0, 100.5, 101.5])
+    under_test = SessionState()
+    under_test.update(Status(b"L F U N I 2 24 80 0 0 0x0 0.000"))
+
+    assert under_test.is_fresh(1)
+    assert not under_test.is_fresh(1)
+    assert not under_test.connected
+    assert not under_test.keyboard_unlocked
@@ -26,3 +26,30 @@ def test_status_line(under_test: Status):
 
 def test__str__(under_test: Status):
     assert str(under_test) == "STATUS: U U U C(pub400.com) C 4 43 80 4 24 0x0 0.000"
+
+
+def test_status_is_parsed_lazily():
+    under_test = Status(b"U U U C(pub400.com) C 4 43 80 4 24 0x0 0.000")
+
+    assert under_test._parts is None
+    assert under_test.keyboard == b"U"
+    assert under_test._parts is not None
+
+
+def test_status_has_no_instance_dict(under_test: Status):
+    assert not hasattr(under_test, "__dict__")
+
+
+def test_empty_status_line():
+    under_test = Status(None)
+
+    assert under_test.as_string == ""
+    assert under_test.keyboard is None
+    assert under_test.exec_time is None
+
+
+def test_short_status_line():
+    under_test = Status(b"U U U N")
+
+    assert under_test.connection_state == b"N"
+    assert under_test.cursor_row is None
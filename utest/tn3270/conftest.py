@@ -0,0 +1,160 @@
+import re
+import socket
+import threading
+import pytest
+from Mainframe3270.tn3270.datastream import ORDER_IC, ORDER_SBA, ORDER_SF, encode_address, encode_attribute
+from Mainframe3270.tn3270.telnet import (
+    DO,
+    EOR,
+    IAC,
+    OPT_BINARY,
+    OPT_EOR,
+    OPT_TN3270E,
+    OPT_TTYPE,
+    SB,
+    SE,
+    TN3270E_CONNECT,
+    TN3270E_DEVICE_TYPE,
+    TN3270E_FUNCTIONS,
+    TN3270E_IS,
+    TN3270E_SEND,
+    TTYPE_SEND,
+    WILL,
+)
+
+
+def sba(row, column, columns=80, size=1920):
+    return bytes([ORDER_SBA]) + encode_address(row * columns + column, size)
+
+
+def sf(attribute):
+    return bytes([ORDER_SF, encode_attribute(attribute)])
+
+
+def text(string):
+    return string.encode("cp037")
+
+
+def logon_screen():
+    """An Erase/Write of a screen with a title, a user field with the cursor and a protected field."""
+    return b"".join(
+        [
+            bytes([0xF5, 0xC3]),
+            sba(0, 0),
+            sf(0x28),
+            text("WELCOME TO THE FAKE HOST"),
+            sba(2, 0),
+            sf(0x20),
+            text("USER:"),
+            sf(0x00),
+            bytes([ORDER_IC]),
+            sba(2, 16),
+            sf(0x20),
+            text("PASSWORD:"),
+            sf(0x0C),
+            sba(3, 20),
+            sf(0x20),
+        ]
+    )
+
+
+def menu_screen(user):
+    return bytes([0xF5, 0xC3]) + sba(0, 0) + sf(0x20) + text(f"HELLO {user}")
+
+
+class FakeHost(object):
+    """
+    A TN3270 host that sends the logon screen after the negotiation and answers each record with `reply`.
+    """
+
+    def __init__(self, tn3270e=False, reply=None):
+        self.tn3270e = tn3270e
+        self.reply = reply
+        self.terminal_types = []
+        self.records = []
+        self.received = threading.Event()
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.port = self.server.getsockname()[1]
+        self.connection = None
+        self._buffer = b""
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        try:
+            self.connection, _ = self.server.accept()
+            self._negotiate()
+            self.send(logon_screen())
+            while True:
+                record = self._read_record()
+                self.records.append(record)
+                self.received.set()
+                if self.reply is not None:
+                    self.send(self.reply(record))
+        except (EOFError, OSError):
+            pass
+
+    def _read(self, count=1):
+        while len(self._buffer) < count:
+            chunk = self.connection.recv(4096)
+            if not chunk:
+                raise EOFError
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:count], self._buffer[count:]
+        return data
+
+    def _read_until(self, end):
+        data = b""
+        while not data.endswith(end):
+            data += self._read()
+        return data[: -len(end)]
+
+    def _read_record(self):
+        record = self._read_until(bytes([IAC, EOR]))
+        # drop late answers to the option negotiation
+        record = re.sub(rb"\xff[\xfb-\xfe].", b"", record, flags=re.DOTALL).replace(b"\xff\xff", b"\xff")
+        return record[5:] if self.tn3270e else record
+
+    def _subnegotiate(self, option, data):
+        self.connection.sendall(bytes([IAC, SB, option]) + data + bytes([IAC, SE]))
+        # skip the answers to the option negotiation, up to the answering sub-negotiation
+        self._read_until(bytes([IAC, SB, option]))
+        return self._read_until(bytes([IAC, SE]))
+
+    def _negotiate(self):
+        if self.tn3270e:
+            self.connection.sendall(bytes([IAC, DO, OPT_TN3270E]))
+            request = self._subnegotiate(OPT_TN3270E, bytes([TN3270E_SEND, TN3270E_DEVICE_TYPE]))
+            self.terminal_types.append(request[2:].split(bytes([TN3270E_CONNECT]))[0])
+            self._subnegotiate(
+                OPT_TN3270E,
+                bytes([TN3270E_DEVICE_TYPE, TN3270E_IS]) + self.terminal_types[-1] + bytes([TN3270E_CONNECT]) + b"LU01",
+            )
+            self.connection.sendall(bytes([IAC, SB, OPT_TN3270E, TN3270E_FUNCTIONS, TN3270E_IS, IAC, SE]))
+        else:
+            self.connection.sendall(bytes([IAC, DO, OPT_TTYPE]))
+            self.terminal_types.append(self._subnegotiate(OPT_TTYPE, bytes([TTYPE_SEND]))[1:])
+            self.connection.sendall(
+                bytes([IAC, DO, OPT_EOR, IAC, WILL, OPT_EOR, IAC, DO, OPT_BINARY, IAC, WILL, OPT_BINARY])
+            )
+
+    def send(self, record):
+        header = bytes(5) if self.tn3270e else b""
+        self.connection.sendall(header + record.replace(b"\xff", b"\xff\xff") + bytes([IAC, EOR]))
+
+    def wait_for_record(self, timeout=5):
+        assert self.received.wait(timeout), "the host did not receive a record"
+        self.received.clear()
+        return self.records[-1]
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+        self.server.close()
+
+
+@pytest.fixture
+def host():
+    host = FakeHost(reply=lambda record: menu_screen(record[6:].decode("cp037").strip()))
+    yield host
+    host.close()
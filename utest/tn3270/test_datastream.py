@@ -0,0 +1,28 @@
+from Mainframe3270.tn3270.datastream import decode_address, encode_address, encode_attribute
+
+
+def test_encode_address_12_bit():
+    assert encode_address(90, 1920) == b"\xc1\x5a"
+
+
+def test_encode_address_14_bit():
+    assert encode_address(5000, 27 * 132 * 2) == b"\x13\x88"
+
+
+def test_decode_address_12_bit():
+    assert decode_address(0xC1, 0x5A) == 90
+
+
+def test_decode_address_14_bit():
+    assert decode_address(0x13, 0x88) == 5000
+
+
+def test_addresses_round_trip():
+    for address in range(1920):
+        assert decode_address(*encode_address(address, 1920)) == address
+
+
+def test_encode_attribute():
+    assert encode_attribute(0x00) == 0x40
+    assert encode_attribute(0x20) == 0x60
+    assert encode_attribute(0x3C) == 0x7C
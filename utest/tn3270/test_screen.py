@@ -0,0 +1,256 @@
+import pytest
+from Mainframe3270.tn3270.datastream import (
+    AID_CLEAR,
+    AID_ENTER,
+    AID_PA,
+    ORDER_EUA,
+    ORDER_MF,
+    ORDER_PT,
+    ORDER_RA,
+    ORDER_SFE,
+    encode_address,
+)
+from Mainframe3270.tn3270.screen import NULL, OperatorError, Screen
+from .conftest import logon_screen, sba, sf, text
+
+
+@pytest.fixture
+def under_test():
+    screen = Screen(alternate_size=(43, 80))
+    screen.process(logon_screen())
+    return screen
+
+
+def test_erase_write(under_test: Screen):
+    assert under_test.field_addresses == [0, 160, 166, 176, 186, 260]
+    assert under_test.cursor == 167
+    assert under_test.keyboard_unlocked
+    assert under_test.writes == 1
+    assert under_test.ascii_rows(0, 0, 1, 30) == [" WELCOME TO THE FAKE HOST     "]
+    assert under_test.ascii_rows(2, 0, 1, 30) == [" USER:           PASSWORD:    "]
+
+
+def test_erase_write_alternate():
+    under_test = Screen(alternate_size=(43, 80))
+
+    under_test.process(bytes([0x7E, 0xC3]) + sba(42, 0, size=3440) + text("LAST ROW"))
+
+    assert (under_test.rows, under_test.columns) == (43, 80)
+    assert under_test.ascii_rows(42, 0, 1, 8) == ["LAST ROW"]
+
+
+def test_write_without_keyboard_restore_keeps_keyboard_locked(under_test: Screen):
+    under_test.aid(AID_ENTER)
+
+    under_test.process(bytes([0xF1, 0xC0]) + sba(1, 0) + text("PLEASE WAIT"))
+
+    assert not under_test.keyboard_unlocked
+    assert under_test.ascii_rows(1, 0, 1, 11) == ["PLEASE WAIT"]
+    assert under_test.ascii_rows(0, 1, 1, 7) == ["WELCOME"]
+
+
+def test_nondisplay_field_is_shown_blank(under_test: Screen):
+    under_test.cursor = 187
+    under_test.type_text("secret")
+
+    assert under_test.chars[187:193] == list("secret")
+    assert under_test.ascii_rows(2, 26, 1, 8) == ["        "]
+
+
+def test_repeat_to_address():
+    under_test = Screen()
+
+    under_test.process(bytes([0xF5, 0xC3, ORDER_RA]) + encode_address(5, 1920) + text("-"))
+
+    assert under_test.ascii_rows(0, 0, 1, 7) == ["-----  "]
+
+
+def test_erase_unprotected_to_address(under_test: Screen):
+    under_test.type_text("bob")
+
+    under_test.process(bytes([0xF1, 0xC2]) + sba(2, 0) + bytes([ORDER_EUA]) + encode_address(200, 1920))
+
+    assert under_test.chars[167:170] == [NULL] * 3
+    assert under_test.ascii_rows(2, 1, 1, 5) == ["USER:"]
+
+
+def test_program_tab(under_test: Screen):
+    under_test.process(bytes([0xF1, 0xC2]) + sba(0, 0) + bytes([ORDER_PT]) + text("bob"))
+
+    assert under_test.chars[167:170] == list("bob")
+
+
+def test_start_field_extended_and_modify_field():
+    under_test = Screen()
+
+    under_test.process(bytes([0xF5, 0xC3, ORDER_SFE, 2, 0x41, 0xF1, 0xC0, 0x60]) + text("LABEL"))
+
+    assert under_test.attributes[0] == 0x20
+    under_test.process(bytes([0xF1, 0xC3]) + sba(0, 0) + bytes([ORDER_MF, 1, 0xC0, 0x40]))
+    assert under_test.attributes[0] == 0x00
+
+
+def test_type_text_sets_modified_flag(under_test: Screen):
+    under_test.type_text("bob")
+
+    assert under_test.cursor == 170
+    assert under_test.attributes[166] & 0x01
+
+
+def test_type_text_into_protected_field_raises_OperatorError(under_test: Screen):
+    under_test.cursor = 2
+
+    with pytest.raises(OperatorError, match="protected field"):
+        under_test.type_text("x")
+    assert under_test.operator_error
+    assert not under_test.keyboard_unlocked
+
+
+def test_type_text_skips_autoskip_field():
+    under_test = Screen()
+    under_test.process(bytes([0xF5, 0xC3]) + sf(0x00) + bytes([0x40] * 2) + sf(0x30) + sf(0x00))
+
+    under_test.cursor = 1
+    under_test.type_text("abc")
+
+    assert under_test.chars[1:3] == ["a", "b"]
+    assert under_test.chars[5] == "c"
+
+
+def test_aid_sends_modified_fields(under_test: Screen):
+    under_test.type_text("bob")
+
+    data = under_test.aid(AID_ENTER)
+
+    assert data == bytes([AID_ENTER]) + encode_address(170, 1920) + sba(2, 7) + text("bob")
+    assert under_test.locked
+    assert under_test.last_aid == AID_ENTER
+
+
+def test_aid_short_read(under_test: Screen):
+    under_test.type_text("bob")
+
+    assert under_test.aid(AID_PA[0]) == bytes([AID_PA[0]])
+
+
+def test_clear_erases_screen(under_test: Screen):
+    assert under_test.aid(AID_CLEAR) == bytes([AID_CLEAR])
+    assert not under_test.formatted
+    assert under_test.ascii_rows(0, 0, 1, 8) == ["        "]
+
+
+def test_read_modified_of_unformatted_screen():
+    under_test = Screen()
+    under_test.process(bytes([0xF5, 0xC3]))
+    under_test.type_text("logon")
+
+    assert under_test.aid(AID_ENTER) == bytes([AID_ENTER]) + encode_address(5, 1920) + text("logon")
+
+
+def test_read_buffer_requested_by_host(under_test: Screen):
+    data = under_test.process(bytes([0xF2]))
+
+    assert data[:3] == bytes([0x60]) + encode_address(167, 1920)
+    assert data[3:5] == sf(0x28)
+    assert data[5:12] == text("WELCOME")
+    # every field attribute takes an additional byte for the SF order
+    assert len(data) == 3 + 1920 + 6
+
+
+def test_read_partition_query():
+    under_test = Screen(alternate_size=(43, 80))
+
+    reply = under_test.process(bytes([0xF3, 0x00, 0x05, 0x01, 0xFF, 0x02]))
+
+    assert reply[0] == 0x88
+    assert reply[1:7] == bytes([0x00, 0x07, 0x81, 0x80, 0x80, 0x81])
+    assert bytes([0x00, 0x50, 0x00, 0x2B]) in reply
+
+
+def test_erase_all_unprotected(under_test: Screen):
+    under_test.type_text("bob")
+    under_test.aid(AID_ENTER)
+
+    under_test.process(bytes([0x6F]))
+
+    assert under_test.chars[167:170] == [NULL] * 3
+    assert not under_test.attributes[166] & 0x01
+    assert under_test.cursor == 167
+    assert under_test.keyboard_unlocked
+
+
+def test_unknown_command_raises_ValueError(under_test: Screen):
+    with pytest.raises(ValueError, match="Unknown 3270 command 0x99"):
+        under_test.process(bytes([0x99]))
+
+
+def test_tab_backtab_and_home(under_test: Screen):
+    under_test.tab()
+    assert under_test.cursor == 187
+
+    under_test.tab()
+    assert under_test.cursor == 167
+
+    under_test.backtab()
+    assert under_test.cursor == 187
+
+    under_test.home()
+    assert under_test.cursor == 167
+
+
+def test_newline_skips_protected_row(under_test: Screen):
+    under_test.cursor = 5
+
+    under_test.newline()
+
+    assert under_test.cursor == 167
+
+
+def test_newline_on_unformatted_screen():
+    under_test = Screen()
+    under_test.cursor = 5
+
+    under_test.newline()
+
+    assert under_test.cursor == 80
+
+
+def test_erase_eof_and_delete(under_test: Screen):
+    under_test.type_text("bobby")
+    under_test.cursor = 168
+
+    under_test.delete()
+    assert under_test.chars[167:171] == list("bbby")
+
+    under_test.erase_eof()
+    assert under_test.chars[167:171] == ["b", NULL, NULL, NULL]
+
+
+def test_delete_field(under_test: Screen):
+    under_test.type_text("bob")
+
+    under_test.delete_field()
+
+    assert under_test.chars[167:170] == [NULL] * 3
+    assert under_test.cursor == 167
+
+
+def test_field_end_position(under_test: Screen):
+    under_test.type_text("bob")
+    under_test.home()
+
+    under_test.field_end_position()
+
+    assert under_test.cursor == 170
+
+
+def test_buffer_tokens(under_test: Screen):
+    row = under_test.buffer_tokens()[2].split()
+
+    assert row[:7] == ["SF(c0=60)", "55", "53", "45", "52", "3a", "SF(c0=40)"]
+    assert under_test.buffer_tokens(ebcdic=True)[2].split()[1] == "e4"
+
+
+def test_move_cursor_outside_the_screen_raises_OperatorError(under_test: Screen):
+    with pytest.raises(OperatorError, match=r"Invalid cursor position \(24, 0\)"):
+        under_test.move_cursor(24, 0)
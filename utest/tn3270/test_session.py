@@ -0,0 +1,180 @@
+import socket
+import pytest
+from Mainframe3270.py3270 import CommandError, CommandTimeoutError, Emulator, FieldTruncateError
+from Mainframe3270.tn3270 import NativeApp
+from .conftest import FakeHost, menu_screen
+
+
+@pytest.fixture
+def emulator(host: FakeHost):
+    emulator = Emulator(timeout=5, engine="native")
+    emulator.connect(f"127.0.0.1:{host.port}")
+    emulator.wait_for_field()
+    yield emulator
+    emulator.terminate()
+
+
+def test_args():
+    under_test = NativeApp(["-utf8", "-port", "992", "-codepage", "1140", "-xrm", "*model: 3278-4"])
+
+    assert under_test.port == 992
+    assert under_test.codec == "cp1140"
+    assert under_test.terminal_type == "3278-4"
+    assert under_test.screen.alternate_size == (43, 80)
+
+
+def test_default_terminal_type_is_extended():
+    assert NativeApp(model="5").terminal_type == "3279-5-E"
+
+
+@pytest.mark.parametrize(
+    ("args", "message"),
+    [
+        (["-trace"], "The native engine does not support the emulator argument '-trace'"),
+        (["-xrm", "s3270.unlockDelay: False"], "The native engine does not support the resource"),
+        (["-codepage", "klingon"], "The native engine does not support the code page 'klingon'"),
+        (["-model", "6"], "The native engine does not support the model '6'"),
+    ],
+)
+def test_unsupported_args_raise_ValueError(args, message):
+    with pytest.raises(ValueError, match=message):
+        NativeApp(args)
+
+
+def test_unknown_action():
+    under_test = Emulator(engine="native")
+
+    with pytest.raises(CommandError, match="Unknown action: Frobnicate"):
+        under_test.exec_command(b"Frobnicate(1)")
+
+
+def test_actions_fail_when_not_connected():
+    under_test = Emulator(engine="native")
+
+    with pytest.raises(CommandError, match="Not connected"):
+        under_test.send_enter()
+    assert not under_test.is_connected()
+
+
+def test_connect_fails():
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        port = server.getsockname()[1]
+    under_test = Emulator(engine="native")
+
+    with pytest.raises(CommandError, match="Connection failed"):
+        under_test.connect(f"127.0.0.1:{port}")
+    assert "Connecting to 127.0.0.1" in under_test.get_stderr()
+
+
+def test_connect(host: FakeHost, emulator: Emulator):
+    assert host.terminal_types == [b"IBM-3279-2-E"]
+    assert emulator.is_connected()
+    assert emulator.status.connection_state == b"C(127.0.0.1)"
+    assert emulator.status.emulator_mode == b"I"
+    assert emulator.get_current_position() == (3, 8)
+
+
+def test_connect_with_tn3270e_and_lu():
+    host = FakeHost(tn3270e=True, reply=lambda record: menu_screen("TN3270E"))
+    under_test = Emulator(timeout=5, engine="native")
+    try:
+        under_test.connect(f"LU01@127.0.0.1:{host.port}")
+        under_test.wait_for_field()
+        assert under_test.app.connection.tn3270e
+        assert under_test.app.connection.lu == "LU01"
+
+        under_test.send_enter()
+        under_test.wait_for("Output", 5)
+
+        assert under_test.string_get(1, 2, 13) == "HELLO TN3270E"
+    finally:
+        under_test.terminate()
+        host.close()
+
+
+def test_read_screen(emulator: Emulator):
+    assert emulator.string_get(1, 2, 7) == "WELCOME"
+    assert emulator.search_string("password:", ignore_case=True)
+    assert emulator.get_string_positions("USER") == [(3, 2)]
+    assert emulator.read_region(3, 2, 1, 5) == ["USER:"]
+    assert emulator.read_all_screen().startswith(" WELCOME TO THE FAKE HOST ")
+
+
+def test_fields(emulator: Emulator):
+    assert [(field.ypos, field.xpos, field.length) for field in emulator.get_input_fields()] == [(3, 8, 9), (3, 28, 73)]
+
+
+def test_write_and_send_enter(host: FakeHost, emulator: Emulator):
+    emulator.send_string(b"bob", 3, 8)
+    emulator.send_enter()
+
+    assert host.wait_for_record()[6:] == "bob".encode("cp037")
+    emulator.wait_for("Output", 5)
+    assert emulator.string_get(1, 2, 9) == "HELLO bob"
+
+
+def test_string_with_enter_escape(host: FakeHost, emulator: Emulator):
+    emulator.exec_command(b'String("\\x61l\\u00e9x\\n")')
+
+    assert host.wait_for_record()[6:] == "alÃ©x".encode("latin-1").decode("utf-8").encode("cp037")
+
+
+def test_fill_fields(host: FakeHost, emulator: Emulator):
+    emulator.fill_fields([(3, 8, "bob"), (3, 28, "secret")], b"Enter")
+
+    record = host.wait_for_record()
+    assert "bob".encode("cp037") in record
+    assert "secret".encode("cp037") in record
+
+
+def test_fill_fields_truncate(emulator: Emulator):
+    with pytest.raises(FieldTruncateError):
+        emulator.fill_fields([(3, 8, "a" * 10)])
+
+
+def test_write_into_protected_field_fails(emulator: Emulator):
+    with pytest.raises(CommandError, match="Keyboard locked"):
+        emulator.send_string(b"x", 1, 2)
+
+    assert not emulator.is_keyboard_unlocked(max_age=0)
+    assert emulator.status.keyboard == b"E"
+    emulator.exec_command(b"Reset")
+    assert emulator.is_keyboard_unlocked(max_age=0)
+
+
+def test_wait_times_out(emulator: Emulator):
+    # the logon screen is the output since connecting
+    emulator.wait_for("Output", 1)
+
+    with pytest.raises(CommandError, match="Wait timed out"):
+        emulator.wait_for("Output", 1)
+
+
+def test_keyboard_action_waits_for_unlock(host: FakeHost):
+    host.reply = None
+    under_test = Emulator(timeout=5, command_timeout=0.5, engine="native")
+    under_test.connect(f"127.0.0.1:{host.port}")
+    under_test.wait_for_field()
+    under_test.send_enter()
+
+    with pytest.raises(CommandTimeoutError):
+        under_test.send_string(b"bob")
+    assert under_test.is_terminated
+
+
+def test_print_text(tmp_path, emulator: Emulator):
+    path = tmp_path / "screen.html"
+
+    emulator.save_screen(str(path))
+
+    content = path.read_text(encoding="utf-8")
+    assert "<pre>" in content
+    assert "WELCOME TO THE FAKE HOST" in content
+
+
+def test_host_disconnect(host: FakeHost, emulator: Emulator):
+    host.close()
+
+    emulator.wait_for("Disconnect", 5)
+
+    assert not emulator.is_connected(max_age=0)
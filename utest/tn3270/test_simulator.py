@@ -0,0 +1,205 @@
+import os
+import time
+import pytest
+from Mainframe3270.py3270 import Emulator
+from Mainframe3270.tn3270.datastream import AID_ENTER, AID_PF, ORDER_SBA, encode_address
+from Mainframe3270.tn3270.screen import Screen
+from Mainframe3270.tn3270.simulator import HostSimulator, load_screens, main, parse_screens, read_input
+
+SCREENS_FILE = os.path.join(os.path.dirname(__file__), "resources", "logon.screens")
+
+
+@pytest.fixture
+def simulator():
+    with HostSimulator.from_files(SCREENS_FILE) as simulator:
+        yield simulator
+
+
+def connect(simulator, host_prefix="", model="2"):
+    emulator = Emulator(timeout=5, model=model, engine="native")
+    emulator.connect(f"{host_prefix}127.0.0.1:{simulator.port}")
+    emulator.wait_for_field()
+    return emulator
+
+
+def log_on(emulator, user, password):
+    emulator.send_string(user, 2, 16)
+    emulator.send_string(password, 3, 16)
+    emulator.send_enter()
+    emulator.exec_command(b"Wait(Unlock)")
+
+
+def test_parse_screens():
+    screens = parse_screens(
+        "=== first\n"
+        "NAME [*name  ] {name}\n"
+        "\n"
+        "---\n"
+        "cursor 2 5\n"
+        "on PF12 when name=X goto first\n"
+        "\n"
+        "=== second\n"
+    )
+
+    assert list(screens) == ["first", "second"]
+    first = screens["first"]
+    assert first.rows == [["NAME ", ("name", 7, True), " {name}"]]
+    assert first.cursor == (2, 5)
+    assert [(rule.aid, rule.conditions, rule.goto) for rule in first.rules] == [(AID_PF[11], (("name", "X"),), "first")]
+    assert screens["second"].rows == []
+
+
+@pytest.mark.parametrize(
+    ("text", "message"),
+    [
+        ("TEXT", "line 1: expected a line '=== <name>'"),
+        ("=== a\n=== a", "line 2: the screen name 'a' is empty or not unique"),
+        ("=== a\nUSER [user", "line 2: unbalanced brackets"),
+        ("=== a\nUSER [  ]", "line 2: input fields need a name"),
+        ("=== a\nHELLO {0}", "line 2: invalid placeholder"),
+        ("=== a\n---\non PF25 goto a", "line 3: unknown AID 'PF25'"),
+        ("=== a\n---\non ENTER when user goto a", "line 3: expected a condition"),
+        ("=== a\n---\non ENTER jump a", "line 3: expected 'goto <screen>' or 'disconnect'"),
+        ("=== a\n---\nclear screen", "line 3: invalid rule 'clear screen'"),
+    ],
+)
+def test_parse_screens_raises_ValueError(text, message):
+    with pytest.raises(ValueError, match=f"^<string>, {message}"):
+        parse_screens(text)
+
+
+def test_unknown_screen_raises_ValueError():
+    with pytest.raises(ValueError, match="The screen 'a' goes to the unknown screen 'b'"):
+        HostSimulator(parse_screens("=== a\n---\non ENTER goto b"))
+
+
+def test_load_screens_with_duplicate_screen(tmp_path):
+    path = tmp_path / "more.screens"
+    path.write_text("=== menu\nANOTHER MENU\n")
+
+    with pytest.raises(ValueError, match="the screen 'menu' is already defined"):
+        load_screens(SCREENS_FILE, path)
+
+
+def test_render():
+    screen = parse_screens("=== a\nHELLO {user}\nUSER [user ] [*pw]\n---\ncursor pw")["a"]
+
+    record, fields = screen.render({"user": "BOB"}, 24, 80)
+    under_test = Screen()
+    under_test.process(record)
+
+    assert fields == {86: "user", 94: "pw"}
+    assert under_test.ascii_rows(0, 0, 2, 80)[0].startswith("HELLO BOB")
+    assert under_test.ascii_rows(1, 0, 1, 80)[0].startswith("USER")
+    assert under_test.field_addresses == [85, 91, 93, 97, 1919]
+    assert under_test.is_protected(86) is False
+    assert under_test.cursor == 94
+
+
+def test_render_cuts_off_what_does_not_fit():
+    screen = parse_screens("=== a\n" + "X" * 90 + "\nY [field]\nZ")["a"]
+
+    record, fields = screen.render({}, 2, 80)
+    under_test = Screen(alternate_size=(2, 80))
+    under_test.process(record)
+
+    assert under_test.ascii_rows(0, 0, 2, 80) == ["X" * 80, "Y" + " " * 79]
+    assert fields == {83: "field"}
+
+
+def test_read_input():
+    fields = {82: "user", 100: "password"}
+    record = bytes([AID_ENTER]) + encode_address(90, 1920)
+    record += bytes([ORDER_SBA]) + encode_address(82, 1920) + "ALICE".encode("cp037")
+    record += bytes([ORDER_SBA]) + encode_address(10, 1920) + "IGNORED".encode("cp037")
+
+    assert read_input(record, fields) == (AID_ENTER, {"user": "ALICE", "password": ""})
+
+
+def test_log_on(simulator):
+    emulator = connect(simulator)
+    try:
+        assert emulator.string_get(1, 1, 24) == "WELCOME TO THE SIMULATOR"
+        assert emulator.get_current_position() == (2, 16)
+
+        log_on(emulator, b"ALICE", b"SECRET")
+
+        assert emulator.string_get(1, 1, 15) == "HELLO    ALICE!"
+        assert emulator.get_current_position() == (2, 14)
+    finally:
+        emulator.terminate()
+
+
+def test_log_on_is_denied(simulator):
+    emulator = connect(simulator, "N:")
+    try:
+        log_on(emulator, b"BOB", b"SECRET")
+
+        assert emulator.string_get(1, 1, 22) == "ACCESS DENIED FOR BOB "
+        assert emulator.get_current_position() == (1, 1)
+        emulator.send_enter()
+        emulator.wait_for_field()
+        assert emulator.string_get(1, 1, 24) == "WELCOME TO THE SIMULATOR"
+    finally:
+        emulator.terminate()
+
+
+def test_disconnect(simulator):
+    emulator = connect(simulator)
+    try:
+        emulator.exec_command(b"PF(3)")
+        emulator.exec_command(b"Wait(Disconnect)")
+
+        assert not emulator.is_connected()
+    finally:
+        emulator.terminate()
+
+
+def test_sessions_are_independent(simulator):
+    alice, bob = connect(simulator), connect(simulator)
+    try:
+        log_on(alice, b"ALICE", b"SECRET")
+        log_on(bob, b"BOB", b"")
+
+        assert alice.string_get(1, 1, 15) == "HELLO    ALICE!"
+        assert bob.string_get(1, 1, 21) == "ACCESS DENIED FOR BOB"
+    finally:
+        alice.terminate()
+        bob.terminate()
+
+
+def test_screen_size_of_model(simulator):
+    emulator = connect(simulator, model="5")
+    try:
+        assert emulator.exec_command(b"Query(ScreenCurSize)").data == [b"rows 27 columns 132"]
+        log_on(emulator, b"ALICE", b"SECRET")
+        assert emulator.string_get(1, 1, 15) == "HELLO    ALICE!"
+    finally:
+        emulator.terminate()
+
+
+def test_latency():
+    with HostSimulator.from_files(SCREENS_FILE, latency=0.2, jitter=0.05, seed=1) as simulator:
+        emulator = connect(simulator)
+        try:
+            start = time.monotonic()
+            log_on(emulator, b"ALICE", b"SECRET")
+
+            assert time.monotonic() - start >= 0.15
+        finally:
+            emulator.terminate()
+
+
+def test_negative_latency_raises_ValueError():
+    with pytest.raises(ValueError, match="The latency and the jitter cannot be negative"):
+        HostSimulator.from_files(SCREENS_FILE, jitter=-1)
+
+
+def test_main_with_invalid_file(tmp_path, capsys):
+    path = tmp_path / "invalid.screens"
+    path.write_text("NO SCREEN")
+
+    with pytest.raises(SystemExit):
+        main([str(path), "--port", "0"])
+
+    assert "line 1: expected a line '=== <name>'" in capsys.readouterr().err